@@ -0,0 +1,74 @@
+"""
+# Bundle Flattening Benchmark
+
+Times elaboration of Modules with many instances of the same `Bundle` definitions:
+* Flat arrays of the differential `h.Diff` bundle, as in a wide differential datapath.
+* A nested bundle including several `Diff`s, instantiated many times and connected to a Module port.
+
+Usage:
+```
+python -m benchmarks.bench_bundles [--sizes 1000 10000]
+```
+"""
+
+import argparse
+
+import hdl21 as h
+
+from .timing import Timer
+
+
+@h.bundle
+class Lane:
+    """Nested bundle of several differential pairs"""
+
+    data = h.Diff()
+    clk = h.Diff()
+    fb = h.Diff(flipped=True)
+    en = h.Signal()
+
+
+@h.module
+class LaneRx:
+    """Receiver with a `Lane` port"""
+
+    lane = Lane(port=True)
+
+
+def diffs(num: int) -> h.Module:
+    """Create a Module with `num` `Diff` bundle instances"""
+    m = h.Module(name=f"Diffs{num}")
+    for k in range(num):
+        m.add(h.Diff(), name=f"d{k}")
+    return m
+
+
+def lanes(num: int) -> h.Module:
+    """Create a Module with `num` `Lane` bundle instances, each connected to a `LaneRx`"""
+    m = h.Module(name=f"Lanes{num}")
+    for k in range(num):
+        lane = m.add(Lane(), name=f"lane{k}")
+        m.add(LaneRx(lane=lane), name=f"rx{k}")
+    return m
+
+
+def bench(name: str, build, num: int) -> None:
+    module = build(num)
+    with Timer() as timer:
+        h.elaborate(module)
+    dur = timer.time
+    print(f"{name:<10} {num:>8} bundles {dur:>10.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 5000, 10000])
+    args = parser.parse_args()
+
+    for num in args.sizes:
+        bench("diffs", diffs, num)
+        bench("lanes", lanes, num)
+
+
+if __name__ == "__main__":
+    main()
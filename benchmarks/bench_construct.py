@@ -0,0 +1,72 @@
+"""
+# Datatype Construction Microbenchmarks
+
+Times validated (class-constructor) versus trusted (`hdl21.datatype.construct`) creation
+of the datatypes which elaboration creates in bulk:
+* `Signal`: copies, as made by bundle and hierarchy flattening
+* `Slice`: single-bit slices, as made per array element
+* `GeneratorCall`: one per generator call
+
+Of these, only `Slice`s measurably gain, and only they use the trusted path.
+The others are kept here to check that remains so.
+
+Usage:
+```
+python -m benchmarks.bench_construct [--num 100000]
+```
+"""
+
+import argparse
+
+import hdl21 as h
+from hdl21.datatype import construct
+from hdl21.generator import GeneratorCall
+
+from .timing import timeit
+
+
+@h.paramclass
+class P:
+    i = h.Param(dtype=int, desc="Index", default=0)
+
+
+@h.generator
+def G(params: P) -> h.Module:
+    return h.Module()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--num", type=int, default=100_000)
+    args = parser.parse_args()
+    num = args.num
+
+    sig = h.Output(name="sig", width=8, desc="A signal")
+    fields = dict(name=sig.name, width=sig.width, vis=sig.vis, direction=sig.direction)
+    params = P(i=1)
+
+    cases = [
+        (
+            "Signal",
+            lambda: h.Signal(**fields),
+            lambda: construct(h.Signal, **fields),
+        ),
+        (
+            "Slice",
+            lambda: h.Slice(parent=sig, index=3),
+            lambda: construct(h.Slice, parent=sig, index=3),
+        ),
+        (
+            "GeneratorCall",
+            lambda: GeneratorCall(gen=G, params=params),
+            lambda: construct(GeneratorCall, gen=G, params=params),
+        ),
+    ]
+    for label, validated, trusted in cases:
+        v, t = timeit(validated, num), timeit(trusted, num)
+        line = f"{label:<16} validated {v:8.3f} us   trusted {t:8.3f} us"
+        print(f"{line}   ({v / t:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+# Per-Object Memory Microbenchmarks
+
+Measures the Python-allocated memory, in bytes per object, of the core types created in bulk by large designs:
+* `Signal`: scalar Signals, added to a Module
+* `Slice`: single-bit slices of a wide Signal, resolved as done in elaboration
+* `Instance`: Instances of a small Module, each with two connections
+
+Memory is measured with `tracemalloc`, as the difference in traced memory before and after creating `--num` objects,
+so that it includes everything each object allocates, e.g. its `__dict__` and any back-reference containers.
+
+Usage:
+```
+python -m benchmarks.bench_memory [--num 100000]
+```
+"""
+
+import gc
+import argparse
+import tracemalloc
+from typing import Any, Callable, List
+
+import hdl21 as h
+
+
+@h.module
+class Unit:
+    a, b = h.Ports(2)
+
+
+def measure(create: Callable[[int], List[Any]], num: int) -> float:
+    """Measure the traced memory of `create(num)`, in bytes per object"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = create(num)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return (after - before) / num
+
+
+def signals(num: int) -> List[Any]:
+    m = h.Module(name="signals")
+    for k in range(num):
+        m.add(h.Signal(name=f"s{k}"))
+    return [m]
+
+
+def slices(num: int) -> List[Any]:
+    sig = h.Signal(name="wide", width=num)
+    rv = [sig[k] for k in range(num)]
+    for s in rv:
+        _ = s.width  # Resolve each, as elaboration does
+    return [sig, rv]
+
+
+def instances(num: int) -> List[Any]:
+    m = h.Module(name="instances")
+    a, b = m.add(h.Signal(name="a")), m.add(h.Signal(name="b"))
+    for k in range(num):
+        m.add(Unit(a=a, b=b), name=f"i{k}")
+    return [m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--num", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for label, create in [
+        ("Signal", signals),
+        ("Slice", slices),
+        ("Instance", instances),
+    ]:
+        print(f"{label:<12} {measure(create, args.num):10.1f} bytes each")
+
+
+if __name__ == "__main__":
+    main()
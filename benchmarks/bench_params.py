@@ -0,0 +1,94 @@
+"""
+# Param-Class Hashing & Cache-Lookup Microbenchmarks
+
+Times the operations performed on `paramclass` instances with each generator call,
+for deeply nested param-classes:
+* `hash`: hashing a freshly constructed instance, and re-hashing the same instance
+* `eq`: comparing equal but distinct instances, and unequal instances
+* `lookup`: generator calls which hit in the `GeneratorCache`, with the cached instance and with equal copies of it
+* `name`: unique naming, for a fresh instance and again for the same instance
+
+Usage:
+```
+python -m benchmarks.bench_params [--depths 2 4 6] [--width 4]
+```
+"""
+
+import argparse
+from typing import List, Optional
+
+import hdl21 as h
+from hdl21.prefix import µ
+from hdl21.params import _unique_name
+
+from .timing import timeit
+
+
+@h.paramclass
+class Leaf:
+    w = h.Param(dtype=h.Prefixed, desc="Width", default=1 * µ)
+    l = h.Param(dtype=h.Prefixed, desc="Length", default=150 * h.prefix.n)
+    nf = h.Param(dtype=int, desc="Number of fingers", default=1)
+    name = h.Param(dtype=str, desc="Name", default="leaf")
+
+
+@h.paramclass
+class Node:
+    children = h.Param(dtype=tuple, desc="Child `Node`s or `Leaf`s")
+    scale = h.Param(dtype=Optional[float], desc="Scale factor", default=None)
+
+
+@h.generator
+def Gen(params: Node) -> h.Module:
+    return h.Module()
+
+
+def tree(depth: int, width: int, seed: int = 0) -> Node:
+    """Create a `Node` tree `depth` levels deep, with `width` children per level"""
+    if depth <= 1:
+        return Node(children=tuple(Leaf(nf=seed + k) for k in range(width)))
+    return Node(children=tuple(tree(depth - 1, width, seed) for _ in range(width)))
+
+
+def bench(depth: int, width: int, num: int) -> None:
+    """Run each benchmark on trees of `depth` and `width`"""
+
+    results: List[tuple] = []
+
+    # Construction isn't what we're timing, so make all the fresh instances upfront
+    fresh = iter([tree(depth, width) for _ in range(num)])
+    results.append(("hash (fresh)", timeit(lambda: hash(next(fresh)), num)))
+    p = tree(depth, width)
+    results.append(("hash (again)", timeit(lambda: hash(p), num)))
+
+    q, r = tree(depth, width), tree(depth, width, seed=1)
+    hash(q), hash(r)
+    results.append(("eq (equal)", timeit(lambda: p == q, num)))
+    results.append(("eq (unequal)", timeit(lambda: p == r, num)))
+
+    Gen(p)
+    copies = iter([tree(depth, width) for _ in range(num)])
+    results.append(("lookup (same)", timeit(lambda: Gen(p), num)))
+    results.append(("lookup (copy)", timeit(lambda: Gen(next(copies)), num)))
+
+    fresh = iter([tree(depth, width, seed=2) for _ in range(num)])
+    results.append(("name (fresh)", timeit(lambda: _unique_name(next(fresh)), num)))
+    results.append(("name (again)", timeit(lambda: _unique_name(p), num)))
+
+    leaves = width**depth
+    for label, us in results:
+        print(f"depth={depth:<3} leaves={leaves:<6} {label:<16} {us:10.2f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 4, 6])
+    parser.add_argument("--width", type=int, default=3)
+    parser.add_argument("--num", type=int, default=50)
+    args = parser.parse_args()
+    for depth in args.depths:
+        bench(depth, args.width, args.num)
+
+
+if __name__ == "__main__":
+    main()
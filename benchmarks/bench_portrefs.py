@@ -0,0 +1,104 @@
+"""
+# PortRef Resolution Benchmark
+
+Times elaboration of Modules with heavy instance-to-instance `PortRef` wiring:
+* A ring oscillator-style chain, in which each stage's input is a reference to the prior stage's output.
+* A bit-sliced datapath, in which every slice references the ports of a shared control instance.
+* A daisy-chain, in which each stage's control input references that of the prior stage,
+  forming a single net of `PortRef`s as long as the chain.
+
+Usage:
+```
+python -m benchmarks.bench_portrefs [--sizes 1000 10000 20000]
+```
+"""
+
+import argparse
+
+import hdl21 as h
+
+from .timing import Timer
+
+
+@h.module
+class Stage:
+    """Single stage, e.g. an inverter or datapath bit-slice"""
+
+    inp = h.Input()
+    out = h.Output()
+    ctrl = h.Input()
+
+
+@h.module
+class Control:
+    """Shared control-signal driver"""
+
+    ctrl = h.Output()
+
+
+def ring(num: int) -> h.Module:
+    """Create a ring of `num` stages, connected entirely by `PortRef`s.
+    Produces about `2 * num` PortRefs."""
+    m = h.Module(name=f"Ring{num}")
+    m.ctl = Control()
+    stages = [m.add(Stage(), name=f"stage{k}") for k in range(num)]
+    for k, stage in enumerate(stages):
+        stage.inp = stages[k - 1].out
+        stage.ctrl = m.ctl.ctrl
+    return m
+
+
+def datapath(num: int) -> h.Module:
+    """Create a bit-sliced datapath of `num` slices, each of which references the prior slice and the shared control.
+    Unlike `ring`, the chain is open, so one end of it gets "naming rights" for its signals."""
+    m = h.Module(name=f"Datapath{num}")
+    m.ctl = Control()
+    prev = None
+    for k in range(num):
+        slize = m.add(Stage(ctrl=m.ctl.ctrl), name=f"slice{k}")
+        if prev is not None:
+            slize.inp = prev.out
+        prev = slize
+    m.inp, m.out = h.Input(), h.Output()
+    m.get("slice0").inp = m.inp
+    prev.out = m.out
+    return m
+
+
+def daisy(num: int) -> h.Module:
+    """Create a daisy-chain of `num` stages, each of whose `ctrl` port references that of the prior stage.
+    All of the `ctrl` ports form a single connected group."""
+    m = h.Module(name=f"Daisy{num}")
+    m.ctrl = h.Input()
+    prev = m.add(Stage(ctrl=m.ctrl), name="stage0")
+    for k in range(1, num):
+        stage = m.add(Stage(ctrl=prev.ctrl), name=f"stage{k}")
+        stage.inp = prev.out
+        prev = stage
+    m.inp, m.out = h.Input(), h.Output()
+    m.get("stage0").inp = m.inp
+    prev.out = m.out
+    return m
+
+
+def bench(name: str, build, num: int) -> None:
+    module = build(num)
+    with Timer() as timer:
+        h.elaborate(module)
+    dur = timer.time
+    print(f"{name:<10} {num:>8} stages {dur:>10.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 5000, 10000])
+    args = parser.parse_args()
+
+    for num in args.sizes:
+        bench("ring", ring, num)
+        bench("datapath", datapath, num)
+        bench("daisy", daisy, num)
+
+
+if __name__ == "__main__":
+    main()
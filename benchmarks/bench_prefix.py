@@ -0,0 +1,62 @@
+"""
+# Prefixed-Number Microbenchmarks
+
+Times the common operations on `Prefixed` numbers, as performed by param-heavy generators and sweeps:
+* Construction, both validated and via prefix-multiplication, e.g. `5 * µ`
+* Arithmetic: multiplication, addition of mixed prefixes, and scaling
+* Conversion to `float`, hashing, and comparison
+* Validation as a `paramclass` field
+
+Uses only APIs common to all versions of `Prefixed`,
+so that results can be compared across versions by running this script on each, e.g. before and after a change.
+
+Usage:
+```
+python -m benchmarks.bench_prefix [--num 100000]
+```
+"""
+
+import argparse
+from decimal import Decimal
+
+import hdl21 as h
+from hdl21.prefix import µ, n, m, K
+
+from .timing import timeit
+
+
+@h.paramclass
+class P:
+    w = h.Param(dtype=h.Prefixed, desc="Width", default=1 * µ)
+    l = h.Param(dtype=h.Prefixed, desc="Length", default=150 * n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--num", type=int, default=100_000)
+    args = parser.parse_args()
+    num = args.num
+
+    a, b = 3 * µ, 150 * n
+    dec = Decimal("1.5")
+    cases = [
+        ("construct", lambda: h.Prefixed(number=dec, prefix=m)),
+        ("int * prefix", lambda: 5 * µ),
+        ("float * prefix", lambda: 1.5 * µ),
+        ("mul", lambda: a * 2),
+        ("mul prefixed", lambda: a * b),
+        ("add mixed", lambda: a + b),
+        ("scale", lambda: a.scale(n)),
+        ("float", lambda: float(a)),
+        ("hash", lambda: hash(a)),
+        ("eq", lambda: a == b),
+        ("lt", lambda: b < a),
+        ("sum of 10", lambda: sum([a] * 10, 0 * K)),
+        ("paramclass", lambda: P(w=a, l=b)),
+    ]
+    for label, func in cases:
+        print(f"{label:<16} {timeit(func, num):10.3f} us")
+
+
+if __name__ == "__main__":
+    main()
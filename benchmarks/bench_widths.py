@@ -0,0 +1,98 @@
+"""
+# Width-Computation Benchmark
+
+Times elaboration of concatenation-heavy Modules, in which connection widths are computed many times:
+* A flat version of the `examples/encoder.py` one-hot decoder, scaled up.
+  Its And-gate array is connected to a nested `Concat` of single-bit slices of the input and its inverse.
+* A bus fan-out, in which many instances connect to the same deeply nested `Concat`.
+
+Usage:
+```
+python -m benchmarks.bench_widths [--sizes 6 8 10]
+```
+"""
+
+import argparse
+
+import hdl21 as h
+
+from .timing import Timer
+
+Inv = h.ExternalModule(
+    name="Inv",
+    port_list=[h.Input(name="i"), h.Output(name="z")],
+    desc="Generic Inverter",
+)
+
+
+def and_gate(width: int) -> h.ExternalModule:
+    """Create a `width`-input And gate"""
+    return h.ExternalModule(
+        name=f"And{width}",
+        port_list=[h.Input(name="a", width=width), h.Output(name="z")],
+        desc=f"Generic {width}-Input And Gate",
+    )
+
+
+def decoder(bits: int) -> h.Module:
+    """Create a `bits` to `2**bits` one-hot decoder, in the style of `examples/encoder.py`'s base case.
+    Each And gate gets a `Concat` of `bits` single-bit slices, all of which are concatenated to connect to the gate array.
+    """
+    m = h.Module(name=f"Decoder{bits}")
+    m.bin = h.Input(width=bits)
+    m.binb = h.Signal(width=bits)
+    m.th = h.Output(width=2**bits)
+    m.invs = bits * Inv()(i=m.bin, z=m.binb)
+
+    sel = h.Concat(
+        *[
+            h.Concat(*[m.bin[j] if (k >> j) & 1 else m.binb[j] for j in range(bits)])
+            for k in range(2**bits)
+        ]
+    )
+    m.ands = (2**bits) * and_gate(bits)()(a=sel, z=m.th)
+    return m
+
+
+def fanout(bits: int) -> h.Module:
+    """Create `2**bits` instances, all connected to the same nested `Concat`.
+    The concatenation is a binary tree with `2**bits` single-bit leaves."""
+    m = h.Module(name=f"Fanout{bits}")
+    m.bus = h.Signal(width=2**bits)
+    level = [m.bus[k] for k in range(2**bits)]
+    while len(level) > 1:
+        level = [h.Concat(level[k], level[k + 1]) for k in range(0, len(level), 2)]
+    m.z = h.Signal(width=2**bits)
+    gate = and_gate(2**bits)()
+    for k in range(2**bits):
+        m.add(gate(a=level[0], z=m.z[k]), name=f"and{k}")
+    return m
+
+
+def bench(name: str, build, bits: int) -> None:
+    module = build(bits)
+    profile = h.ElabProfile()
+    with Timer() as timer:
+        h.elaborate(module, profile=profile)
+    dur = timer.time
+
+    # Report the total, and the time in the passes which compute widths
+    conntypes = profile.passes["ConnTypes"].time
+    arrays = profile.passes["ArrayFlattener"].time
+    msg = f"{name:<10} {bits:>4} bits {dur:>10.3f}s total"
+    msg += f" {conntypes:>10.3f}s ConnTypes {arrays:>10.3f}s ArrayFlattener"
+    print(msg)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[6, 8, 10])
+    args = parser.parse_args()
+
+    for bits in args.sizes:
+        bench("decoder", decoder, bits)
+        bench("fanout", fanout, bits)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+# Synthetic Benchmark Designs
+
+Parameterized generators of designs which stress particular parts of elaboration and export.
+Each is an `hdl21.generator` of a single integer-valued size parameter, `n`:
+
+* `chain`: a hierarchy `n` Modules deep, each wrapping the one below
+* `fanout`: `n` instances sharing their input and supply nets
+* `arrays`: an `InstanceArray` of `n` elements, with per-element slices of wide buses
+* `bundles`: `n` instances of nested `Bundle`s, connected to Bundle-valued ports
+* `slices`: buses re-arranged through layers of `Slice`s and `Concat`s, `n` bits wide
+* `portrefs`: `n` instances wired to one another through `PortRef`s
+
+All are built from the same transistor-level `Inv` leaf cell,
+so that each also exercises PDK compilation and netlisting.
+"""
+
+import hdl21 as h
+
+
+@h.paramclass
+class Size:
+    """# Benchmark Design Size"""
+
+    n = h.Param(dtype=int, desc="Size. Meaning varies by generator.")
+
+
+@h.module
+class Inv:
+    """# Transistor-level Inverter"""
+
+    i = h.Input()
+    z = h.Output()
+    VDD, VSS = h.Inputs(2)
+
+    p = h.Pmos()(d=z, g=i, s=VDD, b=VDD)
+    n = h.Nmos()(d=z, g=i, s=VSS, b=VSS)
+
+
+@h.bundle
+class Supplies:
+    """# Power Supplies"""
+
+    VDD, VSS = h.Signals(2)
+
+
+@h.bundle
+class Channel:
+    """# Nested Bundle, including a differential pair and its supplies"""
+
+    data = h.Diff()
+    clk = h.Diff()
+    pwr = Supplies()
+    en = h.Signal()
+
+
+@h.module
+class ChannelRx:
+    """# Receiver of a `Channel`"""
+
+    ch = Channel(port=True)
+    inv = Inv(i=ch.en, z=ch.data.p, VDD=ch.pwr.VDD, VSS=ch.pwr.VSS)
+
+
+@h.generator
+def chain(params: Size) -> h.Module:
+    """# Chain of `n` Modules, each instantiating the one below it"""
+
+    if params.n < 1:
+        raise ValueError(f"Invalid chain depth {params.n}")
+    if params.n == 1:
+        inner = Inv
+    else:
+        inner = chain(n=params.n - 1)
+
+    @h.module
+    class Chain:
+        i = h.Input()
+        z = h.Output()
+        VDD, VSS = h.Inputs(2)
+        inner_ = inner(i=i, z=z, VDD=VDD, VSS=VSS)
+
+    return Chain
+
+
+@h.generator
+def fanout(params: Size) -> h.Module:
+    """# `n` inverters, all driven by the same input"""
+
+    m = h.Module()
+    m.i = h.Input()
+    m.z = h.Output(width=params.n)
+    m.VDD, m.VSS = h.Inputs(2)
+    for k in range(params.n):
+        m.add(Inv(i=m.i, z=m.z[k], VDD=m.VDD, VSS=m.VSS), name=f"inv{k}")
+    return m
+
+
+@h.generator
+def arrays(params: Size) -> h.Module:
+    """# An array of `n` inverters, wired to slices of `n`-bit buses"""
+
+    @h.module
+    class Arrays:
+        i = h.Input(width=params.n)
+        z = h.Output(width=params.n)
+        VDD, VSS = h.Inputs(2)
+        invs = params.n * Inv(i=i, z=z, VDD=VDD, VSS=VSS)
+
+    return Arrays
+
+
+@h.generator
+def bundles(params: Size) -> h.Module:
+    """# `n` nested-`Channel` bundles, each connected to a receiver"""
+
+    m = h.Module()
+    for k in range(params.n):
+        ch = m.add(Channel(), name=f"ch{k}")
+        m.add(ChannelRx(ch=ch), name=f"rx{k}")
+    return m
+
+
+@h.generator
+def slices(params: Size) -> h.Module:
+    """# An `n`-bit bus, shuffled through layers of slices and concatenations before reaching an inverter array"""
+
+    n = params.n
+    m = h.Module()
+    m.i = h.Input(width=n)
+    m.z = h.Output(width=n)
+    m.VDD, m.VSS = h.Inputs(2)
+
+    # Reverse, then interleave the two halves, then rotate by one
+    bus = m.i[::-1]
+    half = n // 2
+    bus = h.Concat(*[h.Concat(bus[k], bus[half + k]) for k in range(half)])
+    bus = h.Concat(bus[1:], bus[0])
+    m.invs = n * Inv(i=bus, z=m.z, VDD=m.VDD, VSS=m.VSS)
+    return m
+
+
+@h.generator
+def portrefs(params: Size) -> h.Module:
+    """# `n` inverters, each of whose input is a `PortRef` to the prior one's output"""
+
+    m = h.Module()
+    m.i = h.Input()
+    m.z = h.Output()
+    m.VDD, m.VSS = h.Inputs(2)
+    prev = m.add(Inv(i=m.i, VDD=m.VDD, VSS=m.VSS), name="inv0")
+    for k in range(1, params.n):
+        inv = m.add(Inv(VDD=prev.VDD, VSS=prev.VSS), name=f"inv{k}")
+        inv.i = prev.z
+        prev = inv
+    prev.z = m.z
+    return m
@@ -0,0 +1,306 @@
+"""
+# Hdl21 Benchmark Suite
+
+Times each stage of the Hdl21 flow, separately, on a set of synthetic and example-based workloads:
+
+* `elaborate`: `h.elaborate`
+* `flatten`: `hdl21.flatten.flatten`, of the elaborated design
+* `compile`: PDK compilation, to the built-in sample PDK
+* `to_proto`: export to VLSIR
+* `from_proto`: import of the exported VLSIR `Package`
+* `netlist`: SPICE netlisting of the exported `Package`
+
+Stages run in that order, each on the results of those before it.
+Stages which fail, e.g. `flatten` of designs it does not support, are recorded as errors, and do not stop the others.
+
+Each workload runs in its own (forked) process, so that its peak memory - the maximum resident set size - is its own,
+and so that generator caches and the like start fresh. With `--trace-memory`, each workload is run a second time
+with `tracemalloc` enabled, additionally recording the peak Python-allocated memory of each stage.
+(These runs are not timed; `tracemalloc` slows things down considerably.)
+
+Results are written as JSON, to `--output` or stdout. A human-readable summary is printed to stderr.
+
+Usage, from the repository root:
+```
+python -m benchmarks.suite [--scale 2] [--only chain arrays ro] [--output results.json] [--trace-memory]
+```
+"""
+
+import io
+import sys
+import json
+import argparse
+import platform
+import resource
+import tracemalloc
+import traceback
+import multiprocessing
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import hdl21 as h
+from hdl21.flatten import flatten
+from hdl21.pdk import sample_pdk
+
+from . import designs
+from .timing import Timer
+
+# The stages of the flow, in order
+STAGES = ["elaborate", "flatten", "compile", "to_proto", "from_proto", "netlist"]
+
+# The prior stage which each requires to have succeeded
+REQUIRES = dict(
+    flatten="elaborate",
+    compile="elaborate",
+    to_proto="compile",
+    from_proto="to_proto",
+    netlist="to_proto",
+)
+
+
+"""
+# Workloads
+Each is a function from an integer size to a fresh top-level Module.
+Default sizes are chosen to take on the order of a second each, and are multiplied by `--scale`.
+"""
+
+
+def ro(n: int) -> h.Module:
+    """`examples/ro.py` testbench, with an `n` by `n` ring oscillator"""
+    from examples.ro import RoTb, TbParams, RoParams
+
+    # Stages must be odd
+    stages = n if n % 2 else n + 1
+    return RoTb(TbParams(ro=RoParams(stages=stages, rows=n), code=n))
+
+
+def rdac(n: int) -> h.Module:
+    """`examples/rdac.py` resistor ladder and mux tree, with `n` bits (at least two)"""
+    from examples.rdac import (
+        rladder,
+        RLadderParams,
+        mux_tree,
+        MuxTreeParams,
+        PassGateParams,
+        PdkResistor,
+        Nch,
+        Pch,
+        PdkMosParams,
+    )
+    from hdl21.prefix import µ, n as nano
+
+    n = max(n, 2)
+    rparams = RLadderParams(nseg=2**n - 1, res=PdkResistor(w=4 * µ, l=10 * µ))
+    mparams = MuxTreeParams(
+        nbit=n,
+        mux_params=PassGateParams(
+            nmos=Nch(PdkMosParams(l=1 * nano)),
+            pmos=Pch(PdkMosParams(l=1 * nano)),
+        ),
+    )
+
+    # Wrap the two in a single top-level Module
+    top = h.Module(name=f"Rdac{n}")
+    top.ladder = rladder(rparams)()
+    top.mux = mux_tree(mparams)()
+    for inst in (top.ladder, top.mux):
+        for portname, port in inst.of.ports.items():
+            sig = top.add(h.Signal(width=port.width), name=f"{inst.name}_{portname}")
+            inst.connect(portname, sig)
+    return top
+
+
+def encoder(n: int) -> h.Module:
+    """`examples/encoder.py` one-hot encoder, `n` bits wide"""
+    from examples.encoder import OneHotEncoder
+
+    return OneHotEncoder(width=n if n % 2 == 0 else n + 1)
+
+
+# All workloads, and their default sizes
+WORKLOADS: Dict[str, Any] = dict(
+    chain=(lambda n: designs.chain(n=n), 200),
+    fanout=(lambda n: designs.fanout(n=n), 2000),
+    arrays=(lambda n: designs.arrays(n=n), 2000),
+    bundles=(lambda n: designs.bundles(n=n), 500),
+    slices=(lambda n: designs.slices(n=n), 1000),
+    portrefs=(lambda n: designs.portrefs(n=n), 2000),
+    ro=(ro, 30),
+    rdac=(rdac, 8),
+    encoder=(encoder, 12),
+)
+
+
+def run_stages(top: h.Module, timer: Callable) -> None:
+    """Run each stage of the flow on `top`, measuring each via `timer(stage_name, stage_func)`."""
+
+    state: Dict[str, Any] = dict(top=top)
+
+    def elaborate():
+        state["top"] = h.elaborate(state["top"])
+
+    def flatten_():
+        flatten(state["top"])
+
+    def compile_():
+        sample_pdk.compile(state["top"])
+
+    def to_proto():
+        state["pkg"] = h.to_proto(state["top"])
+
+    def from_proto():
+        h.from_proto(state["pkg"])
+
+    def netlist():
+        h.netlist(state["pkg"], io.StringIO(), fmt="spice")
+
+    funcs = dict(
+        elaborate=elaborate,
+        flatten=flatten_,
+        compile=compile_,
+        to_proto=to_proto,
+        from_proto=from_proto,
+        netlist=netlist,
+    )
+    for stage in STAGES:
+        timer(stage, funcs[stage])
+
+
+def run_workload(name: str, size: int) -> Dict[str, Any]:
+    """Run workload `name` at `size`. Returns a dictionary of results, one entry per stage."""
+
+    build, _ = WORKLOADS[name]
+    stages: Dict[str, Dict[str, Any]] = {s: dict(stage=s) for s in STAGES}
+
+    def timed(stage: str, func: Callable) -> None:
+        required = REQUIRES.get(stage, None)
+        if required is not None and "error" in stages[required]:
+            stages[stage]["error"] = f"Skipped, as `{required}` failed"
+            return
+        with Timer() as timer:
+            try:
+                func()
+            except Exception as e:
+                stages[stage]["error"] = f"{type(e).__name__}: {e}"[:500]
+        stages[stage]["time"] = timer.time
+
+    try:
+        with Timer() as timer:
+            top = build(size)
+    except Exception as e:
+        return dict(workload=name, size=size, error=f"{type(e).__name__}: {e}"[:500])
+    build_time = timer.time
+    run_stages(top, timed)
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        maxrss *= 1024  # Linux reports kilobytes, MacOS bytes
+
+    return dict(
+        workload=name,
+        size=size,
+        build_time=build_time,
+        peak_rss=maxrss,
+        stages=list(stages.values()),
+    )
+
+
+def trace_workload(name: str, size: int) -> Dict[str, int]:
+    """Run workload `name` at `size` with `tracemalloc` enabled. Returns the peak traced memory of each stage."""
+
+    build, _ = WORKLOADS[name]
+    peaks: Dict[str, int] = dict()
+
+    def traced(stage: str, func: Callable) -> None:
+        tracemalloc.reset_peak()
+        try:
+            func()
+        except Exception:
+            pass  # Errors are reported by the timed runs
+        peaks[stage] = tracemalloc.get_traced_memory()[1]
+
+    tracemalloc.start()
+    try:
+        top = build(size)
+        run_stages(top, traced)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def isolated(func: Callable, *args) -> Any:
+    """Run `func(*args)` in a forked child process, if available, and return its result."""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return func(*args)
+    ctx = multiprocessing.get_context("fork")
+    with ctx.Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+def run(names: List[str], scale: float, trace_memory: bool) -> Dict[str, Any]:
+    """Run each of workloads `names`, returning the JSON-compatible results."""
+
+    results = []
+    for name in names:
+        _, default_size = WORKLOADS[name]
+        size = max(1, int(default_size * scale))
+        try:
+            result = isolated(run_workload, name, size)
+        except Exception:
+            result = dict(workload=name, size=size, error=traceback.format_exc())
+        if "error" in result:
+            # Failed to build, or crashed altogether. Record it and move on.
+            results.append(result)
+            print(f"{name:<10} n={size:<6} error", file=sys.stderr)
+            continue
+        if trace_memory:
+            peaks = isolated(trace_workload, name, size)
+            for entry in result["stages"]:
+                entry["peak_traced"] = peaks.get(entry["stage"], None)
+        results.append(result)
+        summarize(result)
+
+    return dict(
+        meta=dict(
+            time=datetime.now(timezone.utc).isoformat(),
+            python=platform.python_version(),
+            platform=platform.platform(),
+            hdl21=getattr(h, "__version__", None),
+            scale=scale,
+        ),
+        results=results,
+    )
+
+
+def summarize(result: Dict[str, Any]) -> None:
+    """Print a one-line summary of `result` to stderr"""
+    parts = [f"{result['workload']:<10}", f"n={result['size']:<6}"]
+    for entry in result["stages"]:
+        if "error" in entry:
+            parts.append(f"{entry['stage']}=error".ljust(len(entry["stage"]) + 7))
+        else:
+            parts.append(f"{entry['stage']}={entry['time']:.3f}s")
+    parts.append(f"rss={result['peak_rss'] / 2**20:.0f}MB")
+    print(" ".join(parts), file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Hdl21 benchmark suite")
+    parser.add_argument("--scale", type=float, default=1.0, help="Size multiplier")
+    parser.add_argument("--only", nargs="+", choices=list(WORKLOADS), default=None)
+    parser.add_argument("--output", default=None, help="JSON output path")
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(WORKLOADS)
+    results = run(names, args.scale, args.trace_memory)
+
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+# Benchmark Timing Helpers
+
+Shared by the `suite` and each of the `bench_*` microbenchmarks.
+"""
+
+import time
+from typing import Callable, Optional
+
+
+def timeit(func: Callable, num: int) -> float:
+    """Time `num` calls to `func`, returning microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(num):
+        func()
+    return (time.perf_counter() - start) / num * 1e6
+
+
+class Timer:
+    """Context manager which records the wall-clock seconds spent in its block, as `time`.
+    The time is recorded whether the block completes or raises."""
+
+    def __init__(self):
+        self.start: Optional[float] = None
+        self.time: Optional[float] = None
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.time = time.perf_counter() - self.start
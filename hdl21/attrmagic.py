@@ -19,7 +19,7 @@ The scheme adopted here is what we've empirically observed to be the most reliab
 The methods here primarily serve as a central reminder of and reusable source for this scheme.
 """
 
-from typing import TypeVar, Type, Any
+from typing import TypeVar, Type, Any, Callable, Optional
 
 T = TypeVar("T")
 
@@ -115,3 +115,79 @@ def only_set_known_attrs(cls: Type[T]) -> Type[T]:
 
     cls.__setattr__ = __setattr__
     return cls
+
+
+class lazy:
+    """
+    Lazily-created attribute.
+
+    Class-level descriptor which creates its value, via `factory`, upon first access from each instance.
+    The value is then stored in the instance's `__dict__`, where it shadows the descriptor for all later accesses.
+    Primarily used for back-reference containers (e.g. `Signal._slices`), which most objects never fill,
+    and which would otherwise cost an empty container per object.
+
+    Requires the instance have a `__dict__`, i.e. not to be `__slots__`-only.
+    Getters such as the `_Instance.__getattr__` override are not involved: the descriptor is found by regular attribute lookup.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self.name: Optional[str] = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self  # Class-level access
+        value = obj.__dict__[self.name] = self.factory()
+        return value
+
+
+class lazy_slot:
+    """
+    Lazily-created `__slots__` attribute.
+
+    The `lazy` counterpart for `__slots__`-only classes, which have no `__dict__` to store values in.
+    Wraps the class's slot (member) descriptor `slot`, and fills the slot via `factory` upon its first access.
+    Unlike `lazy`, this remains in use for every access, as slots cannot be shadowed.
+    Generally applied via the `lazy_slots` class decorator.
+    """
+
+    def __init__(self, slot: Any, factory: Callable[[], Any]):
+        self.slot = slot
+        self.factory = factory
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self  # Class-level access
+        try:
+            return self.slot.__get__(obj, objtype)
+        except AttributeError:
+            value = self.factory()
+            self.slot.__set__(obj, value)
+            return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self.slot.__set__(obj, value)
+
+    def __delete__(self, obj: Any) -> None:
+        self.slot.__delete__(obj)
+
+
+def lazy_slots(**factories: Callable[[], Any]) -> Callable[[Type[T]], Type[T]]:
+    """
+    Class decorator making each of the `__slots__` named in `factories` a `lazy_slot`, created by its factory.
+    E.g. `@lazy_slots(_slices=set)` leaves `_slices` unset until first access, which sets it to an empty `set`.
+    """
+
+    def inner(cls: Type[T]) -> Type[T]:
+        for name, factory in factories.items():
+            slot = cls.__dict__.get(name, None)
+            if slot is None or name not in cls.__slots__:
+                msg = f"Internal Error: `lazy_slots` attribute `{name}` is not a slot of {cls}"
+                raise RuntimeError(msg)
+            setattr(cls, name, lazy_slot(slot, factory))
+        return cls
+
+    return inner
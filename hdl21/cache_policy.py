@@ -0,0 +1,146 @@
+"""
+# Generator Cache Policies
+
+Bookkeeping for bounding the size of the `GeneratorCache`:
+recency and frequency tracking for its eviction policies, its counters, and Module-size estimates.
+"""
+
+# Std-Lib Imports
+import sys
+from enum import Enum
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# Local imports
+from .datatype import datatype
+
+
+class CachePolicy(Enum):
+    """# Generator Cache Eviction Policy"""
+
+    LRU = "lru"  # Evict the least-recently used entry
+    LFU = "lfu"  # Evict the least-frequently used entry. Ties go to the least-recently used.
+
+
+@datatype
+class CacheStats:
+    """# Generator Cache Counters"""
+
+    hits: int = 0  # Calls served from the in-memory cache
+    misses: int = 0  # Calls not found in it, which were loaded from disk or generated
+    evictions: int = 0  # Entries evicted
+    # Hits on evicted entries, which remained alive elsewhere. Included in `hits`.
+    revivals: int = 0
+
+
+class LruTracker:
+    """
+    # Least-Recently-Used Tracker
+    Tracks the order of use of a set of keys. All operations are constant-time.
+    """
+
+    def __init__(self):
+        self.order: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def add(self, key: Hashable) -> None:
+        self.order[key] = None
+
+    def touch(self, key: Hashable) -> None:
+        self.order.move_to_end(key)
+
+    def remove(self, key: Hashable) -> None:
+        self.order.pop(key, None)
+
+    def victim(self) -> Optional[Hashable]:
+        """Get the next key to evict, or `None` if empty"""
+        return next(iter(self.order), None)
+
+    def clear(self) -> None:
+        self.order.clear()
+
+
+class LfuTracker:
+    """
+    # Least-Frequently-Used Tracker
+    Tracks the number of uses of a set of keys, in per-count buckets, each in order of use.
+    All operations are constant-time.
+    """
+
+    def __init__(self):
+        self.counts: Dict[Hashable, int] = dict()
+        self.buckets: Dict[int, "OrderedDict[Hashable, None]"] = dict()
+        self.min_count = 0
+
+    def add(self, key: Hashable) -> None:
+        self.counts[key] = 1
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_count = 1
+
+    def touch(self, key: Hashable) -> None:
+        count = self.counts[key]
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_count == count:
+                self.min_count = count + 1
+        self.counts[key] = count + 1
+        self.buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def remove(self, key: Hashable) -> None:
+        count = self.counts.pop(key, None)
+        if count is None:
+            return
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_count == count:
+                self.min_count = min(self.buckets, default=0)
+
+    def victim(self) -> Optional[Hashable]:
+        """Get the next key to evict, or `None` if empty"""
+        if not self.counts:
+            return None
+        return next(iter(self.buckets[self.min_count]))
+
+    def clear(self) -> None:
+        self.counts.clear()
+        self.buckets.clear()
+        self.min_count = 0
+
+
+def new_tracker(policy: CachePolicy) -> Any:
+    """Create a tracker for `policy`"""
+    if policy == CachePolicy.LRU:
+        return LruTracker()
+    if policy == CachePolicy.LFU:
+        return LfuTracker()
+    raise ValueError(f"Invalid CachePolicy {policy}")
+
+
+def approx_size(module: "Module") -> int:
+    """Approximate the memory footprint of `module`, in bytes.
+    Includes its attribute containers and the HDL objects directly within them, and their own attributes,
+    but not the Modules they instantiate, nor objects shared with other Modules."""
+    getsize = sys.getsizeof
+    size = getsize(module) + getsize(module.__dict__)
+    containers = (
+        module.ports,
+        module.signals,
+        module.instances,
+        module.instarrays,
+        module.instbundles,
+        module.bundles,
+        module.namespace,
+    )
+    size += sum(getsize(c) for c in containers)
+    for obj in module.namespace.values():
+        size += getsize(obj)
+        attrs = getattr(obj, "__dict__", None)
+        if attrs is not None:
+            size += getsize(attrs)
+        conns = getattr(obj, "conns", None)
+        if conns is not None:
+            size += getsize(conns)
+    return size
@@ -25,9 +25,12 @@ Notes:
   - Generally this means modules which are imported as part of `__init__.py`
 - `@datatype` is designed solely to work on `pydantic.dataclasses.dataclass`es.
   - Notable exceptions include *union types* thereof, which do not have the necessary fields/ methods.
+- Construction via the class validates every field. Internal code creating `Slice`s of existing Signals,
+  from known-valid indices, can skip validation with `construct`. `Slice` is its only user.
 """
 
-from typing import TypeVar, Type, Optional
+from dataclasses import fields, MISSING
+from typing import TypeVar, Type, Optional, Dict, List, Tuple, Any, Callable
 from pydantic import __version__ as _pydantic_version
 
 
@@ -101,3 +104,52 @@ def datatype(cls: Optional[Type[T]] = None, **kwargs) -> Type[T]:
     if cls is None:
         return inner  # Called with parens, e.g. `@datatype()`
     return inner(cls)  # Called without parens
+
+
+def construct(cls: Type[T], **kwargs: Any) -> T:
+    """
+    # Trusted Construction
+
+    Create a `cls` datatype from field-values `kwargs`, *without* validating them.
+    Unspecified fields are set to their defaults, and `__post_init__` runs as usual.
+
+    Intended solely for intra-package use, and currently used only for `Slice`s,
+    created by slicing existing Signals and by proto-importing, from values known to be valid.
+    Other datatypes, and all user-facing construction, should use the (validating) class constructor.
+    """
+
+    obj = cls.__new__(cls)
+    # Set fields with `object.__setattr__`, which works for frozen and `__slots__` datatypes too
+    setattr_ = object.__setattr__
+    for name, default, default_factory in _field_defaults(cls):
+        if name in kwargs:
+            setattr_(obj, name, kwargs.pop(name))
+        elif default_factory is not MISSING:
+            setattr_(obj, name, default_factory())
+        elif default is not MISSING:
+            setattr_(obj, name, default)
+        else:
+            raise TypeError(f"{cls.__name__} missing required field `{name}`")
+    if kwargs:
+        raise TypeError(f"Invalid fields {list(kwargs)} for {cls.__name__}")
+
+    if not PYDANTIC_V2:
+        setattr_(obj, "__pydantic_initialised__", True)
+
+    post_init = getattr(cls, "__post_init__", None)
+    if post_init is not None:
+        post_init(obj)
+    return obj
+
+
+# Cache of each datatype's (name, default, default-factory) per field, used by `construct`
+_field_defaults_cache: Dict[type, List[Tuple[str, Any, Callable]]] = dict()
+
+
+def _field_defaults(cls: type) -> List[Tuple[str, Any, Callable]]:
+    """Get the (name, default, default-factory) of each of `cls`'s fields"""
+    rv = _field_defaults_cache.get(cls, None)
+    if rv is None:
+        rv = [(f.name, f.default, f.default_factory) for f in fields(cls) if f.init]
+        _field_defaults_cache[cls] = rv
+    return rv
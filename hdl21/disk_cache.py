@@ -0,0 +1,376 @@
+"""
+# Generator Disk Cache
+
+Optional persistent tier of the `GeneratorCache`, which stores generated Modules on disk,
+so that later Python processes can skip re-running their generators.
+
+Entries are keyed by:
+* The generator's qualified name,
+* A hash of its function source, and of the sources of the generators and same-module helper functions it refers to, and
+* The `_unique_name` of its parameters.
+
+Generators defined inside functions, whose results may depend on the functions' local state, are not cached on disk.
+
+Each generator's entries live in a directory per source-hash. Upon first use of a generator in a process,
+entries from any other (i.e. out-of-date) version of its source are evicted.
+
+Generated Modules are stored before elaboration, exactly as returned by their generators.
+They are serialized with `pickle`, with references to shared "definition" objects stored by name, rather than by value:
+* Python modules,
+* Module, Bundle, ExternalModule, Primitive and Generator objects importable from a Python module, and
+* Modules produced by calls to other cached generators, which are re-run through the `GeneratorCache` upon loading,
+  and hence generally loaded from it, or from this cache.
+Modules produced by generators with caching disabled are stored by value, as they would otherwise be re-generated upon loading.
+Loading an entry therefore reconnects it to the same in-memory objects as a freshly generated Module.
+
+Note the source hashes do not cover changes to anything other than generator and helper-function source,
+e.g. Modules defined elsewhere but inlined into a generated one, or behavior of other libraries.
+Clear the cache (`DiskCache.clear`) after such changes.
+"""
+
+# Std-Lib Imports
+import os
+import io
+import sys
+import types
+import pickle
+import shutil
+import hashlib
+import inspect
+import tempfile
+import importlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple, Union
+
+# Local imports
+from .module import Module
+
+
+class DiskCache:
+    """
+    # Generator Disk Cache
+
+    Stores generated Modules in directory `path`.
+    Generally enabled via `hdl21.generator.cache.enable_disk(path)`,
+    or by setting the `HDL21_GENERATOR_CACHE` environment variable to a directory path.
+    """
+
+    # Bump when the entry format changes
+    FORMAT = 2
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Generators whose stale entries have been evicted this session
+        self.pruned: Set[int] = set()
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.failures = 0
+
+    def load(self, call: "GeneratorCall") -> Optional[Module]:
+        """Load the result of `call` from disk, if available. Returns `None` on misses."""
+        entry = self.entry_path(call)
+        if entry is None:
+            return None
+        try:
+            with open(entry, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+
+        try:
+            unique_name, module = loads(data)
+            if unique_name != call_name(call) or not isinstance(module, Module):
+                raise RuntimeError(f"Invalid generator cache entry {entry}")
+        except Exception:
+            # Corrupt, or no longer loadable. Evict it and treat as a miss.
+            self.failures += 1
+            self.misses += 1
+            entry.unlink(missing_ok=True)
+            return None
+
+        self.hits += 1
+        module._generated_by = call
+        return module
+
+    def store(self, call: "GeneratorCall", module: Module) -> bool:
+        """Store `module`, the result of `call`. Returns a boolean indication of success.
+        Failures, e.g. for Modules which include objects that cannot be pickled, are otherwise ignored."""
+        entry = self.entry_path(call)
+        if entry is None:
+            return False
+        try:
+            data = dumps((call_name(call), module), root=module)
+        except Exception:
+            self.failures += 1
+            return False
+
+        # Write to a temporary file and move it into place, so that concurrent readers never see partial entries
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, entry)
+        except OSError:
+            self.failures += 1
+            Path(tmp).unlink(missing_ok=True)
+            return False
+        self.stores += 1
+        return True
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        for child in self.path.iterdir():
+            if child.is_dir():
+                shutil.rmtree(child, ignore_errors=True)
+            else:
+                child.unlink(missing_ok=True)
+        self.pruned.clear()
+
+    def entry_path(self, call: "GeneratorCall") -> Optional[Path]:
+        """Get the path of the entry for `call`.
+        Returns `None` if `call` cannot be cached on disk, e.g. if its generator's source is unavailable."""
+        gen = call.gen
+        gen_name = f"{gen.func.__module__}.{gen.func.__qualname__}"
+        if "<locals>" in gen_name:
+            # Defined inside a function, and potentially dependent on its local state. Not cached.
+            return None
+        src = source_hash(gen)
+        if src is None:
+            return None
+        gen_dir = self.path / gen_name
+        if id(gen) not in self.pruned:
+            self.prune(gen_dir, keep=src)
+            self.pruned.add(id(gen))
+        params = hashlib.sha256(call_name(call).encode("utf-8")).hexdigest()
+        return gen_dir / src / f"{params}.pkl"
+
+    def prune(self, gen_dir: Path, keep: str) -> None:
+        """Evict all entries in `gen_dir` made by versions of its generator other than source-hash `keep`."""
+        if not gen_dir.is_dir():
+            return
+        for child in gen_dir.iterdir():
+            if child.name != keep:
+                shutil.rmtree(child, ignore_errors=True)
+
+
+def call_name(call: "GeneratorCall") -> str:
+    """Unique name of the parameters of `call`"""
+    from .params import _unique_name
+
+    return _unique_name(call.params)
+
+
+"""
+# Source Hashing
+"""
+
+
+def source_hash(gen: "Generator") -> Optional[str]:
+    """Get the source-hash of generator `gen`, computing and caching it on `gen` if necessary.
+    Returns `None` if its source is not available, e.g. for generators defined in `exec` strings."""
+    if not hasattr(gen, "_source_hash"):
+        gen._source_hash = _source_hash(gen.func, set())
+    return gen._source_hash
+
+
+def _source_hash(func: types.FunctionType, seen: Set[int]) -> Optional[str]:
+    """Hash the source of `func`, and of the generators and same-module functions it refers to."""
+    from . import __version__
+    from .generator import Generator
+
+    seen.add(id(func))
+    try:
+        src = inspect.getsource(func)
+    except (OSError, TypeError):
+        return None
+
+    h = hashlib.sha256()
+    header = (
+        f"format={DiskCache.FORMAT} hdl21={__version__} python={sys.version_info[:2]}\n"
+    )
+    h.update(header.encode("utf-8"))
+    h.update(src.encode("utf-8"))
+
+    for name, ref in sorted(_referenced(func).items()):
+        if isinstance(ref, Generator):
+            ref = ref.func
+        elif not (
+            isinstance(ref, types.FunctionType) and ref.__module__ == func.__module__
+        ):
+            continue
+        if id(ref) in seen:
+            continue  # Recursive references, e.g. from generators that call themselves
+        dep = _source_hash(ref, seen)
+        if dep is None:
+            return None
+        h.update(f"\n{name}={dep}".encode("utf-8"))
+
+    return h.hexdigest()[:16]
+
+
+def _referenced(func: types.FunctionType) -> Dict[str, Any]:
+    """Get the global and closure-captured values referred to by `func`, keyed by name."""
+    names: Set[str] = set()
+    stack = [func.__code__]
+    while stack:
+        code = stack.pop()
+        names.update(code.co_names)
+        stack.extend(c for c in code.co_consts if isinstance(c, types.CodeType))
+
+    refs = {name: func.__globals__[name] for name in names if name in func.__globals__}
+    for name, cell in zip(func.__code__.co_freevars, func.__closure__ or ()):
+        try:
+            refs[name] = cell.cell_contents
+        except ValueError:
+            pass  # Empty cell
+    return refs
+
+
+"""
+# Pickling
+"""
+
+# Cache of the Python module and attribute-name of each definition object found by `_find_global`, keyed by `id`
+_globals_index: Dict[int, Tuple[str, str]] = dict()
+_globals_index_size = 0
+
+
+def _find_global(obj: Any) -> Optional[Tuple[str, str]]:
+    """Find the Python module and attribute name at which `obj` is importable, if any."""
+
+    def check(found: Optional[Tuple[str, str]]) -> Optional[Tuple[str, str]]:
+        if found is None:
+            return None
+        pymodule = sys.modules.get(found[0], None)
+        if getattr(pymodule, found[1], None) is obj:
+            return found
+        return None
+
+    # Check the object's defining module first. For generators this is that of their function.
+    name = getattr(obj, "name", None) or ""
+    func = getattr(obj, "func", None)
+    source_info = getattr(obj, "_source_info", None)
+    if func is not None:
+        found = check((func.__module__, name))
+        if found is not None:
+            return found
+    elif source_info is not None and source_info.pymodule is not None:
+        found = check((source_info.pymodule.__name__, name))
+        if found is not None:
+            return found
+
+    # Otherwise look it up in the index of all loaded Python modules, (re)building it if new ones have been loaded
+    global _globals_index_size
+    found = check(_globals_index.get(id(obj), None))
+    if found is None and len(sys.modules) != _globals_index_size:
+        _index_globals()
+        found = check(_globals_index.get(id(obj), None))
+    return found
+
+
+def _index_globals() -> None:
+    """(Re)build the index of definition objects in all loaded Python modules"""
+    from .bundle import Bundle
+    from .external_module import ExternalModule
+    from .primitives import Primitive
+    from .generator import Generator
+
+    global _globals_index_size
+    kinds = (Module, Bundle, ExternalModule, Primitive, Generator)
+    _globals_index.clear()
+    for modname, pymodule in list(sys.modules.items()):
+        attrs = getattr(pymodule, "__dict__", None)
+        if not isinstance(attrs, dict):
+            continue
+        for attr, val in list(attrs.items()):
+            # Skip private attributes, which are often process-specific state
+            if isinstance(val, kinds) and not attr.startswith("_"):
+                _globals_index.setdefault(id(val), (modname, attr))
+    _globals_index_size = len(sys.modules)
+
+
+def dumps(obj: Any, root: Optional[Module] = None) -> bytes:
+    """Serialize `obj`, storing shared definition objects by reference.
+    `root` is the generated Module being serialized, if any, which is stored by value."""
+    buf = io.BytesIO()
+    with _recursion_limit():
+        _Pickler(buf, root=root).dump(obj)
+    return buf.getvalue()
+
+
+def loads(data: bytes) -> Any:
+    """Deserialize `data` produced by `dumps`, resolving its references"""
+    with _recursion_limit():
+        return _Unpickler(io.BytesIO(data)).load()
+
+
+@contextmanager
+def _recursion_limit(limit: int = 10_000):
+    """Temporarily raise the recursion limit to at least `limit`.
+    Pickling recurses through the object graph, which for connections to long chains of `PortRef`s and the like can run deep."""
+    prior = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(prior, limit))
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(prior)
+
+
+class _Pickler(pickle.Pickler):
+    """Pickler which stores shared definition objects by reference.
+    Everything reachable from `root` other than these is stored by value."""
+
+    def __init__(self, file: io.BytesIO, root: Optional[Module]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.root = root
+
+    def persistent_id(self, obj: Any) -> Optional[tuple]:
+        from .bundle import Bundle
+        from .external_module import ExternalModule
+        from .primitives import Primitive
+        from .generator import Generator
+
+        if isinstance(obj, types.ModuleType):
+            return ("pymodule", obj.__name__)
+        if isinstance(obj, Module):
+            if obj is self.root:
+                return None
+            call = obj._generated_by
+            if call is not None and call.gen.enable_cache:
+                return ("generated", call.gen, call.params)
+        if isinstance(obj, (Module, Bundle, ExternalModule, Primitive, Generator)):
+            found = _find_global(obj)
+            if found is not None:
+                return ("global",) + found
+            if isinstance(obj, Generator):
+                raise pickle.PicklingError(f"Cannot store reference to {obj}")
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    """Unpickler which resolves the references stored by `_Pickler`"""
+
+    def persistent_load(self, pid: tuple) -> Any:
+        kind = pid[0]
+        if kind == "pymodule":
+            return importlib.import_module(pid[1])
+        if kind == "global":
+            pymodule = importlib.import_module(pid[1])
+            return getattr(pymodule, pid[2])
+        if kind == "generated":
+            # Run the call through the `GeneratorCache`, rather than calling the generator,
+            # which for `lazy` generators returns the `GeneratorCall` instead of its Module.
+            from .generator import GeneratorCall, run
+
+            _, gen, params = pid
+            return run(GeneratorCall(gen=gen, params=params))
+        raise pickle.UnpicklingError(f"Invalid persistent reference {pid}")
+
+
+__all__ = ["DiskCache"]
@@ -0,0 +1,54 @@
+"""
+# Elaboration Context
+"""
+
+# Std-Lib Imports
+from dataclasses import field
+from typing import Any, Optional, Set
+
+# Local imports
+from ..datatype import datatype, AllowArbConfig
+from ..module import Module
+from .profile import ElabProfile
+from .helpers.width import WidthCache
+
+
+@datatype(config=AllowArbConfig)
+class ElabContext:
+    """
+    # Elaboration Context
+
+    State shared between the passes of a single elaboration.
+    Each call to `Elaborator.elaborate` creates a new `ElabContext`, and drops it upon completion.
+    Nothing here outlives that call, so Modules are free to be garbage-collected once their designs are dropped,
+    and separate designs can be elaborated concurrently, e.g. on separate threads.
+
+    State which *does* need to persist between elaborations, e.g. to support incremental re-elaboration,
+    is stored on the Modules themselves.
+    """
+
+    # Modules which are new or have been edited since their last elaboration.
+    # Note Modules hash *by identity*, so each instance of `Module`,
+    # regardless of the similarity of their content, gets its own entry.
+    dirty: Set[Module] = field(default_factory=set)
+
+    # Modules elaborated elsewhere, e.g. in worker processes.
+    # These are treated as clean, whether or not they have been elaborated in this process.
+    delegated: Set[Module] = field(default_factory=set)
+
+    # Bundle-flattening cache. Created and used by `BundleFlattener`.
+    bundle_cache: Optional[Any] = None
+
+    # Memoized widths of Concats and references. See `helpers.width`.
+    # Entries are invalidated as references are resolved.
+    widths: WidthCache = field(default_factory=dict)
+
+    # Optional profile, recording the time and work of each pass
+    profile: Optional[ElabProfile] = None
+
+    def is_clean(self, module: Module) -> bool:
+        """Boolean indication of whether `module` was completely elaborated before this elaboration began,
+        and has not been edited since. Such Modules need not be visited by any pass."""
+        if module in self.delegated:
+            return True
+        return module._elaborated is not None and module not in self.dirty
@@ -7,11 +7,16 @@ performing one or more transformation-passes.
 """
 
 # Std-Lib Imports
-from typing import List, Type, TypeVar
+from time import perf_counter
+from typing import List, Optional, Set, Type, TypeVar
 
 # Local imports
 from ..datatype import datatype
+from ..module import Module
 from .elaboratable import Elaboratable, Elaboratables, is_elaboratable
+from .context import ElabContext
+from .profile import ElabProfile
+from .helpers.dirty import find_dirty
 
 # Import all the built-in passes, and their abstract base class
 from .passes import (
@@ -22,8 +27,11 @@ from .passes import (
     BundleFlattener,
     ResolvePortRefs,
     ArrayFlattener,
+    ArrayCompactor,
     SliceResolver,
     MarkModules,
+    ModuleDeduplicator,
+    FusedPasses,
 )
 
 
@@ -37,13 +45,35 @@ class Elaborator:
 
     An ordered list of `ElabPass`es.
     Each pass is implemented as a class which inherits from `ElabPass`.
+
+    Passes may declare the other passes they depend upon, via their `depends_on` attribute.
+    Each such dependency which is included in `passes` must run before its dependent.
+
+    If `fuse` is set, consecutive runs of `fusable` passes are executed together,
+    in a single traversal of the hierarchy. See `FusedPasses`.
     """
 
     passes: List[Type[ElabPass]]
+    fuse: bool = True
+
+    def __post_init__(self):
+        # Check that each pass runs after any dependencies it has among our passes
+        for idx, elabpass in enumerate(self.passes):
+            for dep in elabpass.depends_on:
+                if dep in self.passes and dep not in self.passes[:idx]:
+                    msg = f"Invalid Elaborator: pass {elabpass.__name__} depends on {dep.__name__}, which must run before it"
+                    raise RuntimeError(msg)
 
     @staticmethod
-    def default() -> "Elaborator":
-        """Create and return the default Elaborator"""
+    def default(compact_arrays: bool = False, dedup: bool = False) -> "Elaborator":
+        """Create and return the default Elaborator.
+
+        If `compact_arrays` is set, `InstanceArray`s are checked but not flattened into `Instance`s.
+        They are instead expanded during export. This saves considerable memory and time for very large arrays.
+
+        If `dedup` is set, structurally identical Modules are merged into a single definition. See `ModuleDeduplicator`.
+        """
+        dedup_passes = [ModuleDeduplicator] if dedup else []
         return Elaborator(
             passes=[
                 #
@@ -52,7 +82,7 @@ class Elaborator:
                 ResolvePortRefs,
                 ConnTypes,
                 BundleFlattener,
-                ArrayFlattener,
+                ArrayCompactor if compact_arrays else ArrayFlattener,
                 SliceResolver,
                 #
                 # A couple repeats
@@ -60,43 +90,111 @@ class Elaborator:
                 ConnTypes,
                 Orphanage,
                 #
+                # Optional de-duplication
+                #
+                *dedup_passes,
+                #
                 # And final module-marking
                 #
                 MarkModules,
             ]
         )
 
-    def elaborate(self, top: ElaboratableType) -> ElaboratableType:
+    def elaborate(
+        self,
+        top: ElaboratableType,
+        profile: Optional[ElabProfile] = None,
+        *,
+        delegated: Optional[Set[Module]] = None,
+    ) -> ElaboratableType:
         """# Primary elaboration entry point
-        Execute each of our `ElabPass`es in sequence."""
+        Execute each of our `ElabPass`es in sequence.
+
+        Elaboration is incremental. Modules which have already been elaborated,
+        and have not been edited since, are not re-elaborated, nor even walked.
+        Modules which have been edited - and all Modules which instantiate them - are.
+        Note such edits must target the *elaborated* hierarchy, in which Bundles and arrays have been flattened.
+        See `helpers.dirty`.
+
+        If an `ElabProfile` is provided, it is filled in with the time and work of each pass.
+
+        Calls to `lazy` Generators reachable from `top`, or which are `top`, are run first.
+        Instances of them are re-targeted to the generated Modules.
+
+        Modules in the optional `delegated` set are elaborated elsewhere, e.g. by worker processes.
+        They, and everything they instantiate, are skipped. See `hdl21.proto.parallel`."""
+
+        start = perf_counter()
 
         # Check whether we are elaborating a single object or a list thereof
         tops: List[Elaboratable] = top if isinstance(top, List) else [top]
 
+        # Find the Modules which are new or edited since their last elaboration,
+        # and run any lazy `GeneratorCall`s among them, replacing them with their Modules.
+        # These are stored in the context shared by all passes, which lasts only for this elaboration.
+        delegated = delegated or set()
+        tops, dirty = find_dirty(tops, delegated)
+        for module in dirty:
+            module._elaborated = None
+        ctx = ElabContext(dirty=dirty, delegated=delegated, profile=profile)
+
         # Pass `tops` through each of our passes, in order
-        for elabpass in self.passes:
-            tops = elabpass.elaborate(tops=tops)
+        for group in self.schedule():
+            group_start = perf_counter()
+            if len(group) == 1:
+                tops = group[0].elaborate(tops=tops, ctx=ctx)
+            else:
+                tops = FusedPasses.elaborate(tops=tops, passes=group, ctx=ctx)
+            if profile is not None:
+                name = "+".join(p.__name__ for p in group)
+                profile.record_event(name, "traversal", group_start, perf_counter())
+
+        if profile is not None:
+            end = perf_counter()
+            profile.total += end - start
+            profile.record_event("elaborate", "elaborate", start, end)
 
         # Extract the single-element case
         if not isinstance(top, List):
             return tops[0]
         return tops
 
+    def schedule(self) -> List[List[Type[ElabPass]]]:
+        """Group our passes into those run in each hierarchy traversal.
+        If `fuse` is set, consecutive fusable passes share a traversal. Otherwise each pass gets its own."""
+        groups: List[List[Type[ElabPass]]] = []
+        for elabpass in self.passes:
+            if (
+                self.fuse
+                and elabpass.fusable
+                and groups
+                and all(p.fusable for p in groups[-1])
+            ):
+                groups[-1].append(elabpass)
+            else:
+                groups.append([elabpass])
+        return groups
+
 
 # Set the module-scope elaborator
 the_global_elaborator = Elaborator.default()
 
 
-def elaborate(top: ElaboratableType) -> ElaboratableType:
+def elaborate(
+    top: ElaboratableType, *, profile: Optional[ElabProfile] = None
+) -> ElaboratableType:
     """
     # Hdl21 Elaboration
 
     In-memory elaborates of `Module`s, calls to `Generator`s, and lists thereof.
+    Lazy calls to `Generator`s, i.e. `GeneratorCall`s, are replaced by their generated Modules in the returned result.
 
     Optional `passes` lists the ordered `ElabPass`es to run. By default it runs the order specified by `ElabPass.default`.
     Note the order of passes is important; many depend upon others to have completed before they can successfully run.
+
+    Optional `profile` is an `ElabProfile`, which if provided records the time and work done by each pass.
     """
-    return the_global_elaborator.elaborate(top)
+    return the_global_elaborator.elaborate(top, profile=profile)
 
 
 def set_elaborator(e: Elaborator):
@@ -107,6 +205,11 @@ def set_elaborator(e: Elaborator):
     the_global_elaborator = e
 
 
+def get_elaborator() -> Elaborator:
+    """# Get the global `Elaborator`."""
+    return the_global_elaborator
+
+
 def reset_elaborator():
     """# Reset the global `Elaborator` to its default."""
     global the_global_elaborator
@@ -116,7 +219,9 @@ def reset_elaborator():
 __all__ = [
     "elaborate",
     "Elaborator",
+    "ElabProfile",
     "set_elaborator",
+    "get_elaborator",
     "reset_elaborator",
     "Elaboratable",
     "Elaboratables",
@@ -11,12 +11,14 @@ from typing import Any, List, Union
 from ..module import Module
 from ..primitives import PrimitiveCall
 from ..external_module import ExternalModuleCall
+from ..generator import GeneratorCall
 
 
 # Type short-hands for elaborate-able types
 # NOTE: this is identical to `Instantiable`.
 # Although maybe some day it won't be?
-Elaboratable = Union[Module, ExternalModuleCall, PrimitiveCall]
+# `GeneratorCall`s, returned by `lazy` Generators, are resolved to their Modules at the start of elaboration.
+Elaboratable = Union[Module, ExternalModuleCall, PrimitiveCall, GeneratorCall]
 # (Plural Version)
 Elaboratables = Union[Elaboratable, List[Elaboratable]]
 
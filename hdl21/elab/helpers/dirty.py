@@ -0,0 +1,85 @@
+"""
+# Dirty-Module Tracking
+
+Helpers for incremental re-elaboration.
+
+Each `Module` carries an edit-version counter `_version`, incremented by every change to its content,
+and the value of that counter as of its most recent elaboration, `_elaborated_version`.
+Each also records the Modules which instantiated it as of their most recent elaboration, its `_instantiators`.
+Edits mark each of these, and each of theirs, and so on, as `_stale`.
+
+A Module is "dirty" if it has never been elaborated, if its two versions differ, or if it is stale,
+i.e. if any Module it (transitively) instantiates is dirty.
+Only dirty Modules need be re-elaborated; all others can keep their prior results.
+And since every Module a clean Module instantiates is also clean, finding the dirty Modules need not walk into clean ones.
+
+Note edits after elaboration apply to the *elaborated* hierarchy, which is generally not the one originally written.
+Bundles, InstanceArrays and InstanceBundles have by then been flattened into scalar Signals and Instances.
+E.g. after elaborating a Module `mid` with an InstanceArray `mid.arr`, `mid.arr` no longer exists.
+Its Instances (`mid.arr_0`, `mid.arr_1`, etc.) are the ones to edit.
+"""
+
+# Std-Lib Imports
+from typing import List, Optional, Set, Tuple
+
+# Local imports
+from ...module import Module
+from ...generator import GeneratorCall
+from ..elaboratable import Elaboratable
+from .lazy import CallResolver
+
+
+def is_clean(module: Module) -> bool:
+    """Boolean indication of whether `module` and everything it (transitively) instantiates
+    have been elaborated, and have not been edited since."""
+    return (
+        module._elaborated is not None
+        and module._version == module._elaborated_version
+        and not module._stale
+    )
+
+
+def find_dirty(
+    tops: List[Elaboratable], delegated: Optional[Set[Module]] = None
+) -> Tuple[List[Elaboratable], Set[Module]]:
+    """Find all dirty Modules in the hierarchies rooted at `tops`,
+    running any lazy `GeneratorCall`s along the way, including any which are `tops` themselves.
+    Instances of them are re-targeted to the generated Modules.
+
+    Walks only the dirty Modules, stopping at clean ones, and at those in the optional `delegated` set.
+    Returns `tops`, with any `GeneratorCall`s replaced by their Modules, and the set of dirty Modules."""
+
+    delegated = delegated or set()
+    resolver = CallResolver()
+
+    # Depth-first walk the dirty part of the hierarchy. Note Modules hash *by identity*.
+    dirty: Set[Module] = set()
+    stack: List[Module] = list()
+
+    result: List[Elaboratable] = list()
+    for top in tops:
+        if isinstance(top, GeneratorCall):
+            top = resolver.resolve(top)
+        if isinstance(top, Module):
+            stack.append(top)
+        result.append(top)
+
+    while stack:
+        module = stack.pop()
+        if module in dirty or module in delegated or is_clean(module):
+            continue
+        dirty.add(module)
+
+        instlike = (
+            list(module.instances.values())
+            + list(module.instarrays.values())
+            + list(module.instbundles.values())
+        )
+        for inst in instlike:
+            if isinstance(inst.of, GeneratorCall):
+                # Note this marks `module` as edited, which it already is, or it would not have a `GeneratorCall` to resolve.
+                inst.of = resolver.resolve(inst.of)
+            if isinstance(inst.of, Module):
+                stack.append(inst.of)
+
+    return result, dirty
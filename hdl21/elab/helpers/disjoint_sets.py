@@ -0,0 +1,74 @@
+"""
+# Disjoint Sets
+
+Union-find structure, used for grouping connected objects during elaboration.
+"""
+
+# Std-Lib Imports
+from typing import Dict, Generic, Hashable, List, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+
+class DisjointSets(Generic[T]):
+    """
+    # Disjoint Sets
+
+    Union-find over hashable items, with union-by-size and path compression.
+    Both `union` and `find` run in effectively constant (amortized) time.
+
+    Items are kept in insertion order. `groups` returns each set in order of its first-added item,
+    with each set's items in the order they were added, so that results are deterministic.
+    """
+
+    def __init__(self):
+        self.parent: Dict[T, T] = dict()
+        self.size: Dict[T, int] = dict()
+
+    def __contains__(self, item: T) -> bool:
+        return item in self.parent
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def add(self, item: T) -> bool:
+        """Add `item` as its own single-item set, if not already present.
+        Returns a boolean indication of whether it was newly added."""
+        if item in self.parent:
+            return False
+        self.parent[item] = item
+        self.size[item] = 1
+        return True
+
+    def find(self, item: T) -> T:
+        """Find the representative of the set including `item`.
+        Compresses the path from `item` to it along the way."""
+        root = item
+        parent = self.parent
+        while parent[root] is not root:
+            root = parent[root]
+        # Path compression
+        while item is not root:
+            item, parent[item] = parent[item], root
+        return root
+
+    def union(self, a: T, b: T) -> T:
+        """Merge the sets including `a` and `b`, adding either if necessary.
+        Returns the representative of the merged set."""
+        self.add(a)
+        self.add(b)
+        ra, rb = self.find(a), self.find(b)
+        if ra is rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return ra
+
+    def groups(self) -> List[List[T]]:
+        """Get a list of all sets, each as a list of items"""
+        groups: Dict[T, List[T]] = dict()
+        for item in self.parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return list(groups.values())
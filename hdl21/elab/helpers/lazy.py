@@ -0,0 +1,35 @@
+"""
+# Lazy Generator-Call Resolution
+
+Calls to `lazy` Generators return their `GeneratorCall`, rather than running the generator function.
+Instances of these calls are resolved to their generated Modules at the start of elaboration,
+by the same walk which finds the Modules in need of (re-)elaboration. See `helpers.dirty`.
+Only calls reachable from the elaborated tops are ever run.
+
+Identical calls share a single Module. For Generators with caching enabled, this is the `GeneratorCache`'s job.
+For those without, it is limited to calls resolved in the same elaboration.
+"""
+
+# Std-Lib Imports
+from typing import Dict
+
+# Local imports
+from ...module import Module
+from ...generator import GeneratorCall
+
+
+class CallResolver:
+    """Resolves `GeneratorCall`s to their Modules, for the duration of a single elaboration."""
+
+    def __init__(self):
+        # Results of calls to Generators with caching disabled
+        self.uncached: Dict[GeneratorCall, Module] = dict()
+
+    def resolve(self, call: GeneratorCall) -> Module:
+        """Run `call`, or get its result from a prior run."""
+        if call.gen.enable_cache:
+            return call.resolve()
+        module = self.uncached.get(call, None)
+        if module is None:
+            module = self.uncached[call] = call.resolve()
+        return module
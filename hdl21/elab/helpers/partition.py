@@ -0,0 +1,108 @@
+"""
+# Hierarchy Partitioning
+
+Splits the Modules under a set of tops into independent sub-hierarchies, for parallel elaboration.
+"""
+
+# Std-Lib Imports
+from dataclasses import field
+from typing import Dict, List, Optional, Set
+
+# Local imports
+from ...datatype import datatype, AllowArbConfig
+from ...module import Module
+from .dirty import find_dirty
+
+
+@datatype(config=AllowArbConfig)
+class Partition:
+    """
+    # Hierarchy Partition
+
+    The Modules under a set of `tops`, split into:
+    * `roots`, the roots of independent sub-hierarchies. No Module (transitively) instantiated by one root
+      is instantiated by any other. Each can be elaborated separately, e.g. in its own process.
+    * `common` Modules, which are shared between sub-hierarchies, or are otherwise unsuitable as roots.
+      These are elaborated before the `roots`.
+    * The `tops` themselves, which are elaborated last, once all of their children are.
+
+    Only dirty Modules, i.e. those which require elaboration, are included in `roots` and `common`.
+    """
+
+    tops: List[Module]
+    common: List[Module] = field(default_factory=list)
+    roots: List[Module] = field(default_factory=list)
+
+
+def partition(tops: List[Module], dirty: Optional[Set[Module]] = None) -> Partition:
+    """Partition the hierarchies under `tops`.
+
+    Candidate roots are the (dirty) Modules instantiated directly by each top.
+    Any Module reachable from more than one candidate - including the candidates themselves - is instead `common`.
+    So are candidates with Bundle-valued ports, the flattening of which must be shared with their instantiators.
+
+    The set of `dirty` Modules is found via `find_dirty` if not provided."""
+
+    if dirty is None:
+        _, dirty = find_dirty(tops)
+    is_top = set(tops)
+
+    # Collect the candidate roots, in order
+    candidates: Dict[Module, None] = dict()
+    for top in tops:
+        for child in child_modules(top):
+            if child in dirty and child not in is_top:
+                candidates[child] = None
+
+    # Owner of each Module reachable from the candidates: either a candidate, or `None` for those shared.
+    owners: Dict[Module, Optional[Module]] = dict()
+
+    def share(module: Module) -> None:
+        # Mark `module` and all of its descendants as shared
+        stack = [module]
+        while stack:
+            module = stack.pop()
+            if module in owners and owners[module] is None:
+                continue  # Already shared, as are all its descendants
+            owners[module] = None
+            stack.extend(child_modules(module))
+
+    for root in candidates:
+        stack = [root]
+        while stack:
+            module = stack.pop()
+            if module not in owners:
+                owners[module] = root
+                stack.extend(child_modules(module))
+            elif owners[module] is not root:
+                share(module)
+
+    # Sort out the results
+    result = Partition(tops=list(tops))
+    for root in candidates:
+        if owners[root] is not None and not has_bundle_ports(root):
+            result.roots.append(root)
+    result.common = [
+        m
+        for m, owner in owners.items()
+        if m in dirty and (owner is None or (m in candidates and m not in result.roots))
+    ]
+    return result
+
+
+def child_modules(module: Module) -> List[Module]:
+    """Get the Modules directly instantiated by `module`, in order and without repeats."""
+    instlike = (
+        list(module.instances.values())
+        + list(module.instarrays.values())
+        + list(module.instbundles.values())
+    )
+    children = dict.fromkeys(i.of for i in instlike if isinstance(i.of, Module))
+    return list(children)
+
+
+def has_bundle_ports(module: Module) -> bool:
+    """Boolean indication of whether `module` has any Bundle-valued ports, flattened or not."""
+    return bool(module._flat_bundle_ports) or any(
+        b.port for b in module.bundles.values()
+    )
@@ -34,7 +34,7 @@ The important thing is: don't take the results of `resolve_*_type` as the actual
 """
 
 # Std-Lib Imports
-from typing import Union, Callable
+from typing import Any, Callable, Dict, Optional, Union
 
 # Local imports
 from ...portref import PortRef
@@ -100,8 +100,18 @@ def resolve_portref_type(
     return failer(f"Invalid PortRef {pref}")
 
 
-def update_ref_deps(ref: Union[PortRef, BundleRef], resolved: Connectable):
-    """Update all downstream dependencies on a `Ref` after it has been resolved to `resolved`."""
+def update_ref_deps(
+    ref: Union[PortRef, BundleRef],
+    resolved: Connectable,
+    widths: Optional[Dict[Any, int]] = None,
+):
+    """Update all downstream dependencies on a `Ref` after it has been resolved to `resolved`.
+    If provided, entries in width-cache `widths` for `ref` and its dependents are invalidated."""
+
+    if widths is not None:
+        from .width import invalidate_width
+
+        invalidate_width(widths, ref)
 
     # Reconnect all connected ports
     for connected_port in list(ref._connected_ports):
@@ -5,7 +5,7 @@ Function to determine the `width` of connectable types.
 """
 
 # Std-Lib Imports
-from typing import Union, Callable
+from typing import Any, Callable, Dict, Optional, Union
 
 # Local imports
 from ...connect import Connectable
@@ -34,10 +34,19 @@ def fail(msg: str) -> None:
     raise RuntimeError(msg)
 
 
-def width(conn: Connectable, failer: Callable = fail) -> int:
+# Width Cache
+# Memoized widths of `Concat`s and references, keyed by (identity-hashed) connectable.
+# Elaboration creates one per `ElabContext`. Entries are invalidated by `invalidate_width`.
+WidthCache = Dict[Any, int]
+
+
+def width(
+    conn: Connectable, failer: Callable = fail, cache: Optional[WidthCache] = None
+) -> int:
     """Get the `width` of a conn. Largely dispatches across conn types.
     Optional function-valued argument `failer` is passed all errors.
     This is commonly used to pass failure information and control back to `ElabPass`s.
+    Optional `cache` memoizes the widths of `Concat`s and references, including nested ones.
     """
 
     # A reminder, as of this writing:
@@ -54,11 +63,21 @@ def width(conn: Connectable, failer: Callable = fail) -> int:
     if isinstance(conn, Slice):
         return conn.width
     if isinstance(conn, Concat):
-        return sum([width(p) for p in conn.parts])
+        if cache is None:
+            return sum([width(p, failer) for p in conn.parts])
+        cached = cache.get(conn, None)
+        if cached is None:
+            cached = cache[conn] = sum([width(p, failer, cache) for p in conn.parts])
+        return cached
 
     # References
     if isinstance(conn, (BundleRef, PortRef)):
-        return ref_width(conn, failer)
+        if cache is None:
+            return ref_width(conn, failer)
+        cached = cache.get(conn, None)
+        if cached is None:
+            cached = cache[conn] = ref_width(conn, failer)
+        return cached
 
     return failer(f"Invalid `width` of {conn}")
 
@@ -90,3 +109,20 @@ def ref_width(ref: Union[PortRef, BundleRef], failer: Callable = fail) -> int:
     if isinstance(referent, BundleInstance):
         return failer(f"Invalid `width` of Bundle {referent}")
     return failer(f"Invalid `width` of {referent}")
+
+
+def invalidate_width(cache: WidthCache, conn: Any) -> None:
+    """Remove `conn` from width-cache `cache`, along with everything whose width depends on it:
+    the `Slice`s and `Concat`s which (potentially transitively) include it.
+    Called when references are resolved, and their dependents are updated to refer to something else."""
+
+    seen = set()
+    stack = [conn]
+    while stack:
+        conn = stack.pop()
+        if id(conn) in seen:
+            continue
+        seen.add(id(conn))
+        cache.pop(conn, None)
+        stack.extend(getattr(conn, "_slices", ()))
+        stack.extend(getattr(conn, "_concats", ()))
@@ -11,8 +11,12 @@ from .base import ElabPass
 from .inst_bundles import InstBundleElabPass
 from .slices import SliceResolver
 from .orphanage import Orphanage
-from .arrays import ArrayFlattener
+from .arrays import ArrayFlattener, ArrayCompactor, ArrayConnRule
 from .portrefs import ResolvePortRefs
 from .conntypes import ConnTypes
 from .flatten_bundles import BundleFlattener
 from .mark_modules import MarkModules
+from .dedup import ModuleDeduplicator
+
+# And the fused-pass runner
+from .fused import FusedPasses
@@ -2,17 +2,39 @@
 # Array Flattening
 """
 
+# Std-Lib Imports
+from typing import Optional
+
 # Local imports
+from ...datatype import datatype
 from ...module import Module
-from ...instance import Instance
+from ...instance import Instance, InstanceArray
+from ...instantiable import Instantiable
 from ...portref import PortRef
 from ...bundle import BundleInstance
 from ...signal import Signal
 from ...slice import Slice
 from ...concat import Concat
+from ..helpers.width import width
 
 # Import the base class
 from .base import ElabPass
+from .flatten_bundles import BundleFlattener
+
+
+@datatype
+class ArrayConnRule:
+    """
+    # Array Connection Rule
+
+    Describes how a connection to an `InstanceArray` is distributed across its elements.
+    Either the same connection is "broadcast" to every element,
+    or each element `k` gets its own `width`-bit slice, starting at bit `k * width`.
+    Connections to `BundleInstance`s, if not already flattened, are always broadcast, and have no `width`.
+    """
+
+    broadcast: bool  # Whether the connection is broadcast to every element
+    width: Optional[int] = None  # Per-element width
 
 
 class ArrayFlattener(ElabPass):
@@ -20,6 +42,9 @@ class ArrayFlattener(ElabPass):
     Elaboration Pass to Flatten `InstanceArray`s into `Instance`s, broadcast and remake their connections.
     """
 
+    depends_on = [BundleFlattener]
+    fusable = True
+
     def elaborate_module(self, module: Module) -> Module:
         """Elaborate Module `module`.
         Primarily performs flattening of Instance Arrays, and re-connecting to the resultant flattened instances.
@@ -49,43 +74,89 @@ class ArrayFlattener(ElabPass):
 
             # And connect them
             for portname, conn in array.conns.items():
-                if isinstance(conn, BundleInstance):
-                    # All new instances get the same BundleInstance
+                rule = self.conn_rule(module, array, target, portname, conn)
+                if rule.broadcast:
+                    # All new instances get the same signal or BundleInstance
                     for inst in new_insts:
                         inst.connect(portname, conn)
-                elif isinstance(conn, (Signal, Slice, Concat)):
-                    # Get the target-module port, particularly for its width
-                    port = target.ports.get(portname, None)
-                    if port is None:
-                        msg = f"Connection to invalid Port `{portname}` on InstanceArray `{array}` in Module `{module.name}`"
-                        self.fail(msg)
-                    if not isinstance(port, Signal):
-                        msg = f"Invalid Port `{portname}` ({port}) on InstanceArray `{array}` in Module `{module.name}`"
-                        self.fail(msg)
-
-                    if port.width == conn.width:
-                        # All new instances get the same signal
-                        for inst in new_insts:
-                            inst.connect(portname, conn)
-                    elif port.width * array.n == conn.width:
-                        # Each new instance gets a slice, equal to its own width
-                        for k, inst in enumerate(new_insts):
-                            slize = conn[k * port.width : (k + 1) * port.width]
-                            if slize.width != port.width:
-                                msg = f"Width mismatch connecting {slize} to {port}"
-                                self.fail(msg)
-                            inst.connect(portname, slize)
-                    else:  # All other width-values are invalid
-                        msg = f"Invalid connection of {conn} of width {conn.width} to port {portname} on Array {array.name} of width {port.width}. "
-                        msg += f"Valid widths are either {port.width} (broadcasting across instances) and {port.width * array.n} (individually wiring to each)."
-                        self.fail(msg)
-                elif isinstance(conn, PortRef):
-                    msg = f"Error elaborating {array} in {module}. "
-                    msg += f"Connection {conn} has not been resolved to a `Signal`. "
-                    raise RuntimeError
                 else:
-                    msg = f"Invalid connection to {conn} in InstanceArray {array}"
-                    self.fail(msg)
+                    # Each new instance gets a slice, equal to its own width
+                    for k, inst in enumerate(new_insts):
+                        slize = conn[k * rule.width : (k + 1) * rule.width]
+                        if slize.width != rule.width:
+                            msg = f"Width mismatch connecting {slize} to {portname}"
+                            self.fail(msg)
+                        inst.connect(portname, slize)
+                    self.count("slices_created", array.n)
+            self.stack.pop()
+
+        return module
+
+    def conn_rule(
+        self,
+        module: Module,
+        array: InstanceArray,
+        target: Instantiable,
+        portname: str,
+        conn: object,
+    ) -> ArrayConnRule:
+        """Check connection `conn` to port `portname` of `array`, and determine how it is distributed across its elements."""
+
+        if isinstance(conn, BundleInstance):
+            # Bundle connections are generally flattened by `BundleFlattener` before getting here.
+            # Any which remain are broadcast to every element.
+            return ArrayConnRule(broadcast=True)
+        if isinstance(conn, PortRef):
+            msg = f"Error elaborating {array} in {module}. "
+            msg += f"Connection {conn} has not been resolved to a `Signal`. "
+            self.fail(msg)
+        if not isinstance(conn, (Signal, Slice, Concat)):
+            msg = f"Invalid connection to {conn} in InstanceArray {array}"
+            self.fail(msg)
+
+        # Get the target-module port, particularly for its width
+        port = target.ports.get(portname, None)
+        if port is None:
+            msg = f"Connection to invalid Port `{portname}` on InstanceArray `{array}` in Module `{module.name}`"
+            self.fail(msg)
+        if not isinstance(port, Signal):
+            msg = f"Invalid Port `{portname}` ({port}) on InstanceArray `{array}` in Module `{module.name}`"
+            self.fail(msg)
+
+        conn_width = width(conn, failer=self.fail, cache=self.ctx.widths)
+        if port.width == conn_width:
+            return ArrayConnRule(broadcast=True, width=port.width)
+        if port.width * array.n == conn_width:
+            return ArrayConnRule(broadcast=False, width=port.width)
+
+        # All other width-values are invalid
+        msg = f"Invalid connection of {conn} of width {conn_width} to port {portname} on Array {array.name} of width {port.width}. "
+        msg += f"Valid widths are either {port.width} (broadcasting across instances) and {port.width * array.n} (individually wiring to each)."
+        return self.fail(msg)
+
+
+class ArrayCompactor(ArrayFlattener):
+    """
+    Elaboration Pass which checks `InstanceArray`s and records how each of their connections is distributed,
+    but leaves them in place, rather than flattening them into `Instance`s.
+
+    Each array's per-port `ArrayConnRule`s are stored in its `_conn_rules` attribute.
+    Exporters expand compact arrays into their elements, on the fly.
+    Particularly valuable for very large arrays, e.g. of DAC unit-cells or memory bit-cells.
+    """
+
+    def elaborate_module(self, module: Module) -> Module:
+        for array in module.instarrays.values():
+            self.stack.append(array)
+            if array.n < 1:
+                self.fail(f"Invalid InstanceArray {array} with size {array.n}")
+
+            rules = dict()
+            for portname, conn in array.conns.items():
+                rules[portname] = self.conn_rule(
+                    module, array, array.of, portname, conn
+                )
+            array._conn_rules = rules
             self.stack.pop()
 
         return module
@@ -5,11 +5,10 @@
 # Std-Lib Imports
 import sys
 from pathlib import Path
-from dataclasses import field
-from typing import Dict, List, Set, Optional, Union
+from time import perf_counter
+from typing import ClassVar, Dict, List, Set, Optional, Type, Union
 
 # Local imports
-from ...datatype import datatype, AllowArbConfig
 from ...module import Module
 from ...external_module import ExternalModuleCall
 from ...instance import _Instance, Instance, InstanceArray, InstanceBundle
@@ -17,22 +16,13 @@ from ...primitives import PrimitiveCall
 from ...bundle import BundleInstance
 from ...instantiable import Instantiable
 from ..elaboratable import Elaboratable
+from ..context import ElabContext
 
 
 # Union of entry-types in the elaboration stack
 ElabStackEntry = Union[Module, Instance, InstanceArray, InstanceBundle]
 
 
-@datatype(config=AllowArbConfig)
-class ClassLevelCache:
-    """# Class-Level Cache for ElabPasses"""
-
-    # Note Modules hash *by identity*, so each instance of `Module`,
-    # regardless of the similarity of their content, gets its own entry in these sets.
-    done: Set[Module] = field(default_factory=set)
-    pending: Set[Module] = field(default_factory=set)
-
-
 class ElabPass:
     """
     # Base ElabPass Class
@@ -50,28 +40,45 @@ class ElabPass:
     `elaborate_module` method. Generally, they should not, and should always call
     `elaborate_module_base` instead.
 
-    `ElabPass` and `elaborate_module_base` also manage the `ClassLevelCache` for each pass-class.
-    Subclasses should not need to know there is such a cache, and should not need to access it directly.
+    `ElabPass` and `elaborate_module_base` also manage the `done` and `pending` sets of Modules for each pass.
+    Subclasses should not need to access them directly.
+
+    Each pass instance runs once, on a single set of `tops`, as part of a single elaboration.
+    State shared with the other passes of that elaboration is held in its `ElabContext`, `self.ctx`.
     """
 
-    # The class-level cache.
-    # Each sub-class gets its own.
-    # The base-class does not have one, should be the only `ElabPass` with `CLASS_CACHE=None`.
-    CLASS_LEVEL_CACHE: Optional[ClassLevelCache] = None
+    # Passes which must run before this one, when present in the same `Elaborator`.
+    depends_on: ClassVar[List[Type["ElabPass"]]] = []
+
+    # Boolean indication of whether this pass can be fused into a single traversal with its neighbors.
+    # Fusable passes must only rely on earlier passes having completed on the Module at hand and its children,
+    # not on the entire hierarchy. They must also perform all of their work in `elaborate_module`,
+    # rather than overriding the traversal methods `elaborate_tops` and `elaborate_module_base`.
+    # Defaults to `False`, the safe choice for passes defined outside Hdl21.
+    fusable: ClassVar[bool] = False
 
-    def __init_subclass__(cls) -> None:
-        # Create a new `ClassLevelCache` for each subclass
-        cls.CLASS_LEVEL_CACHE = ClassLevelCache()
+    # Boolean indication of whether this pass modifies Modules.
+    # Passes which do not - i.e. those which solely check - need not re-visit a Module which has not since changed.
+    modifies: ClassVar[bool] = True
 
     @classmethod
-    def elaborate(cls, tops: List[Elaboratable]) -> List[Elaboratable]:
+    def elaborate(
+        cls, tops: List[Elaboratable], ctx: Optional[ElabContext] = None
+    ) -> List[Elaboratable]:
         """Elaboration entry-point. Elaborate the top-level objects."""
-        return cls(tops).elaborate_tops()
+        return cls(tops, ctx).elaborate_tops()
 
-    def __init__(self, tops: List[Elaboratable]):
+    def __init__(self, tops: List[Elaboratable], ctx: Optional[ElabContext] = None):
         self.tops = tops
+        self.ctx: ElabContext = ctx if ctx is not None else ElabContext()
         self.stack: List[ElabStackEntry] = list()
 
+        # Modules completed by, and in progress in, this pass.
+        # Note Modules hash *by identity*, so each instance of `Module`,
+        # regardless of the similarity of their content, gets its own entry in these sets.
+        self.done: Set[Module] = set()
+        self.pending: Set[Module] = set()
+
     def elaborate_tops(self) -> List[Elaboratable]:
         """Elaborate our top nodes"""
         if not isinstance(self.tops, List):
@@ -100,8 +107,8 @@ class ElabPass:
         `elaborate_module_base` instead.
         """
 
-        # Check if this has already been elaborated by this pass/ class
-        if module in self.CLASS_LEVEL_CACHE.done:
+        # Check if this has already been elaborated by this pass, or by a prior elaboration
+        if module in self.done or self.ctx.is_clean(module):
             return module
 
         # Add `module` to our elab stack.
@@ -109,12 +116,27 @@ class ElabPass:
         self.stack.append(module)
 
         # Check for circular dependencies
-        if module in self.CLASS_LEVEL_CACHE.pending:
+        if module in self.pending:
             msg = f"Invalid self referencing/ circular dependency in `{module}`"
             return self.fail(msg)
-        self.CLASS_LEVEL_CACHE.pending.add(module)
+        self.pending.add(module)
+
+        # Depth-first traverse its instances and bundles
+        self.elaborate_children(module)
+
+        # Run the pass-specific `elaborate_module`
+        result = self.run_elaborate_module(module)
+
+        # Pop the hierarchy-stack and return it
+        self.stack.pop()
+        self.pending.remove(module)
+        self.done.add(module)
+        return result
+
+    def elaborate_children(self, module: Module) -> None:
+        """Depth-first traverse the instances of `module`, ensuring their targets are elaborated,
+        and then its Bundle instances."""
 
-        # Depth-first traverse instances, ensuring their targets are defined
         for inst in module.instances.values():
             self.elaborate_instance_base(inst)
         for arr in module.instarrays.values():
@@ -126,19 +148,28 @@ class ElabPass:
         for bundle in module.bundles.values():
             self.elaborate_bundle_instance(bundle)
 
-        # Run the pass-specific `elaborate_module`
-        result = self.elaborate_module(module)
+    def run_elaborate_module(self, module: Module) -> Module:
+        """Run `elaborate_module` on `module`, recording its time and contents if profiling."""
+        profile = self.ctx.profile
+        if profile is None:
+            return self.elaborate_module(module)
 
-        # Pop the hierarchy-stack and return it
-        self.stack.pop()
-        self.CLASS_LEVEL_CACHE.pending.remove(module)
-        self.CLASS_LEVEL_CACHE.done.add(module)
+        passname = type(self).__name__
+        profile.count_module(passname, module)
+        start = perf_counter()
+        result = self.elaborate_module(module)
+        profile.record_module(passname, module, start, perf_counter())
         return result
 
     def elaborate_module(self, module: Module) -> Module:
         """Elaborate a Module. Returns the Module unmodified by default."""
         return module
 
+    def count(self, counter: str, num: int = 1) -> None:
+        """Increment profiling counter `counter` by `num`, if profiling. See `PassStats` for the available counters."""
+        if self.ctx.profile is not None:
+            self.ctx.profile.count(type(self).__name__, counter, num)
+
     def elaborate_external_module(self, call: ExternalModuleCall) -> ExternalModuleCall:
         """Elaborate an ExternalModuleCall. Returns the Call unmodified by default."""
         return call
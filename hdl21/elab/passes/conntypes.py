@@ -4,7 +4,7 @@
 
 # Std-Lib Imports
 import copy
-from typing import Any, Union, Dict
+from typing import Any, Union, Dict, Optional
 
 # PyPi Imports
 from pydantic.dataclasses import dataclass
@@ -31,6 +31,7 @@ from ..helpers.width import width, HasWidth
 
 # Import the base class
 from .base import ElabPass
+from .portrefs import ResolvePortRefs
 
 
 """
@@ -83,6 +84,10 @@ class ConnTypes(ElabPass):
     Note this stage *does not* perform port-direction checking or modification.
     """
 
+    depends_on = [ResolvePortRefs]
+    fusable = True
+    modifies = False
+
     def elaborate_module(self, module: Module) -> Module:
         """Check each Instance's connections in `module`"""
 
@@ -107,7 +112,8 @@ class ConnTypes(ElabPass):
         # These will be two {str: Connectable} dictionaries, who should have the same keys,
         # and each paired value should be connection-compatible.
         conns = copy.copy(inst.conns)
-        io = io_for_checking(parent=module, i=inst.of)
+        delegated = isinstance(inst.of, Module) and inst.of in self.ctx.delegated
+        io = io_for_checking(parent=module, i=inst.of, delegated=delegated, conns=conns)
 
         # Track the status of each connection, so we can report the Instance-wide state if there are errors.
         statuses: Dict[str, ConnStatus] = dict()
@@ -221,12 +227,21 @@ class ConnTypes(ElabPass):
             msg = f"Internal error: {type(conn).__name__} remaining in connection-types check"
             return self.fail(msg)
 
-        return width(conn, failer=self.fail)
+        return width(conn, failer=self.fail, cache=self.ctx.widths)
 
 
-def io_for_checking(parent: Module, i: Instantiable) -> Dict[str, "Connectable"]:
+def io_for_checking(
+    parent: Module,
+    i: Instantiable,
+    delegated: bool = False,
+    conns: Optional[Dict[str, "Connectable"]] = None,
+) -> Dict[str, "Connectable"]:
     """Get the relevant IOs of Instantiable `i` for checking.
     Depending on the elaboration state of `parent` and `i`, this may include the "bundled" or "flattened" IOs.
+    If `delegated`, `i` is elaborated elsewhere, and is never flattened here.
+
+    If provided, `conns` are the connections to be checked. When re-elaborating an edited `parent`,
+    these can mix flattened connections with (not yet flattened) new connections to `i`'s Bundle-valued ports.
     """
 
     if isinstance(i, (ExternalModuleCall, PrimitiveCall)):
@@ -237,6 +252,10 @@ def io_for_checking(parent: Module, i: Instantiable) -> Dict[str, "Connectable"]
         raise TypeError(f"Invalid Instantiable: {i}")
 
     # OK we've got a Module.
+    if delegated:
+        # Delegated Modules have no Bundle-valued ports, so their IOs are the same before and after flattening.
+        return io(i)
+
     # Whether to check the "bundled" or "flattened" IO is dependent on
     # whether the *parent* and `i` have or haven't been flattened.
     parent_flattened = parent._pre_flattening_io is not None
@@ -253,4 +272,16 @@ def io_for_checking(parent: Module, i: Instantiable) -> Dict[str, "Connectable"]
 
     # Parent and child statuses match, whether flattened or not.
     # Return the child IOs as they are now.
-    return io(i)
+    rv = io(i)
+
+    if parent_flattened and conns:
+        # Connections added since `parent` was flattened can target `i`'s Bundle-valued ports by name.
+        # Check these against the Bundle ports, in place of their flattened Signals.
+        # The re-run of bundle-flattening then flattens them, as it would have originally.
+        for name, flat in i._flat_bundle_ports.items():
+            if name in conns:
+                for sig in flat.signals.values():
+                    rv.pop(sig.name, None)
+                rv[name] = i._pre_flattening_io[name]
+
+    return rv
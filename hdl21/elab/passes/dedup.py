@@ -0,0 +1,145 @@
+"""
+# Module De-Duplication ElabPass
+
+Merges structurally identical Modules into a single definition.
+"""
+
+# Std-Lib Imports
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Local imports
+from ...module import Module
+from ...signal import Signal
+from ...slice import Slice
+from ...concat import Concat
+from ...instance import InstanceArray
+from ...external_module import ExternalModuleCall
+from ...primitives import PrimitiveCall
+from ...qualname import qualname
+
+# Import the base class
+from .base import ElabPass
+from .slices import SliceResolver
+
+
+class ModuleDeduplicator(ElabPass):
+    """
+    # Module De-Duplication ElabPass
+
+    Merges structurally identical Modules, e.g. those produced by generators with caching disabled,
+    or by repeated calls to a Module-creating function.
+    Each Instance of a duplicate is re-targeted to a single, canonical copy. The duplicates are dropped from the hierarchy.
+    This shrinks the exported, and netlisted, design to one definition per unique Module.
+
+    Two Modules are identical if they have the same:
+    * Qualified name
+    * Ports and Signals, including their names, widths, directions, and descriptions
+    * Instances and InstanceArrays, including their names, connections, and targets.
+      Module targets are compared by identity, after their own de-duplication.
+      Other targets, e.g. `ExternalModuleCall`s, are compared by value, including their parameters.
+    * Literals
+
+    Modules which have un-compared content, such as `Properties` or un-hashable parameter values, are never merged.
+    Note the qualified name is included. Identical content under different names is not merged;
+    Modules with identical names, which otherwise fail to export, are.
+
+    Not included in `Elaborator.default` unless its `dedup` option is set.
+    """
+
+    depends_on = [SliceResolver]
+    fusable = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Canonical copy of each Module considered, including those not elaborated by this pass
+        self.canonical: Dict[Module, Module] = dict()
+        # Canonical copy per structural key
+        self.by_key: Dict[Hashable, Module] = dict()
+
+    def elaborate_module(self, module: Module) -> Module:
+        # Re-target each Instance to the canonical copy of its Module.
+        # Note as a post-order pass, those elaborated by this pass are already done.
+        instlike = list(module.instances.values()) + list(module.instarrays.values())
+        for inst in instlike:
+            if isinstance(inst.of, Module):
+                inst.of = self.dedup(inst.of)
+
+        # And find the canonical copy of `module` itself.
+        # Note top-level Modules are retained as-is, whether or not they are duplicates.
+        self.dedup(module)
+        return module
+
+    def dedup(self, module: Module) -> Module:
+        """Get the canonical copy of `module`, which may be `module` itself."""
+        canonical = self.canonical.get(module, None)
+        if canonical is not None:
+            return canonical
+        key = structural_key(module)
+        if key is None:
+            canonical = module  # Not mergeable
+        else:
+            canonical = self.by_key.setdefault(key, module)
+            if canonical is not module:
+                self.count("modules_merged")
+        self.canonical[module] = canonical
+        return canonical
+
+
+def structural_key(module: Module) -> Optional[Tuple]:
+    """Create a hashable key describing the structure of (elaborated) `module`.
+    Returns `None` if `module` has content which is not compared, and so should not be merged."""
+
+    if module.bundles or module.instbundles or module.props.inner:
+        return None
+
+    try:
+        key = (
+            qualname(module),
+            tuple(_signal_key(s) for s in module.ports.values()),
+            tuple(_signal_key(s) for s in module.signals.values()),
+            tuple(_instance_key(i) for i in module.instances.values()),
+            tuple(_instance_key(a) for a in module.instarrays.values()),
+            tuple(lit.text for lit in module.literals),
+        )
+        hash(key)  # Check it is hashable, e.g. that all parameter-values are
+    except (_Unmergeable, TypeError):
+        return None
+    return key
+
+
+class _Unmergeable(Exception):
+    """Raised while creating a `structural_key` for content which is not compared"""
+
+
+def _signal_key(sig: Signal) -> Tuple:
+    if sig.props.inner or sig.src or sig.dest:
+        raise _Unmergeable
+    if sig.related_clk or sig.related_pwr or sig.related_gnd:
+        raise _Unmergeable
+    return (sig.name, sig.width, sig.vis, sig.direction, sig.usage, sig.desc)
+
+
+def _instance_key(inst: Any) -> Tuple:
+    if inst.props.inner:
+        raise _Unmergeable
+    conns = tuple((pname, _conn_key(c)) for pname, c in inst.conns.items())
+    n = inst.n if isinstance(inst, InstanceArray) else None
+    return (inst.name, n, _target_key(inst.of), conns)
+
+
+def _target_key(of: Any) -> Hashable:
+    if isinstance(of, Module):
+        return ("module", id(of))
+    if isinstance(of, (ExternalModuleCall, PrimitiveCall)):
+        return (type(of).__name__, of)
+    raise _Unmergeable
+
+
+def _conn_key(conn: Any) -> Hashable:
+    if isinstance(conn, Signal):
+        return conn.name
+    if isinstance(conn, Slice):
+        return ("slice", _conn_key(conn.parent), conn.top, conn.bot, conn.step)
+    if isinstance(conn, Concat):
+        return ("concat",) + tuple(_conn_key(p) for p in conn.parts)
+    raise _Unmergeable
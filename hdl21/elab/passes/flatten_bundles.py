@@ -5,24 +5,29 @@
 # Std-Lib Imports
 import copy
 from dataclasses import field
-from typing import Dict, List, Union, Optional
+from typing import Dict, List, Tuple, Union, Optional
 
 # Local imports
 from ...datatype import datatype, AllowArbConfig
 from ...module import Module
 from ...instance import Instance
 from ... import Slice, Concat, NoConn, PortRef
+from ...role import Role
 from ...bundle import (
     AnonymousBundle,
+    Bundle,
     BundleInstance,
     BundleRef,
 )
 from ...signal import PortDir, Signal, Visibility
 from ...instantiable import io
 from ..helpers.resolve_ref_types import update_ref_deps
+from ..elaboratable import Elaboratable
+from ..context import ElabContext
 
 # Import the base class
 from .base import ElabPass
+from .portrefs import ResolvePortRefs
 
 
 @datatype(frozen=True)
@@ -91,20 +96,74 @@ class BundleScope:
 
 
 @datatype(config=AllowArbConfig)
-class BundlePortEntry:
-    """# Bundle-Port Entry in the Cache
-    Hashable combination of a Module and a portname."""
+class BundleSub:
+    """Sub-bundle entry in a `BundleTemplate`"""
 
-    module: Module
-    portname: str
+    src: BundleInstance  # Sub-bundle instance, in the Bundle definition
+    template: "BundleTemplate"  # Its flattened template
+    start: int  # Index of its first Signal, in the parent's `signals`
 
-    def __eq__(self, other: "BundlePortEntry") -> bool:
-        if not isinstance(other, BundlePortEntry):
-            return NotImplemented
-        return self.module is other.module and self.portname == other.portname
 
-    def __hash__(self) -> int:
-        return hash((id(self.module), self.portname))
+@datatype(config=AllowArbConfig)
+class BundleTemplate:
+    """
+    # Flattened Bundle Template
+
+    The flattened layout of a `Bundle` definition, for a given role, port-ness and flip-state.
+    Created once per such combination, and instantiated into a `BundleScope` for each `BundleInstance`.
+
+    Signals in `signals` are prototypes, copied upon each instantiation.
+    The signals of each sub-bundle are a contiguous range of `signals`,
+    in the same order as those in its own template.
+    """
+
+    role: Optional[
+        Role
+    ] = None  # Role the template was flattened with. Kept alive for cache-keying.
+
+    signals: Dict[Path, Signal] = field(default_factory=dict)
+    # Prototype Signals, including those of all sub-bundles, keyed by Path
+
+    names: List[str] = field(default_factory=list)
+    # Flattened name of each Signal in `signals`, in order
+
+    subs: Dict[Path, BundleSub] = field(default_factory=dict)
+    # Sub-bundle templates
+
+    def add_sub(self, src: BundleInstance, sub: "BundleTemplate") -> None:
+        """Add a sub-bundle template. Also adds its signals to our `signals` dict."""
+
+        name = Path([src.name])
+        self.subs[name] = BundleSub(src=src, template=sub, start=len(self.signals))
+
+        for path_suffix, sig in sub.signals.items():
+            path_from_self = path_suffix.prepend(name)
+            if path_from_self in self.signals:
+                msg = f"Error Flattening Bundles: colliding flattened Signal names for {sig} and {self.signals[path_from_self]}"
+                raise RuntimeError(msg)
+            self.signals[path_from_self] = sig
+
+    def instantiate(
+        self,
+        src: BundleInstance,
+        signals: Optional[List[Signal]] = None,
+    ) -> BundleScope:
+        """Create a `BundleScope` from this template.
+        Creates new copies of each Signal, unless `signals` are provided by a parent scope."""
+
+        if signals is None:
+            signals = [copy.copy(sig) for sig in self.signals.values()]
+        scope = BundleScope(src=src, signals=dict(zip(self.signals.keys(), signals)))
+
+        for name, sub in self.subs.items():
+            end = sub.start + len(sub.template.signals)
+            subscope = sub.template.instantiate(
+                src=sub.src, signals=signals[sub.start : end]
+            )
+            subscope.parent = scope
+            scope.scopes[name] = subscope
+
+        return scope
 
 
 @datatype(config=AllowArbConfig)
@@ -112,6 +171,9 @@ class Cache:
     """
     The Bundle Flattening Cache
     Designed to operate at Module level, across multiple ElabPasss.
+    Lives in the `ElabContext`, for the duration of a single elaboration.
+
+    Flattened Bundle-valued ports, which must outlive it, are instead stored on their Modules, in `Module._flat_bundle_ports`.
     """
 
     bundle_insts: Dict[int, BundleScope] = field(default_factory=dict)
@@ -120,25 +182,33 @@ class Cache:
     anon_bundles: Dict[int, BundleScope] = field(default_factory=dict)
     # AnonymousBundle replacements, {id(AnonBundle) => BundleScope}
 
-    flat_bundle_ports: Dict[BundlePortEntry, BundleScope] = field(default_factory=dict)
-    # Replacement flattened Bundle-valued ports.
-    # Keyed by Module and port-name.
-    # {BundlePortEntry(module, portname) => BundleScope}
-
-
-# The module-scope flattening cache
-THE_CACHE = Cache()
+    templates: Dict[Tuple[Bundle, int, bool, bool], BundleTemplate] = field(
+        default_factory=dict
+    )
+    # Flattened Bundle definitions, {(Bundle, id(role), is_port, flip_state) => BundleTemplate}
 
 
 class BundleFlattener(ElabPass):
     """Bundle-Flattening ElabPass Pass"""
 
+    depends_on = [ResolvePortRefs]
+    fusable = True
+
+    def __init__(self, tops: List[Elaboratable], ctx: Optional[ElabContext] = None):
+        super().__init__(tops, ctx)
+        # Get our cache from the context, creating it if necessary
+        if self.ctx.bundle_cache is None:
+            self.ctx.bundle_cache = Cache()
+        self.cache: Cache = self.ctx.bundle_cache
+
     def elaborate_module(self, module: Module) -> Module:
         """Flatten Module `module`s Bundles, replacing them with newly-created Signals.
         Reconnect the flattened Signals to any Instances connected to said Bundles."""
 
-        # Cache the state of the Module's IOs before flattening
-        module._pre_flattening_io = copy.copy(io(module))
+        # Cache the state of the Module's IOs before flattening.
+        # Modules being re-elaborated keep the IOs captured by their first flattening.
+        if module._pre_flattening_io is None:
+            module._pre_flattening_io = copy.copy(io(module))
 
         # Remove and replace each `BundleInstance` from the Module
         while module.bundles:
@@ -168,28 +238,30 @@ class BundleFlattener(ElabPass):
         """
 
         # Check we haven't (somehow) already replaced it
-        if id(bundle_inst) in THE_CACHE.bundle_insts:
+        if id(bundle_inst) in self.cache.bundle_insts:
             msg = f"Bundle Instance {bundle_inst} in Module {module} flattened more than once. Was it actually part of another Module?"
             self.fail(msg)
 
-        # Flatten it
-        flat = self.flatten_bundle_inst(bundle_inst, path=Path([]))
+        # Flatten it, instantiating the template for its Bundle definition
+        template = self.bundle_template(
+            bundle_inst, is_port=bundle_inst.port, flip_state=bundle_inst.flipped
+        )
+        flat = template.instantiate(src=bundle_inst)
 
         # Add each flattened Signal. Note flattened Signals are modified in-place.
-        for pathstr, sig in flat.signals.items():
+        for name, sig in zip(template.names, flat.signals.values()):
             # Rename the signal, prepending the bundle-instance's name
             sig.name = self.flatname(
-                segments=[bundle_inst.name, pathstr.to_name()],
-                avoid=module.namespace,
+                segments=[bundle_inst.name, name], avoid=module.namespace
             )
             # And add it to the Module namespace
             module.add(sig)
+        self.count("signals_created", len(flat.signals))
 
         # Store the result in our caches
-        THE_CACHE.bundle_insts[id(bundle_inst)] = flat
+        self.cache.bundle_insts[id(bundle_inst)] = flat
         if bundle_inst.port:
-            entry = BundlePortEntry(module, bundle_inst.name)
-            THE_CACHE.flat_bundle_ports[entry] = flat
+            module._flat_bundle_ports[bundle_inst.name] = flat
 
         # Replace connections to any connected instances
         for portref in list(bundle_inst._connected_ports):
@@ -253,8 +325,7 @@ class BundleFlattener(ElabPass):
         particularly between the Instance and instantiating module.
         """
 
-        entry = BundlePortEntry(inst.of, portname)
-        flat_bundle_port = THE_CACHE.flat_bundle_ports.get(entry, None)
+        flat_bundle_port = inst.of._flat_bundle_ports.get(portname, None)
         if flat_bundle_port is None:
             msg = f"Invalid Port Connection to {portname} on Instance {inst}"
             self.fail(msg)
@@ -279,38 +350,35 @@ class BundleFlattener(ElabPass):
                 self.fail(msg)
             inst.connect(flat_port.name, flat.signals[path])
 
-    def flatten_bundle_inst(
-        self, bundle_inst: BundleInstance, path: Path
-    ) -> BundleScope:
-        """# Flatten a bundle instance"""
-        # Kick off recursive flattening
-        return self.flatten_bundle_inst_helper(
-            bundle_inst=bundle_inst,
-            path=path,
-            is_this_top_level=True,
-            is_port=bundle_inst.port,
-            flip_state=bundle_inst.flipped,
-        )
-
-    def flatten_bundle_inst_helper(
-        self,
-        bundle_inst: BundleInstance,
-        path: Path,
-        is_this_top_level: bool,
-        is_port: bool,
-        flip_state: bool,
-    ) -> BundleScope:
-        """Recursive inner implementation of `flatten_bundle_inst`."""
+    def bundle_template(
+        self, bundle_inst: BundleInstance, is_port: bool, flip_state: bool
+    ) -> "BundleTemplate":
+        """Get the flattened `BundleTemplate` for `bundle_inst`, creating and caching it if necessary.
+        Templates depend only on the Bundle definition, its role, and the port-ness and flip-state it is flattened with.
+        Everything else, i.e. naming, is applied per instance."""
+
+        key = (bundle_inst.of, id(bundle_inst.role), is_port, flip_state)
+        template = self.cache.templates.get(key, None)
+        if template is None:
+            template = self.flatten_bundle_def(bundle_inst, is_port, flip_state)
+            self.cache.templates[key] = template
+        return template
+
+    def flatten_bundle_def(
+        self, bundle_inst: BundleInstance, is_port: bool, flip_state: bool
+    ) -> "BundleTemplate":
+        """Flatten the Bundle definition of `bundle_inst` into a new `BundleTemplate`.
+        Recursively gets templates for each sub-bundle."""
 
         bundle_def = bundle_inst.of
-        scope = BundleScope(src=bundle_inst)
+        template = BundleTemplate(role=bundle_inst.role)
 
-        # Copy each scalar signal, retaining its original name as the key in `scope.signals`
+        # Copy each scalar signal, retaining its original name as the key in `template.signals`
         for sig in bundle_def.signals.values():
             signal_path = Path([sig.name])
-            if signal_path in scope.signals:
+            if signal_path in template.signals:
                 self.fail(f"Doubly defined Signal {sig} in {bundle_inst}")
-            newsig = copy.deepcopy(sig)
+            newsig = copy.copy(sig)
             newsig.name = signal_path.to_name()
 
             # Sort out the new Signal's visibility and direction
@@ -340,24 +408,22 @@ class BundleFlattener(ElabPass):
             # Apply all these attributes to our new Signal
             newsig.vis = vis_
             newsig.direction = dir_
-            scope.signals[signal_path] = newsig
+            template.signals[signal_path] = newsig
 
-        # And recursively do this to all sub-bundle instances, adding them to `scopes` along the way.
+        # And recursively do this to all sub-bundle instances, adding them to `subs` along the way.
         for sub_bundle_inst in bundle_def.bundles.values():
-            subpath = path.append(Path([sub_bundle_inst.name]))
             sub_flip_state = (
                 flip_state if not sub_bundle_inst.flipped else not flip_state
             )
-            subscope = self.flatten_bundle_inst_helper(
+            subtemplate = self.bundle_template(
                 bundle_inst=sub_bundle_inst,
-                path=subpath,
-                is_this_top_level=False,
                 is_port=is_port,  # Port-ness is defined from the top-level BundleInstance
                 flip_state=sub_flip_state,  # Flip-state can be inverted at each level
             )
-            scope.add_subscope(name=sub_bundle_inst.name, scope=subscope)
+            template.add_sub(src=sub_bundle_inst, sub=subtemplate)
 
-        return scope
+        template.names = [path.to_name() for path in template.signals]
+        return template
 
     def replace_anon_bundle_conn(
         self, inst: Instance, portname: str, anon: AnonymousBundle
@@ -372,8 +438,8 @@ class BundleFlattener(ElabPass):
         Differs from bundle-class instances in that each attribute of anonymous-bundles
         are generally "references", owned by something else, commonly a Module."""
 
-        if id(anon) in THE_CACHE.anon_bundles:
-            return THE_CACHE.anon_bundles[id(anon)]
+        if id(anon) in self.cache.anon_bundles:
+            return self.cache.anon_bundles[id(anon)]
 
         scope = BundleScope(src=anon)
 
@@ -395,7 +461,7 @@ class BundleFlattener(ElabPass):
             # Finally handle nested, Bundle-like types, which produce sub-scopes
             elif isinstance(attr, BundleInstance):
                 # BundleInstances have all been visited by now, and hence better be in the cache
-                flat_inst = THE_CACHE.bundle_insts.get(id(attr), None)
+                flat_inst = self.cache.bundle_insts.get(id(attr), None)
                 if flat_inst is None:
                     self.fail(f"Invalid AnonymousBundle attribute {attr}")
                 scope.add_subscope(name, flat_inst)
@@ -409,7 +475,7 @@ class BundleFlattener(ElabPass):
             else:  # Shouldn't be reachable
                 raise TypeError(f"Invalid AnonBundle attribute {attr}")
 
-        THE_CACHE.anon_bundles[id(anon)] = scope
+        self.cache.anon_bundles[id(anon)] = scope
         return scope
 
     def resolve_bundleref(self, bref: BundleRef) -> Union[Signal, BundleScope]:
@@ -423,7 +489,7 @@ class BundleFlattener(ElabPass):
         root: BundleInstance = bref.root()
 
         # Get the flattened version of the root BundleInstance
-        flat_root = THE_CACHE.bundle_insts.get(id(root), None)
+        flat_root = self.cache.bundle_insts.get(id(root), None)
         if flat_root is None:
             msg = f"Invalid BundleRef to {bref.parent}"
             self.fail(msg)
@@ -440,7 +506,7 @@ class BundleFlattener(ElabPass):
             return resolved
 
         if isinstance(resolved, Signal):
-            update_ref_deps(bref, resolved)
+            update_ref_deps(bref, resolved, self.ctx.widths)
             return resolved
 
         return self.fail(f"BundleRef {bref} resolved to invalid {resolved}")
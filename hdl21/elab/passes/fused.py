@@ -0,0 +1,110 @@
+"""
+# Fused ElabPasses
+
+Runs a sequence of `ElabPass`es in a single hierarchy traversal.
+"""
+
+# Std-Lib Imports
+from typing import Dict, List, Optional, Tuple, Type
+
+# Local imports
+from ...module import Module
+from ..elaboratable import Elaboratable
+from ..context import ElabContext
+
+# Import the base class
+from .base import ElabPass
+
+
+class FusedPasses(ElabPass):
+    """
+    # Fused ElabPasses
+
+    Runs a sequence of (fusable) `ElabPass`es in a single post-order traversal.
+    Each Module is visited once. After all of its children are complete, each pass's `elaborate_module` runs on it, in order.
+    Running `N` passes this way requires one traversal, rather than `N` of them.
+
+    Passes which solely check Modules, i.e. those which do not set `modifies`, may appear more than once.
+    Repeat runs only re-visit Modules which have been edited since that pass last checked them.
+
+    Each pass's own `done` set is updated as Modules complete,
+    so that any traversal the passes do themselves, e.g. `ArrayFlattener` visiting its array-targets, finds them done.
+    """
+
+    # Fused passes are not themselves part of any fused group
+    fusable = False
+
+    def __init__(
+        self,
+        tops: List[Elaboratable],
+        passes: List[Type[ElabPass]],
+        ctx: Optional[ElabContext] = None,
+    ):
+        super().__init__(tops, ctx)
+
+        # Create an instance of each pass, sharing our context, and our hierarchy-stack for error reporting.
+        self.passes: List[ElabPass] = [p(tops, self.ctx) for p in passes]
+        for p in self.passes:
+            p.stack = self.stack
+
+        # Edit-versions of each Module, as of when each checking-pass last visited it.
+        self.checked: Dict[Tuple[Type[ElabPass], Module], int] = dict()
+
+    @classmethod
+    def elaborate(
+        cls,
+        tops: List[Elaboratable],
+        passes: List[Type[ElabPass]],
+        ctx: Optional[ElabContext] = None,
+    ) -> List[Elaboratable]:
+        """Elaboration entry-point. Elaborate the top-level objects with each of `passes`."""
+        return cls(tops, passes, ctx).elaborate_tops()
+
+    def elaborate_module_base(self, module: Module) -> Module:
+        """# Fused `Module` Elaboration
+        Traverse `module`'s children, then run each of our passes on it."""
+
+        if module in self.done or self.ctx.is_clean(module):
+            return module
+
+        self.stack.append(module)
+        if module in self.pending:
+            msg = f"Invalid self referencing/ circular dependency in `{module}`"
+            return self.fail(msg)
+        self.pending.add(module)
+
+        # Depth-first traverse its instances, completing every pass on each of their targets
+        self.elaborate_children(module)
+
+        # Run each pass in sequence
+        seen = set()
+        for p in self.passes:
+            self.run_pass(p, module, repeat=type(p) in seen)
+            seen.add(type(p))
+
+        # And mark it complete, for us and for each pass
+        for p in self.passes:
+            p.done.add(module)
+        self.stack.pop()
+        self.pending.remove(module)
+        self.done.add(module)
+        return module
+
+    def run_pass(self, p: ElabPass, module: Module, repeat: bool) -> None:
+        """Run pass `p` on `module`, unless it has no need to.
+        Boolean argument `repeat` indicates whether the same pass has run earlier in our sequence."""
+
+        passtype = type(p)
+        if module in p.done:
+            return  # Already done by this pass, e.g. through its own traversal
+
+        if not passtype.modifies:
+            # Checking pass. Skip it if `module` has not changed since the last check.
+            key = (passtype, module)
+            if repeat and self.checked.get(key, None) == module._version:
+                return
+            p.run_elaborate_module(module)
+            self.checked[key] = module._version
+            return
+
+        p.run_elaborate_module(module)
@@ -27,6 +27,8 @@ class InstBundleElabPass(ElabPass):
     # Instance Bundle Elaboration Pass
     """
 
+    fusable = True
+
     def elaborate_module(self, module: Module) -> Module:
         """Elaborate a Module
         Remove each Instance Bundle, and replace it with "scalar" Instances."""
@@ -5,9 +5,15 @@
 # Local imports
 from ...module import Module
 from .base import ElabPass
+from .slices import SliceResolver
 
 
 class MarkModules(ElabPass):
+    """Final pass, marking each Module as elaborated."""
+
+    depends_on = [SliceResolver]
+    fusable = True
+
     def elaborate_module(self, module: Module) -> Module:
         # Check that every module has a name
         if not module.name:
@@ -19,4 +25,22 @@ class MarkModules(ElabPass):
         # have differences between the two some day.
         module._elaborated = module
 
+        # Record the Module's edit-version, so that later edits mark it for re-elaboration.
+        module._elaborated_version = module._version
+
+        # Record it as an instantiator of each Module it instantiates, so that later edits to them mark it as stale.
+        # It starts out stale itself if any of them are not elaborated, e.g. if elaborated in worker processes.
+        stale = False
+        instlike = (
+            list(module.instances.values())
+            + list(module.instarrays.values())
+            + list(module.instbundles.values())
+        )
+        for inst in instlike:
+            if isinstance(inst.of, Module):
+                inst.of._instantiators.add(module)
+                if inst.of._elaborated is None or inst.of._stale:
+                    stale = True
+        module._stale = stale
+
         return module
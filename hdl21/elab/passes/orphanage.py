@@ -45,6 +45,9 @@ class Orphanage(ElabPass):
     Otherwise each Module is returned unchanged.
     """
 
+    fusable = True
+    modifies = False
+
     def elaborate_module(self, module: Module) -> Module:
         """Elaborate a Module"""
 
@@ -23,9 +23,12 @@ from ...bundle import BundleInstance, BundleRef, AnonymousBundle
 from ...signal import PortDir, Signal, Visibility
 from ...noconn import NoConn
 from ..helpers.resolve_ref_types import update_ref_deps
+from ..helpers.width import WidthCache
+from ..helpers.disjoint_sets import DisjointSets
 
 # Import the base class
 from .base import ElabPass
+from .inst_bundles import InstBundleElabPass
 
 # Union of the types which serve as "source signals",
 # i.e. the things which we are resolve `PortRef`s *to*.
@@ -56,6 +59,9 @@ class ResolvePortRefs(ElabPass):
     are invalidly connected between one another.
     """
 
+    depends_on = [InstBundleElabPass]
+    fusable = True
+
     def elaborate_module(self, module: Module) -> Module:
         """
         Resolve and replace all Instance `PortRef`s in `module`.
@@ -72,52 +78,36 @@ class ResolvePortRefs(ElabPass):
         )
 
         # Collect up all `PortRef`s for all instances in the module
-        # FIXME: move from SetList to a regular Set. Thus far breaks one test, somehow.
-        module_portrefs = SetList()
+        module_portrefs: List[PortRef] = list()
         for inst in instancelike:
             # Populate the module-level set of PortRefs
-            for portref in inst._refs.portrefs.values():
-                module_portrefs.add(portref)
+            module_portrefs.extend(inst._refs.portrefs.values())
 
             # FIXME: add the `NoConn`s here, although it's not clear we *really* need these checks on them
             for portname, conn in inst.conns.items():
                 if isinstance(conn, NoConn):
-                    module_portrefs.add(_get_connref(inst, portname))
-
-        def follow(pref: PortRef, group: SetList) -> None:
-            """Closure to recursively follow `pref`, adding its outward and inward connections to `group`.
-            Removes encountered entries from `module_portrefs` along the way."""
+                    module_portrefs.append(_get_connref(inst, portname))
 
-            if pref in group:
-                return  # Already done
-            if pref in module_portrefs:
-                module_portrefs.remove(pref)
+        # Collect groups of connected `PortRef`s, and the `Source`s and `NoConn`s connected to them.
+        # Each `PortRef` is joined with its instance connection, and with each of its connected ports.
+        # Newly encountered `PortRef`s are queued up to be followed in turn.
+        sets: DisjointSets[Connectable] = DisjointSets()
+        queue = [pref for pref in module_portrefs if sets.add(pref)]
+        while queue:
+            pref = queue.pop()
 
-            # Add the portref to the group
-            group.add(pref)
-
-            # Add, and if necessary recursively follow, its instance connection
             conn = pref.inst.conns.get(pref.portname, None)
-            if isinstance(conn, PortRef):
-                follow(conn, group)
-            else:  # Add ultimate signal `Source`s to the group
-                group.add(conn)
+            if conn is not None:
+                if isinstance(conn, PortRef) and conn not in sets:
+                    queue.append(conn)
+                sets.union(pref, conn)
 
-            # And recursively follow its connected ports
             for connected_port in pref._connected_ports:
-                follow(connected_port, group)
-
-        # Collect groups of connected `PortRef`s
-        groups: List[List[Optional[Connectable]]] = list()
+                if connected_port not in sets:
+                    queue.append(connected_port)
+                sets.union(pref, connected_port)
 
-        while module_portrefs:
-            # Create a new group, and recursively follow port refs to populate it
-            group = SetList()
-            follow(module_portrefs.pop(), group)
-
-            # Filter out the `None` entries before sticking in the `groups` list-of-lists.
-            group: List[Connectable] = [x for x in group.order if x is not None]
-            groups.append(group)
+        groups: List[List[Connectable]] = sets.groups()
 
         # For each group, find and/or create a Signal to replace all the PortRefs with.
         for group in groups:
@@ -148,7 +138,7 @@ class ResolvePortRefs(ElabPass):
         # Resolve each PortRef with `source` as its referent,
         # and reconnect it everywhere it's connected.
         for portref in group_port_refs:
-            resolve_portref(portref, source)
+            resolve_portref(portref, source, self.ctx.widths)
 
     def find_source(self, group: List[Connectable]) -> Optional[Source]:
         """Find any existing, declared `Source` connected to `group`.
@@ -289,48 +279,11 @@ class ResolvePortRefs(ElabPass):
         portref.inst.connect(portref.portname, sig)
 
 
-class SetList:
-    """A common combination of a hash-set and ordered list of the same items.
-    Used for keeping ordered items while maintaining quick membership testing.
-    """
-
-    def __init__(self):
-        self.set = set()
-        self.list = list()
-
-    def __bool__(self):
-        return bool(self.list)
-
-    def __contains__(self, item):
-        return item in self.set
-
-    def add(self, item):
-        if item not in self.set:
-            self.set.add(item)
-            self.list.append(item)
-        else:
-            raise RuntimeError(f"Item {item} already in SetList")
-
-    def remove(self, item):
-        if item not in self.set:
-            raise RuntimeError(f"Item {item} not in SetList")
-        self.set.remove(item)
-        self.list.remove(item)
-
-    def pop(self):
-        if not self.list:
-            raise RuntimeError("SetList is empty")
-        popped = self.list.pop(0)
-        self.set.remove(popped)
-        return popped
-
-    @property
-    def order(self):
-        return self.list
-
-
-def resolve_portref(pref: PortRef, to: Connectable) -> None:
-    """# Resolve a `PortRef` to its referent `Connectable`."""
+def resolve_portref(
+    pref: PortRef, to: Connectable, widths: Optional[WidthCache] = None
+) -> None:
+    """# Resolve a `PortRef` to its referent `Connectable`.
+    Optional `widths` is the elaboration's width-cache, invalidated for `pref` and its dependents."""
 
     if pref.resolved is to:
         return  # Already resolved
@@ -346,7 +299,7 @@ def resolve_portref(pref: PortRef, to: Connectable) -> None:
     pref.inst.connect(pref.portname, to)
 
     # Update all downstream dependencies, e.g. connected ports, slices
-    update_ref_deps(pref, to)
+    update_ref_deps(pref, to, widths)
 
 
 def io_for_resolving(i: Instantiable) -> Dict[str, "Connectable"]:
@@ -3,7 +3,8 @@
 """
 
 # Std-Lib Imports
-from typing import List, Union
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Union
 
 # Local imports
 from ...module import Module
@@ -12,176 +13,229 @@ from ...slice import Slice
 from ...concat import Concat
 from ...portref import PortRef
 from ...bundle import BundleRef
-from ..helpers.width import width, Sliceable
+from ..helpers.width import Sliceable
 
 # Import the base class
 from .base import ElabPass
+from .arrays import ArrayFlattener, ArrayCompactor
+
+
+class Run(NamedTuple):
+    """
+    # Bit-Run
+    Bits `range(lo, hi, step)` of concrete Signal `signal`.
+    Single-bit runs always have unit `step`.
+    """
+
+    signal: Signal
+    lo: int
+    hi: int
+    step: int
+
+    @property
+    def width(self) -> int:
+        return (self.hi - self.lo) // self.step
+
+
+class Runs(NamedTuple):
+    """
+    # Resolved Runs
+    The bits of a `Sliceable`, as a list of `Run`s, and the (bit) offset of each run.
+    """
+
+    runs: List[Run]
+    offsets: List[int]
+    width: int
 
 
 class SliceResolver(ElabPass):
     """Elaboration pass to resolve slices and concatenations to concrete signals.
     Modifies connections to any nested slices, nested concatenations, or combinations thereof.
     "Full-width" `Slice`s e.g. `sig[:]` are replaced with their parent `Signal`s.
+    `Slice`s with non-unit `step` are converted to `Concat`s of single bits.
+
+    Resolution operates on contiguous ranges of bits, or `Run`s.
+    Each connection is mapped to a list of runs, in time linear in its number of parts,
+    and adjacent runs are merged into single `Slice`s."""
 
-    TODO: `Slice`s with non-unit `step` are converted to `Concat`s."""
+    depends_on = [ArrayFlattener, ArrayCompactor]
+    fusable = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Cache of resolved runs, keyed by `Sliceable`.
+        # Commonly hit by array-broadcasting, which creates many slices of the same parent.
+        self.runs_cache: Dict[Sliceable, Runs] = dict()
 
     def elaborate_module(self, module: Module) -> Module:
-        # All arrays must be flattened before getting here, or fail
-        if module.instarrays:
+        # All arrays must be flattened or compacted before getting here, or fail
+        arrays = list(module.instarrays.values())
+        if any(a._conn_rules is None for a in arrays):
             msg = f"Error attempting to resolve slices on {module} - "
             msg += f"still has Instance Arrays {module.instarrays}"
             raise RuntimeError(msg)
 
         # Then do the real work, updating any necessary connections on each instance
-        for inst in module.instances.values():
+        for inst in list(module.instances.values()) + arrays:
             # Update all `Slice` and `Concat` valued connections to remove nested `Slice`s
             for portname, conn in inst.conns.items():
                 if isinstance(conn, (Slice, Concat)):
-                    resolved = _resolve_sliceable(conn)
+                    if _flat_slice(conn):
+                        continue  # Already resolved
+                    resolved = _to_sliceable(resolve_runs(conn, self.runs_cache).runs)
                     inst.connect(portname, resolved)
+                    self.count("slices_created", _num_slices(resolved))
                 # All other connection-types (Signals, Interfaces) are fine
 
         return module
 
 
-def _resolve_sliceable(conn: Sliceable) -> Sliceable:
-    """Resolve a `Sliceable` to flat-concatenation-amenable elements."""
-    if isinstance(conn, Signal):
-        return conn  # Nothing to do
-    if isinstance(conn, Slice):
-        return _resolve_slice(conn)
-    if isinstance(conn, Concat):
-        return _resolve_concat(conn)
-    if isinstance(conn, (PortRef, BundleRef)):
-        return _resolve_ref(conn)
-    raise TypeError(f"Invalid attempt to resolve slicing on {conn}")
-
+def resolve_runs(
+    conn: Sliceable, cache: Optional[Dict[Sliceable, Runs]] = None
+) -> Runs:
+    """Resolve `conn` to a list of `Run`s of concrete Signals.
+    Optional `cache` stores the results for `conn` and everything it references."""
 
-def _list_slice(slize: Slice) -> List[Slice]:
-    """Internal recursive helper for `resolve_slice`.
-    Returns a list of Slices in which each element has a concrete Signal for its parent.
-    """
+    if cache is None:
+        cache = dict()
 
-    # Resolve "full-width" slices to their parent Signals
-    if width(slize) == width(slize.parent):
-        # Return a single-element list, after resolution
-        return [_resolve_sliceable(slize.parent)]
-
-    if isinstance(slize.parent, Signal):
-        return [slize]  # Already all good! Just make a one-element list.
-
-    # Do some actual work. Recursively peel off a bit at a time.
-    if width(slize) == 1:
-        # Base case: slice is one-bit wide. Reach into the parent signal and grab that bit.
-
-        if isinstance(slize.parent, Slice):
-            parent = slize.parent  # Note this is also a Slice
-            return _list_slice(parent.parent[parent.bot + slize.bot])
-
-        if isinstance(slize.parent, Concat):
-            idx = 0  # Find the `part` including our index
-            for part in slize.parent.parts:
-                if width(part) + idx > slize.bot:
-                    return _list_slice(part[slize.bot - idx])
-                idx += width(part)
-            msg = f"Slice {slize} is out of bounds of Concat {slize.parent}"
-            raise RuntimeError(msg)
+    cached = cache.get(conn, None)
+    if cached is not None:
+        return cached
 
-        raise TypeError(f"Invalid attempt to resolve slicing on {slize}")
-
-    # Otherwise recurse in something like a "cons" pattern, splitting between the first bit and the rest.
-    step = slize.step
-    if step < 0:  # Negative step, begin from `top`
-        first = _list_slice(slize.parent[slize.top])
-        rest = slize.parent[slize.top + step : slize.bot : step]
-        rest = _list_slice(rest)
-
-    else:  # Positive step, begin from `bot`
-        first = _list_slice(slize.parent[slize.bot])
-        rest = _list_slice(slize.parent[slize.bot + step : slize.top : step])
-
-    return first + rest
-
-
-def _resolve_slice(slize: Slice) -> Sliceable:
-    """Resolve a `Slice` to one or more with "concrete" `Signal`s as parents.
-
-    Slices of other Slices and Slices of Concats are both valid design-time constructions.
-    For example:
-    ```python
-    h.Concat(sig1, sig2, sig3)[1] # Slice of a Concat
-    sig4[0:2][1] # Slice of a Slice
-    ```
-
-    While these may not frequently be created by designers, they are (at least) often created by array broadcasting.
-    As some point their parents must be resolved to their original Signals, at minimum before export-level name resolution.
-
-    Resolving Concatenations can generally resolve to more than one Slice, as in:
-    ```python
-    h.Concat(sig1[0], sig2[0], sig3[0])[0:1] # Requires slices of `sig1` and `sig2`
-    ```
-    Such cases create and return a Concatenation."""
-
-    # Break out the slice elements in a list
-    ls = _list_slice(slize)
-    # And convert to either a single element or Concat
-    if len(ls) == 1:  # Resolved to single Slice
-        return ls[0]
-    elif len(ls) > 1:  # Multiple parts required - concatenate them
-        return Concat(*ls)
-
-    raise RuntimeError(f"Error resolving Slice {slize}")
-
-
-def _resolve_concat(conc: Concat) -> Concat:
-    """Resolve a Concatenation into (a) concrete Signals and (b) Slices of concrete Signals.
-    Removes nested concatenations and resolves slices along the way."""
-
-    if not len(conc.parts):
-        raise RuntimeError("Concatenation with no parts")
-
-    if all(_flat_concatable(p) for p in conc.parts):
-        return Concat(*[_resolve_sliceable(p) for p in conc.parts])
-
-    if isinstance(conc.parts[0], Concat):
-        # Recursively cover the first element, and all others
-        first = _resolve_concat(conc.parts[0])
-        rest = _resolve_concat(Concat(*conc.parts[1:]))
-        return Concat(*(first.parts + rest.parts))
-
-    if isinstance(conc.parts[0], Slice):
-        # Resolve everything within the Slice to a list of concrete-Signal slices
-        first = _resolve_slice(conc.parts[0])
-        # Pass everything else recursively back to this method
-        rest = _resolve_concat(Concat(*conc.parts[1:]))
-        # And concatenate the two
-        return Concat(*(first + rest.parts))
-
-    # Otherwise peel off as many Signals and concrete-Signal Slices as we can
-    for idx in range(len(conc.parts)):
-        if _flat_concatable(conc.parts[idx]):
-            continue
-        # Hit our first "compound" entry. Split the list here.
-        first = conc.parts[:idx]
-        rest = _resolve_concat(Concat(*conc.parts[idx:]))
-        return Concat(*(first + rest.parts))
-
-    raise RuntimeError("Unable to resolve concatenation")
-
-
-def _resolve_ref(ref: Union[PortRef, BundleRef]) -> Sliceable:
-    """Resolve a reference to a Port or Bundle"""
-    if ref.resolved is None:
-        raise RuntimeError(f"Unresolved reference {ref}")
-    return _resolve_sliceable(ref.resolved)
-
-
-def _flat_concatable(s: Sliceable) -> bool:
-    """Boolean indication of whether `s` is suitable for flattened Concatenations.
-    Such objects must be either:
-    * (a) A Signal, or
-    * (b) A Slice into a Signal
-    Notable exceptions include Concats and nested Slices of Concats and other Slices."""
-    return isinstance(s, Signal) or (
-        isinstance(s, Slice) and isinstance(s.parent, Signal)
+    if isinstance(conn, Signal):
+        runs = [Run(conn, 0, conn.width, 1)]
+    elif isinstance(conn, Slice):
+        runs = select_runs(resolve_runs(conn.parent, cache), _slice_range(conn))
+    elif isinstance(conn, Concat):
+        if not len(conn.parts):
+            raise RuntimeError("Concatenation with no parts")
+        runs = []
+        for part in conn.parts:
+            for run in resolve_runs(part, cache).runs:
+                _append(runs, run)
+    elif isinstance(conn, (PortRef, BundleRef)):
+        if conn.resolved is None:
+            raise RuntimeError(f"Unresolved reference {conn}")
+        return resolve_runs(conn.resolved, cache)
+    else:
+        raise TypeError(f"Invalid attempt to resolve slicing on {conn}")
+
+    # Calculate the offset of each run
+    offsets = []
+    offset = 0
+    for run in runs:
+        offsets.append(offset)
+        offset += run.width
+
+    result = Runs(runs, offsets, offset)
+    cache[conn] = result
+    return result
+
+
+def _slice_range(slize: Slice) -> range:
+    """Get the range of parent-bits selected by `slize`"""
+    if slize.step > 0:
+        return range(slize.bot, slize.top, slize.step)
+    return range(slize.top - 1, slize.bot - 1, slize.step)
+
+
+def select_runs(parent: Runs, bits: range) -> List[Run]:
+    """Select the `bits` of `parent`, producing a new list of `Run`s.
+    Runs through the parent's runs in (at most) a single pass, regardless of the width of each."""
+
+    if not len(bits):
+        return []
+    if min(bits[0], bits[-1]) < 0 or max(bits[0], bits[-1]) >= parent.width:
+        msg = f"Slice of bits {bits} is out of bounds of width-{parent.width} parent"
+        raise RuntimeError(msg)
+
+    runs, offsets = parent.runs, parent.offsets
+    result: List[Run] = []
+
+    # Find the run including the first bit
+    idx = bisect_right(offsets, bits[0]) - 1
+
+    num = len(bits)
+    k = 0
+    while k < num:
+        bit = bits[k]
+        if bits.step > 0:
+            # Walk forward to the run including `bit`
+            while offsets[idx] + runs[idx].width <= bit:
+                idx += 1
+            # Count the bits from `k` which fall into that run
+            last = offsets[idx] + runs[idx].width - 1
+            count = min(num - k, (last - bit) // bits.step + 1)
+        else:
+            # Walk backward to the run including `bit`
+            while offsets[idx] > bit:
+                idx -= 1
+            count = min(num - k, (bit - offsets[idx]) // -bits.step + 1)
+
+        # Create a sub-run for those bits
+        run = runs[idx]
+        lo = run.lo + (bit - offsets[idx]) * run.step
+        if count == 1:
+            sub = Run(run.signal, lo, lo + 1, 1)
+        else:
+            step = bits.step * run.step
+            sub = Run(run.signal, lo, lo + count * step, step)
+        _append(result, sub)
+        k += count
+
+    return result
+
+
+def _append(runs: List[Run], run: Run) -> None:
+    """Append `run` to `runs`, merging it with the last run if adjacent."""
+    if runs:
+        last = runs[-1]
+        if last.signal is run.signal and last.step == run.step and last.hi == run.lo:
+            runs[-1] = Run(run.signal, last.lo, run.hi, run.step)
+            return
+    runs.append(run)
+
+
+def _to_sliceable(runs: List[Run]) -> Sliceable:
+    """Convert a list of `Run`s into a Signal, Slice, or Concatenation thereof."""
+
+    parts: List[Union[Signal, Slice]] = []
+    for run in runs:
+        sig = run.signal
+        if run.step == 1:
+            if run.lo == 0 and run.hi == sig.width:
+                parts.append(sig)  # Full-width. Use the Signal.
+            elif run.width == 1:
+                parts.append(sig[run.lo])
+            else:
+                parts.append(sig[run.lo : run.hi])
+        else:
+            # Non-unit step. Break it into single bits.
+            parts.extend(sig[bit] for bit in range(run.lo, run.hi, run.step))
+
+    if not parts:
+        raise RuntimeError("Error resolving zero-width Slice")
+    if len(parts) == 1:
+        return parts[0]
+    return Concat(*parts)
+
+
+def _flat_slice(conn: Union[Slice, Concat]) -> bool:
+    """Boolean indication of whether `conn` is already resolved:
+    a unit-step, partial-width Slice of a concrete Signal."""
+    return (
+        isinstance(conn, Slice)
+        and isinstance(conn.parent, Signal)
+        and conn.step == 1
+        and conn.width < conn.parent.width
     )
+
+
+def _num_slices(conn: Sliceable) -> int:
+    """Get the number of `Slice`s in resolved connection `conn`. Used for profiling."""
+    if isinstance(conn, Slice):
+        return 1
+    if isinstance(conn, Concat):
+        return sum(isinstance(p, Slice) for p in conn.parts)
+    return 0
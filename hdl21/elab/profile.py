@@ -0,0 +1,173 @@
+"""
+# Elaboration Profiling
+
+Opt-in timing and counting of the work done by each `ElabPass`, on each `Module`.
+Usage:
+
+```python
+profile = h.ElabProfile()
+h.elaborate(MyTop, profile=profile)
+print(profile.hottest(5))
+profile.write_chrome_trace("elab.trace.json")
+```
+
+The resultant trace can be loaded into `chrome://tracing` or https://ui.perfetto.dev.
+"""
+
+# Std-Lib Imports
+import json
+from pathlib import Path
+from time import perf_counter
+from dataclasses import field
+from typing import Any, Dict, List, Union
+
+# Local imports
+from ..datatype import datatype, AllowArbConfig
+from ..module import Module
+
+
+@datatype
+class PassStats:
+    """# Timing and counters for a single `ElabPass`.
+    Repeated runs of the same pass, e.g. the default `ConnTypes` checks, accumulate into a single `PassStats`."""
+
+    name: str  # Pass (class) name
+    time: float = 0.0  # Total time in `elaborate_module`, in seconds
+    modules: int = 0  # Number of Modules visited
+
+    # Counts of Module contents visited
+    instances: int = 0
+    instarrays: int = 0
+    instbundles: int = 0
+    bundles: int = 0
+
+    # Counts of objects created by the pass
+    signals_created: int = 0
+    slices_created: int = 0
+
+    # Number of duplicate Modules merged, by `ModuleDeduplicator`
+    modules_merged: int = 0
+
+
+@datatype
+class ModuleStats:
+    """# Timing for a single `Module`, across all passes"""
+
+    name: str  # Module name
+    time: float = 0.0  # Total time, in seconds
+    passes: Dict[str, float] = field(default_factory=dict)  # Time per pass
+
+
+@datatype
+class TraceEvent:
+    """# Timed event, in the form of a Chrome-trace "complete" event"""
+
+    name: str  # Event name
+    cat: str  # Category
+    start: float  # Start time, in seconds since the beginning of profiling
+    dur: float  # Duration, in seconds
+    args: Dict[str, Any] = field(default_factory=dict)  # Extra annotations
+
+
+@datatype(config=AllowArbConfig)
+class ElabProfile:
+    """
+    # Elaboration Profile
+
+    Records wall-clock time per pass and per Module, and counts of the objects each pass visits and creates.
+    Pass one to `elaborate` to fill it in. A single profile can be used for several elaborations, accumulating their results.
+    """
+
+    passes: Dict[str, PassStats] = field(default_factory=dict)
+    modules: Dict[str, ModuleStats] = field(default_factory=dict)
+    events: List[TraceEvent] = field(default_factory=list)
+    total: float = 0.0  # Total elaboration time, in seconds
+    t0: float = field(default_factory=perf_counter)  # Profiling start time
+
+    def pass_stats(self, name: str) -> PassStats:
+        """Get the `PassStats` for pass `name`, creating it if necessary."""
+        stats = self.passes.get(name, None)
+        if stats is None:
+            stats = self.passes[name] = PassStats(name=name)
+        return stats
+
+    def count(self, passname: str, counter: str, num: int = 1) -> None:
+        """Increment `counter` of pass `passname` by `num`."""
+        stats = self.pass_stats(passname)
+        setattr(stats, counter, getattr(stats, counter) + num)
+
+    def record_module(
+        self, passname: str, module: Module, start: float, end: float
+    ) -> None:
+        """Record the time pass `passname` spent on `module`, from `start` to `end`.
+        Also counts the contents of `module`, which should be called before the pass modifies them."""
+
+        dur = end - start
+
+        stats = self.pass_stats(passname)
+        stats.time += dur
+        stats.modules += 1
+
+        name = module.name or ""
+        mstats = self.modules.get(name, None)
+        if mstats is None:
+            mstats = self.modules[name] = ModuleStats(name=name)
+        mstats.time += dur
+        mstats.passes[passname] = mstats.passes.get(passname, 0.0) + dur
+
+        self.record_event(name=name, cat=passname, start=start, end=end)
+
+    def count_module(self, passname: str, module: Module) -> None:
+        """Count the instances, arrays and bundles of `module` visited by pass `passname`."""
+        stats = self.pass_stats(passname)
+        stats.instances += len(module.instances)
+        stats.instarrays += len(module.instarrays)
+        stats.instbundles += len(module.instbundles)
+        stats.bundles += len(module.bundles)
+
+    def record_event(self, name: str, cat: str, start: float, end: float) -> None:
+        """Record a trace event, from `perf_counter` times `start` to `end`."""
+        event = TraceEvent(name=name, cat=cat, start=start - self.t0, dur=end - start)
+        self.events.append(event)
+
+    def hottest(self, num: int = 10) -> List[ModuleStats]:
+        """Get the `num` Modules with the largest total time"""
+        return sorted(self.modules.values(), key=lambda m: m.time, reverse=True)[:num]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a (JSON-compatible) dictionary, e.g. for regression-tracking."""
+        return dict(
+            total=self.total,
+            passes={k: _fields(v) for k, v in self.passes.items()},
+            modules={k: _fields(v) for k, v in self.modules.items()},
+        )
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Convert to Chrome-trace format. Times are in microseconds."""
+        events = [
+            dict(
+                name=e.name,
+                cat=e.cat,
+                ph="X",  # "Complete" event, with start and duration
+                ts=e.start * 1e6,
+                dur=e.dur * 1e6,
+                pid=0,
+                tid=0,
+                args=e.args,
+            )
+            for e in self.events
+        ]
+        return dict(traceEvents=events, displayTimeUnit="ms")
+
+    def write_chrome_trace(self, path: Union[str, Path]) -> None:
+        """Write Chrome-trace JSON to file `path`"""
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def _fields(obj: Any) -> Dict[str, Any]:
+    """Get a dictionary of the fields of datatype `obj`"""
+    return {k: getattr(obj, k) for k in obj.__dataclass_fields__}
+
+
+__all__ = ["ElabProfile", "PassStats", "ModuleStats"]
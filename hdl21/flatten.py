@@ -6,11 +6,12 @@ See function `flatten()` for details.
 
 import copy
 from pydantic.dataclasses import dataclass
-from dataclasses import field, replace
-from typing import Dict, Generator, List, Optional
+from dataclasses import field
+from typing import Dict, Generator, Iterator, List, Optional, Tuple
 
 import hdl21 as h
 from .signal import _copy_to_internal
+from .connect import Connectable
 from .datatype import AllowArbConfig
 
 
@@ -59,10 +60,10 @@ def walk(
 ) -> Generator[FlattenedInstance, None, None]:
     if conns is None:
         conns = {**m.signals, **m.ports}
-    for inst in m.instances.values():
+    for inst, inst_conns in _instances(m):
         new_conns = {}
         new_parents = parents + [inst]
-        for src_port_name, sig in inst.conns.items():
+        for src_port_name, sig in inst_conns.items():
             if isinstance(sig, h.Signal):
                 key = sig.name
             elif isinstance(sig, (h.Slice, h.Concat)):
@@ -80,11 +81,9 @@ def walk(
             if key in conns:
                 target_sig = conns[key]
             elif key in m.signals:
-                target_sig = replace(
-                    _copy_to_internal(m.signals[key]), name=new_sig_name
-                )
+                target_sig = _copy_to_internal(m.signals[key], name=new_sig_name)
             elif key in m.ports:
-                target_sig = replace(_copy_to_internal(m.ports[key]), name=new_sig_name)
+                target_sig = _copy_to_internal(m.ports[key], name=new_sig_name)
             else:
                 raise ValueError(f"signal {key} not found")
             new_conns[src_port_name] = target_sig
@@ -95,6 +94,35 @@ def walk(
             yield from walk(inst.of, new_parents, new_conns)
 
 
+def _instances(m: h.Module) -> Iterator[Tuple[h.Instance, Dict[str, Connectable]]]:
+    """Get each Instance in `m`, and its connections.
+    Includes the elements of any compact `InstanceArray`s, as kept by elaboration with `compact_arrays`.
+    These are expanded from each array's `ArrayConnRule`s, with the names array-flattening would give them."""
+
+    yield from ((inst, inst.conns) for inst in m.instances.values())
+
+    avoid = set(m.namespace.keys())
+    for array in m.instarrays.values():
+        if array._conn_rules is None:
+            msg = f"Invalid InstanceArray {array.name} for flattening. Arrays must be elaborated, or elaborated with `compact_arrays`."
+            raise RuntimeError(msg)
+
+        # Elements connect to the whole of each broadcast connection, and to a part of each other one
+        for pname, rule in array._conn_rules.items():
+            if not rule.broadcast:
+                msg = f"Flattening `Slice` and `Concat` is not (yet) supported, as in the connection to `{pname}` on InstanceArray `{array.name}`"
+                raise NotImplementedError(msg)
+
+        for k in range(array.n):
+            # Create a unique name
+            name = f"{array.name}_{k}"
+            while name in avoid:
+                name += "_"
+            avoid.add(name)
+            # Note the element Instance is not connected, so that its connections do not modify the Signals in `m`.
+            yield h.Instance(of=array.of, name=name), array.conns
+
+
 def _find_signal_or_port(m: h.Module, name: str) -> h.Signal:
     """Find a signal or port by name"""
 
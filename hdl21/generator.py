@@ -6,9 +6,24 @@ Including facilities for embedding them in a hardware hierarchy.
 """
 
 # Std-Lib imports
+import os
 import inspect
+import threading
+from weakref import WeakValueDictionary
 from dataclasses import field
-from typing import Callable, Any, Optional, Dict, Set, List, Type
+from typing import (
+    Callable,
+    Any,
+    Optional,
+    Dict,
+    Set,
+    List,
+    Tuple,
+    Type,
+    Union,
+    Iterable,
+    Iterator,
+)
 
 # Local imports
 from .datatype import datatype, AllowArbConfig
@@ -17,6 +32,17 @@ from .default import Default
 from .call import param_call
 from .source_info import SourceInfo, source_info
 from .module import Module
+from .instance import calls_instantiate
+from .disk_cache import DiskCache
+from .generator_profile import GeneratorProfile
+from .cache_policy import (
+    CachePolicy,
+    CacheStats,
+    LruTracker,
+    LfuTracker,
+    new_tracker,
+    approx_size,
+)
 
 
 @datatype
@@ -34,6 +60,9 @@ class Generator:
     # Optional fields
     # Boolean indication of whether to cache calls, or return a new Module with each call.
     enable_cache: bool = True
+    # Boolean indication of whether calls are deferred until elaboration.
+    # If set, calls return their (instantiable) `GeneratorCall`, rather than running the generator function.
+    lazy: bool = False
 
     def __post_init__(self):
         if not isparamclass(self.paramtype):
@@ -42,9 +71,14 @@ class Generator:
             )
         self._source_info: Optional[SourceInfo] = source_info(get_pymodule=True)
 
-    def __call__(self, arg: Any = Default, **kwargs: Dict) -> Module:
+    def __call__(
+        self, arg: Any = Default, **kwargs: Dict
+    ) -> Union[Module, "GeneratorCall"]:
+        # Returns the generated `Module`, or for `lazy` Generators, the `GeneratorCall` to run on elaboration.
         params = param_call(callee=self, arg=arg, **kwargs)
         call = GeneratorCall(gen=self, params=params)
+        if self.lazy:
+            return call
         return run(call)
 
     def __repr__(self) -> str:
@@ -58,6 +92,16 @@ class Generator:
         # Identity is equality
         return hash(id(self))
 
+    def map(
+        self, params: Iterable[Any], workers: Optional[int] = None, ordered: bool = True
+    ) -> Iterator[Module]:
+        """# Map
+        Generate a Module for each of `params`, using up to `workers` processes.
+        See `hdl21.generator_map` for details."""
+        from .generator_map import generator_map
+
+        return generator_map(self, params, workers=workers, ordered=ordered)
+
     @property
     def name(self) -> str:
         """Generator Name
@@ -117,6 +161,7 @@ def generator(f: Optional[Callable] = None, **kwargs: Dict) -> Generator:
     return inner(f)  # Called without parentheses
 
 
+@calls_instantiate
 @datatype
 class GeneratorCall:
     """
@@ -124,11 +169,19 @@ class GeneratorCall:
 
     Combination of a `Generator` function-wrapper and its parameters.
     Serves as the key in the `GeneratorCache`.
+
+    Calls to `lazy` Generators return their `GeneratorCall`, which is `Instantiable`.
+    Instances of it are resolved to the generated Module during elaboration,
+    so that only calls reachable from the elaborated tops are ever run.
     """
 
     gen: Generator
     params: Any
 
+    def resolve(self) -> Module:
+        """Run the call, or get its cached result"""
+        return run(self)
+
     def __eq__(self, other) -> bool:
         """
         # Generator-Call Equality
@@ -150,35 +203,99 @@ class GeneratorCall:
 
 
 def run(call: GeneratorCall) -> Module:
-    """Run Generator-function-call `call`. Returns the generated Module."""
+    """Run Generator-function-call `call`. Returns the generated Module.
+
+    Safe to call from several threads at once. Each thread has its own call stack,
+    while cached results are shared. Concurrent calls with equal parameters run the generator once;
+    all but the first wait for its result."""
 
-    # First and foremost - caching.
-    # See if we've already run this generator-parameters combo.
     the_cache = Generator.Cache
-    if call.gen.enable_cache:
-        cached_result = the_cache.done.get(call, None)
+    profile = the_cache.profile
+    cached = call.gen.enable_cache
+    flight = None
+
+    if cached:
+        # Check for circular dependencies, i.e. calls already in progress on this thread.
+        # Note this uses a hash-set of `GeneratorCall`s, so only hashable ones get checked.
+        if call in the_cache.pending:
+            stack = "\n".join(f"  {c}" for c in the_cache.stack)
+            msg = f"Invalid self referencing/ circular dependency in `{call}`, with call stack:\n{stack}"
+            raise RuntimeError(msg)
+
+        # First and foremost - caching.
+        # See if we've already run this generator-parameters combo.
+        # If another thread is running it, this waits for its result.
+        cached_result, flight = the_cache.acquire(call)
         if cached_result is not None:
+            if profile is not None:
+                profile.record_call(call, hit=True)
             return cached_result
 
-    # Add to the call stack.
-    # This is helpful even if (especially if) we find it's a circular dependency next.
-    the_cache.stack.append(call)
+    # Not cached, and now ours to run.
+    # Note the generator-function is called directly from this frame, rather than through helper functions,
+    # so that each level of a generator hierarchy adds as few frames as possible to Python's (limited) call stack.
+    try:
+        # Check the on-disk cache, if enabled
+        if cached and the_cache.disk is not None:
+            cached_result = the_cache.disk.load(call)
+            if cached_result is not None:
+                the_cache.put(call, cached_result)
+                if profile is not None:
+                    profile.record_call(call, hit=True)
+                return cached_result
+
+        # Check that the call has a valid instance of the generator's parameter-class
+        if not isinstance(call.params, call.gen.Params):
+            msg = f"Invalid Generator Call {call}: {call.gen.Params} instance required, got {call.params}"
+            raise RuntimeError(msg)
+
+        # The main event: Run the generator-function
+        _enter(call, profile)
+        try:
+            m = call.gen.func(call.params)
+        finally:
+            _exit(call, profile)
+
+        # Check and name the result, and store it in our cache
+        _finish(call, m)
+        if cached:
+            the_cache.put(call, m)
+            if the_cache.disk is not None:
+                the_cache.disk.store(call, m)
+
+    finally:
+        # Wake up any other threads waiting on the call.
+        # If it failed, they each try again.
+        if flight is not None:
+            the_cache.release(call, flight)
+
+    # And return the generated Module
+    return m
+
 
+def _enter(call: GeneratorCall, profile: Optional[GeneratorProfile]) -> None:
+    """Add `call` to this thread's call stack, and for cached calls, its pending set.
+    Records it in `profile` if provided."""
+    the_cache = Generator.Cache
+    the_cache.stack.append(call)
     if call.gen.enable_cache:
-        # Check for circular dependencies.
-        # Note this uses a hash-set of `GeneratorCall`s, so only hashable ones get checked.
-        if call in the_cache.pending:
-            msg = f"Invalid self referencing/ circular dependency in `{call}`"
-            raise RuntimeError(msg)
         the_cache.pending.add(call)
+    if profile is not None:
+        profile.record_call(call, hit=False)
+        profile.enter(call)
+
+
+def _exit(call: GeneratorCall, profile: Optional[GeneratorProfile]) -> None:
+    """Pop `call` from this thread's call stack, whether or not it succeeded. Inverse of `_enter`."""
+    if profile is not None:
+        profile.exit()
+    the_cache = Generator.Cache
+    the_cache.stack.pop()
+    the_cache.pending.discard(call)
 
-    # Check that the call has a valid instance of the generator's parameter-class
-    if not isinstance(call.params, call.gen.Params):
-        msg = f"Invalid Generator Call {call}: {call.gen.Params} instance required, got {call.params}"
-        raise RuntimeError(msg)
 
-    # The main event: Run the generator-function
-    m = call.gen.func(call.params)
+def _finish(call: GeneratorCall, m: Module) -> None:
+    """Check and name Module `m`, the result of `call`."""
 
     if not isinstance(m, Module):
         msg = f"Generator {call.gen} returned {m}, must return `Module`."
@@ -196,14 +313,14 @@ def run(call: GeneratorCall) -> Module:
     if hasparams(call.gen.Params):
         m.name += "(" + _unique_name(call.params) + ")"
 
-    # Store the result in our cache, and on the Call.
-    the_cache.stack.pop()
-    if call.gen.enable_cache:
-        the_cache.pending.remove(call)
-        the_cache.done[call] = m
 
-    # And return the generated Module
-    return m
+class _Flight:
+    """# In-Flight Generator Call
+    Tracks a call being run by thread `owner`, so that other threads can wait for it."""
+
+    def __init__(self, owner: int):
+        self.owner = owner
+        self.event = threading.Event()
 
 
 @datatype(config=AllowArbConfig)
@@ -214,22 +331,244 @@ class GeneratorCache:
     - Cache GeneratorCalls to their (Module) results
       - (Yes, GeneratorCalls can be hashed.)
     - Track pending and completed GeneratorCalls
+      - Each thread has its own `stack` and `pending` set of in-progress calls
+      - Calls in progress on any thread are tracked as "in flight", so that other threads wait for, rather than repeat, them
+    - Optionally persist results to disk, via a `DiskCache`
+    - Optionally profile generator calls, via a `GeneratorProfile`
+
+    Unbounded by default. Setting `max_entries` and/or `max_bytes`, generally via `configure`,
+    evicts entries per `policy` whenever either is exceeded. Sizes in bytes are approximate, per `approx_size`.
+
+    Evicted Modules which remain alive elsewhere, e.g. instantiated by other Modules or held by user code,
+    are effectively pinned: the cache holds them only weakly, and returns them (rather than re-running their generator)
+    to any later call with the same parameters. So no two distinct Modules are ever generated by the same call at once.
     """
 
     done: Dict[GeneratorCall, Module] = field(default_factory=dict)
-    pending: Set[GeneratorCall] = field(default_factory=set)
-    stack: List[GeneratorCall] = field(default_factory=list)
+    disk: Optional[DiskCache] = None
+
+    # Size limits and eviction policy
+    max_entries: Optional[int] = None
+    max_bytes: Optional[int] = None
+    policy: CachePolicy = CachePolicy.LRU
+
+    # Hit, miss, and eviction counters
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    # Optional generator profile
+    profile: Optional[GeneratorProfile] = None
+
+    def __post_init__(self):
+        # Lock guarding everything shared between threads: `done`, the counters, and the eviction bookkeeping.
+        # Re-entrant, as `get` may `put`, and `put` may `evict`.
+        self._lock = threading.RLock()
+        # Per-thread call stacks and pending sets
+        self._local = threading.local()
+        # Calls in progress, on any thread, and the call each waiting thread is waiting on
+        self._flights: Dict[GeneratorCall, _Flight] = dict()
+        self._waiting: Dict[int, _Flight] = dict()
+        # Use-tracker for the eviction policy. `None` when unbounded.
+        self._tracker: Optional[Union[LruTracker, LfuTracker]] = None
+        # Approximate sizes of each entry, and their total. Only tracked when `max_bytes` is set.
+        self._sizes: Dict[GeneratorCall, int] = dict()
+        self._bytes: int = 0
+        # Evicted entries, held weakly
+        self._evicted: WeakValueDictionary = WeakValueDictionary()
+        # Optional journal of all newly added entries, used by `Generator.map` worker processes
+        self._journal: Optional[List[Tuple[GeneratorCall, Module]]] = None
+        self.configure(self.max_entries, self.max_bytes, self.policy)
+
+    def configure(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: Union[CachePolicy, str] = CachePolicy.LRU,
+    ) -> None:
+        """# Configure
+        Set the cache's size limits and eviction policy. `None`-valued limits are unbounded.
+        Evicts entries as necessary to meet the new limits."""
+        policy = CachePolicy(policy)
+        for limit in (max_entries, max_bytes):
+            if limit is not None and limit < 0:
+                raise ValueError(f"Invalid GeneratorCache limit {limit}")
+        with self._lock:
+            self.max_entries, self.max_bytes = max_entries, max_bytes
+            self.policy = policy
+
+            self._tracker = None
+            self._sizes.clear()
+            self._bytes = 0
+            if max_entries is None and max_bytes is None:
+                return  # Unbounded. Nothing to track.
+
+            # Start tracking all existing entries, oldest first
+            self._tracker = new_tracker(policy)
+            for call, module in self.done.items():
+                self._tracker.add(call)
+                if max_bytes is not None:
+                    self._sizes[call] = approx_size(module)
+                    self._bytes += self._sizes[call]
+            self.evict()
+
+    @property
+    def stack(self) -> List[GeneratorCall]:
+        """The current thread's stack of in-progress calls"""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = list()
+        return stack
+
+    @property
+    def pending(self) -> Set[GeneratorCall]:
+        """The current thread's set of in-progress (cached) calls"""
+        pending = getattr(self._local, "pending", None)
+        if pending is None:
+            pending = self._local.pending = set()
+        return pending
+
+    def acquire(
+        self, call: GeneratorCall
+    ) -> Tuple[Optional[Module], Optional[_Flight]]:
+        """Get the cached result of `call`, or claim it for the current thread to run.
+        Returns either `(result, None)`, or `(None, flight)` for a newly claimed call.
+        The latter must be handed back to `release` once done, whether or not successful.
+
+        If another thread is running `call`, waits for it to finish first.
+        Raises a `RuntimeError` if waiting would deadlock, i.e. for circular dependencies across threads."""
+
+        me = threading.get_ident()
+        while True:
+            with self._lock:
+                flight = self._flights.get(call, None)
+                if flight is None:
+                    m = self.get(call)
+                    if m is not None:
+                        return m, None
+                    flight = self._flights[call] = _Flight(owner=me)
+                    return None, flight
+
+                # In flight on another thread. Check that it is not (transitively) waiting on us.
+                owner = flight.owner
+                while owner != me and owner in self._waiting:
+                    owner = self._waiting[owner].owner
+                if owner == me:
+                    msg = f"Invalid self referencing/ circular dependency in `{call}`, across threads"
+                    raise RuntimeError(msg)
+                self._waiting[me] = flight
+
+            try:
+                flight.event.wait()
+            finally:
+                with self._lock:
+                    self._waiting.pop(me, None)
+
+    def release(self, call: GeneratorCall, flight: _Flight) -> None:
+        """Release `call`, claimed by `acquire`, waking up any threads waiting on it"""
+        with self._lock:
+            if self._flights.get(call, None) is flight:
+                del self._flights[call]
+        flight.event.set()
+
+    def get(self, call: GeneratorCall) -> Optional[Module]:
+        """Get the cached result of `call`, or `None` if not cached. Updates the counters and use-tracking."""
+        with self._lock:
+            m = self.done.get(call, None)
+            if m is not None:
+                self.stats.hits += 1
+                if self._tracker is not None:
+                    self._tracker.touch(call)
+                return m
+
+            if self._evicted:
+                m = self._evicted.pop(call, None)
+                if m is not None:
+                    # Evicted, but still alive. Revive it.
+                    self.stats.hits += 1
+                    self.stats.revivals += 1
+                    self.put(call, m)
+                    return m
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, call: GeneratorCall, module: Module) -> None:
+        """Add `module` as the result of `call`, evicting other entries if necessary."""
+        with self._lock:
+            self.done[call] = module
+            if self._journal is not None:
+                self._journal.append((call, module))
+            if self._tracker is None:
+                return
+            self._tracker.add(call)
+            if self.max_bytes is not None:
+                size = approx_size(module)
+                self._sizes[call] = size
+                self._bytes += size
+            self.evict()
+
+    def evict(self) -> None:
+        """Evict entries until within the size limits"""
+        with self._lock:
+            if self._tracker is None:
+                return
+            while self.done and (
+                (self.max_entries is not None and len(self.done) > self.max_entries)
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                call = self._tracker.victim()
+                self._tracker.remove(call)
+                self._bytes -= self._sizes.pop(call, 0)
+                self._evicted[call] = self.done.pop(call)
+                self.stats.evictions += 1
 
     def reset(self):
         """# Reset
-        Clear everything in the Generator cache."""
-        self.done.clear()
-        self.pending.clear()
-        self.stack.clear()
+        Clear everything in the Generator cache, including its counters.
+        Clears the call stack and pending set of the current thread only. Calls in progress on other threads are unaffected.
+        Note this does not clear the on-disk cache, if enabled. See `DiskCache.clear` for that."""
+        with self._lock:
+            self.done.clear()
+            self.pending.clear()
+            self.stack.clear()
+            self._evicted.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            if self._tracker is not None:
+                self._tracker.clear()
+            self.stats = CacheStats()
+
+    def enable_disk(self, path: Union[str, os.PathLike]) -> DiskCache:
+        """# Enable Disk Cache
+        Store generated Modules in, and load them from, directory `path`."""
+        self.disk = DiskCache(path)
+        return self.disk
+
+    def disable_disk(self) -> None:
+        """# Disable Disk Cache"""
+        self.disk = None
+
+    def enable_profile(
+        self, profile: Optional[GeneratorProfile] = None
+    ) -> GeneratorProfile:
+        """# Enable Profiling
+        Record generator calls in `profile`, or in a new `GeneratorProfile` if not provided.
+        Returns the profile."""
+        self.profile = profile if profile is not None else GeneratorProfile()
+        return self.profile
+
+    def disable_profile(self) -> Optional[GeneratorProfile]:
+        """# Disable Profiling
+        Returns the prior profile, if there was one."""
+        profile, self.profile = self.profile, None
+        return profile
 
 
 # Create the `Cache`, and affix it to the `generator` function and class
 generator.cache = Generator.Cache = GeneratorCache()
 
+# Enable its disk tier if the `HDL21_GENERATOR_CACHE` environment variable names a directory
+if os.environ.get("HDL21_GENERATOR_CACHE", None):
+    Generator.Cache.enable_disk(os.environ["HDL21_GENERATOR_CACHE"])
+
 # Star-exports
-__all__ = ["Generator", "generator"]
+__all__ = ["Generator", "generator", "CachePolicy", "GeneratorProfile"]
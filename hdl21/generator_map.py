@@ -0,0 +1,184 @@
+"""
+# Generator Map
+
+Batch and parallel generation of a Module for each of a collection of parameter values,
+typically as part of sweeps over design spaces. Generally invoked via `Generator.map`:
+
+```python
+for module in MyGen.map(params_grid, workers=8):
+    ...  # Use each `module`, while the remainder are still being generated
+```
+
+Equal parameter values are generated once. Calls already in the `GeneratorCache` are not re-run.
+The remaining unique calls run in a pool of (forked) worker processes.
+
+Worker results are transferred back in the serialized form used by the `DiskCache`,
+in which shared definitions - Python modules, importable Modules and Generators, and the like - are references.
+Each worker returns every Module it generates, including those of nested generator calls, children first.
+All are added to the `GeneratorCache` of the calling process, exactly as if they had been generated locally.
+Modules of generators with caching disabled are the exception: these are returned by value, as part of their instantiators.
+Modules generated by more than one worker are kept once, from whichever finishes first.
+
+Calls which fail in a worker, for any reason, are re-run locally, so that any errors are raised in the calling process.
+"""
+
+# Std-Lib Imports
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+# Local imports
+from .module import Module
+from .call import param_call
+from .disk_cache import dumps, loads
+from .generator import Generator, GeneratorCall, run
+
+
+def generator_map(
+    gen: Generator,
+    params: Iterable[Any],
+    workers: Optional[int] = None,
+    ordered: bool = True,
+) -> Iterator[Module]:
+    """Generate a Module from `gen` for each of `params`, using up to `workers` processes.
+    The number of `workers` defaults to the number of CPUs.
+
+    Returns an iterator of the generated Modules, available as they complete.
+    If `ordered`, they are produced in the order of `params`, each as soon as it and those before it are complete.
+    Otherwise, they are produced in order of completion.
+    Each element of `params` produces one Module, including repeated, equal elements."""
+
+    # Create the calls, and sort out the unique ones
+    calls = [GeneratorCall(gen=gen, params=param_call(gen, p)) for p in params]
+    unique: Dict[Hashable, List[int]] = dict()
+    for index, call in enumerate(calls):
+        unique.setdefault(_key(call, index), []).append(index)
+
+    results: Dict[int, Module] = dict()  # Results, keyed by index into `calls`
+    next_index = 0  # Next index to produce, when `ordered`
+
+    def complete(indices: List[int], module: Module) -> Iterator[Module]:
+        # Record `module` as the result for each of `indices`, and produce whatever is ready.
+        nonlocal next_index
+        for index in indices:
+            results[index] = module
+            if not ordered:
+                yield module
+        if ordered:
+            while next_index in results:
+                yield results.pop(next_index)
+                next_index += 1
+
+    # Sort out which calls are already cached
+    todo: List[List[int]] = list()
+    for indices in unique.values():
+        call = calls[indices[0]]
+        cached = Generator.Cache.get(call) if gen.enable_cache else None
+        if cached is not None:
+            yield from complete(indices, cached)
+        else:
+            todo.append(indices)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    forkable = "fork" in multiprocessing.get_all_start_methods()
+    if workers < 2 or len(todo) < 2 or not forkable:
+        # Run serially, in this process
+        for indices in todo:
+            yield from complete(indices, run(calls[indices[0]]))
+        return
+
+    # Run the remaining calls in worker processes
+    ctx = multiprocessing.get_context("fork")
+    todo_params = [calls[indices[0]].params for indices in todo]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(todo)),
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(gen, todo_params),
+    ) as pool:
+        futures = {pool.submit(_generate, n): n for n in range(len(todo))}
+        for future in as_completed(futures):
+            indices = todo[futures[future]]
+            call = calls[indices[0]]
+            module = None
+            if future.exception() is None:
+                module = _load(call, future.result())
+            if module is None:
+                module = run(call)  # Failed in the worker. Re-run it here.
+            yield from complete(indices, module)
+
+
+def _key(call: GeneratorCall, index: int) -> Hashable:
+    """Get the de-duplication key for `call`, which is number `index`.
+    Calls with unhashable parameters, or to generators without caching, are never de-duplicated."""
+    if not call.gen.enable_cache:
+        return index
+    try:
+        hash(call)
+    except TypeError:
+        return index
+    return call
+
+
+def _load(call: GeneratorCall, entries: List[Tuple[bytes, bytes]]) -> Optional[Module]:
+    """Load the `entries` returned by a worker for `call`, adding each to the `GeneratorCache`.
+    Returns the Module generated by `call`, or `None` if loading fails."""
+    cache = Generator.Cache
+    try:
+        for n, (header, data) in enumerate(entries):
+            gen, params = loads(header)
+            entry_call = GeneratorCall(gen=gen, params=params)
+            is_top = n == len(entries) - 1
+            if gen.enable_cache:
+                # Keep any existing, equal Module, e.g. one loaded from an earlier worker
+                existing = cache.done.get(entry_call, None)
+                if existing is not None:
+                    if is_top:
+                        return existing
+                    continue
+            module = loads(data)
+            module._generated_by = call if is_top else entry_call
+            if gen.enable_cache:
+                cache.put(entry_call, module)
+            if is_top:
+                return module
+    except Exception:
+        return None
+    return None
+
+
+"""
+# Worker-Process State and Functions
+The generator and its parameters are handed to each worker upon its (forked) creation, and are referred to by index from then on.
+"""
+
+_worker_gen: Optional[Generator] = None
+_worker_params: List[Any] = list()
+
+
+def _init_worker(gen: Generator, params: List[Any]) -> None:
+    """Worker-process initializer. Store the generator and its parameters."""
+    global _worker_gen, _worker_params
+    _worker_gen, _worker_params = gen, params
+
+
+def _generate(index: int) -> List[Tuple[bytes, bytes]]:
+    """Generate the Module for parameters number `index`.
+    Returns serialized versions of all newly generated Modules, including nested calls, children first.
+    Each is a tuple of (a) its generator and parameters, and (b) the Module."""
+
+    cache = Generator.Cache
+    call = GeneratorCall(gen=_worker_gen, params=_worker_params[index])
+    cache._journal = list()
+    try:
+        module = run(call)
+        journal = cache._journal
+    finally:
+        cache._journal = None
+
+    # The journal includes the top-level call if it was newly generated, and cached.
+    # Put it last either way.
+    entries = [(c, m) for c, m in journal if m is not module] + [(call, module)]
+    return [(dumps((c.gen, c.params)), dumps(m, root=m)) for c, m in entries]
@@ -0,0 +1,194 @@
+"""
+# Generator Profiling
+
+Opt-in timing and counting of generator calls, and of the call graph between generators.
+Usage:
+
+```python
+profile = h.generator.cache.enable_profile()
+MyChip(params)
+print(profile.table(10))
+profile.write_folded("generators.folded")
+h.generator.cache.disable_profile()
+```
+
+The "folded" output is the collapsed-stack format used by flamegraph tools,
+e.g. `flamegraph.pl`, https://www.speedscope.app, or https://ui.perfetto.dev.
+Each line is a semicolon-separated stack of generator names, and the exclusive time spent there, in microseconds.
+"""
+
+# Std-Lib Imports
+import json
+import threading
+from pathlib import Path
+from time import perf_counter
+from dataclasses import field
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+# Local imports
+from .datatype import datatype, AllowArbConfig
+
+
+@datatype
+class GeneratorStats:
+    """# Timing and counters for a single `Generator`"""
+
+    name: str  # Generator (qualified) name
+    calls: int = 0  # Total calls, including cache hits
+    hits: int = 0  # Calls served from the cache, in memory or on disk
+    unique: int = 0  # Number of unique parameter-values
+    # Total times, including and excluding those of the generators it calls, in seconds
+    inclusive: float = 0.0
+    exclusive: float = 0.0
+
+    # Call counts to each generator called by this one, keyed by name
+    children: Dict[str, int] = field(default_factory=dict)
+
+
+@datatype(config=AllowArbConfig)
+class GeneratorProfile:
+    """
+    # Generator Profile
+
+    Records the calls, cache hits, and time spent in each `Generator`, and the calls between them.
+    Enable one with `GeneratorCache.enable_profile` to fill it in.
+
+    Times cover running the generator function and naming its result.
+    Cache hits are counted, but not timed.
+    Calls on separate threads are each timed on their own thread's call stack.
+    """
+
+    generators: Dict[str, GeneratorStats] = field(default_factory=dict)
+
+    # Exclusive time per call-stack, keyed by semicolon-separated generator names, in seconds
+    stacks: Dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # Per-thread stacks of in-progress calls, each entry of which is (stack key, start time, time in child calls)
+        self._local = threading.local()
+        # Lock guarding the shared results
+        self._lock = threading.Lock()
+        # Unique names of the parameters of each generator
+        self._params: Dict[str, Set[str]] = dict()
+
+    @property
+    def _frames(self) -> List[Tuple[str, float, float]]:
+        """The current thread's stack of in-progress calls"""
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            frames = self._local.frames = list()
+        return frames
+
+    def stats(self, name: str) -> GeneratorStats:
+        """Get the `GeneratorStats` for generator `name`, creating it if necessary."""
+        stats = self.generators.get(name, None)
+        if stats is None:
+            stats = self.generators[name] = GeneratorStats(name=name)
+        return stats
+
+    def record_call(self, call: "GeneratorCall", hit: bool) -> None:
+        """Record call `call`, and whether it was served from the cache"""
+        from .params import _unique_name, hasparams
+
+        name = _gen_name(call.gen)
+        pname = _unique_name(call.params) if hasparams(call.gen.Params) else ""
+        frames = self._frames
+
+        with self._lock:
+            stats = self.stats(name)
+            stats.calls += 1
+            if hit:
+                stats.hits += 1
+
+            params = self._params.setdefault(name, set())
+            params.add(pname)
+            stats.unique = len(params)
+
+            if frames:
+                parent = self.stats(frames[-1][0].rsplit(";", 1)[-1])
+                parent.children[name] = parent.children.get(name, 0) + 1
+
+    def enter(self, call: "GeneratorCall") -> None:
+        """Start timing a (non-cached) run of `call`"""
+        name = _gen_name(call.gen)
+        frames = self._frames
+        key = frames[-1][0] + ";" + name if frames else name
+        frames.append((key, perf_counter(), 0.0))
+
+    def exit(self) -> None:
+        """Finish timing the most recently entered run"""
+        frames = self._frames
+        key, start, child_time = frames.pop()
+        inclusive = perf_counter() - start
+        exclusive = inclusive - child_time
+
+        if frames:
+            pkey, pstart, pchild = frames[-1]
+            frames[-1] = (pkey, pstart, pchild + inclusive)
+
+        with self._lock:
+            stats = self.stats(key.rsplit(";", 1)[-1])
+            # Recursive calls of the same generator are only counted once, in their outermost frame
+            if not _is_recursive(key):
+                stats.inclusive += inclusive
+            stats.exclusive += exclusive
+            self.stacks[key] = self.stacks.get(key, 0.0) + exclusive
+
+    def hottest(self, num: int = 10, by: str = "exclusive") -> List[GeneratorStats]:
+        """Get the `num` generators with the largest `by` time, either "exclusive" or "inclusive"."""
+        if by not in ("exclusive", "inclusive"):
+            raise ValueError(f"Invalid GeneratorProfile sort-key {by}")
+        stats = sorted(self.generators.values(), key=lambda s: getattr(s, by))
+        return stats[::-1][:num]
+
+    def table(self, num: Optional[int] = None, by: str = "exclusive") -> str:
+        """Format a text table of the `num` (default: all) generators with the largest `by` time."""
+        rows = self.hottest(num if num is not None else len(self.generators), by)
+        width = max([len("Generator")] + [len(s.name) for s in rows])
+        header = f"{'Generator':<{width}} {'Calls':>8} {'Hits':>8} {'Unique':>8} {'Incl (ms)':>12} {'Excl (ms)':>12}"
+        lines = [header, "-" * len(header)]
+        for s in rows:
+            lines.append(
+                f"{s.name:<{width}} {s.calls:>8} {s.hits:>8} {s.unique:>8} {s.inclusive * 1e3:>12.3f} {s.exclusive * 1e3:>12.3f}"
+            )
+        return "\n".join(lines)
+
+    def to_folded(self) -> str:
+        """Convert to the collapsed-stack ("folded") flamegraph format. Times are in integer microseconds."""
+        lines = [f"{key} {round(t * 1e6)}" for key, t in self.stacks.items()]
+        return "\n".join(lines) + "\n"
+
+    def write_folded(self, path: Union[str, Path]) -> None:
+        """Write the folded flamegraph format to file `path`"""
+        with open(path, "w") as f:
+            f.write(self.to_folded())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a (JSON-compatible) dictionary"""
+        return dict(
+            generators={
+                k: {f: getattr(v, f) for f in v.__dataclass_fields__}
+                for k, v in self.generators.items()
+            },
+            stacks=dict(self.stacks),
+        )
+
+    def write_json(self, path: Union[str, Path]) -> None:
+        """Write JSON to file `path`"""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+
+def _gen_name(gen: "Generator") -> str:
+    """Get the name of `gen` used in profiles: the module and qualified name of its generator function.
+    Note this differs from `hdl21.qualname`, which for generators resolves to the module which created the `Generator` object."""
+    return f"{gen.func.__module__}.{gen.func.__qualname__}"
+
+
+def _is_recursive(key: str) -> bool:
+    """Boolean indication of whether the innermost generator of stack-key `key` also appears further out"""
+    names = key.split(";")
+    return names[-1] in names[:-1]
+
+
+__all__ = ["GeneratorProfile", "GeneratorStats"]
@@ -10,7 +10,7 @@ from textwrap import dedent
 
 # Local imports
 from .source_info import source_info, SourceInfo
-from .attrmagic import init
+from .attrmagic import init, lazy
 from .connect import Connectable, is_connectable
 from .props import Properties
 
@@ -22,6 +22,12 @@ class _Instance:
     """# _Instance
     Shared base class for Instance-like types (Instance, InstanceArray)"""
 
+    # Properties, created upon first use. Most Instances never set any.
+    props = lazy(Properties)
+    # References we give out, either for refering to ports or entries in out own `conns`.
+    # Created upon first connection or reference. Note `Refs` is defined below.
+    _refs = lazy(lambda: Refs())
+
     def __init__(
         self,
         of: "Instantiable",
@@ -36,11 +42,6 @@ class _Instance:
         self.name: Optional[str] = name
         self.of: Instantiable = of
         self.conns: Dict[str, "Connectable"] = dict()
-        self.props: Properties = Properties()
-
-        # References we give out, either for refering to ports or entries in out own `conns`
-        self._refs = Refs()
-
         self._parent_module: Optional["Module"] = None  # Instantiating module
         self._elaborated: bool = False
         self._source_info: Optional[SourceInfo] = source_info(get_pymodule=False)
@@ -82,7 +83,13 @@ class _Instance:
             # Bootstrapping phase: do regular setattrs to get started
             return object.__setattr__(self, key, val)
         if key in self.__getattribute__("_specialcases"):  # Special case(s)
-            return object.__setattr__(self, key, val)
+            object.__setattr__(self, key, val)
+            if key == "of" and _needs_elaboration(val):
+                # Re-targeting to a new Module or `GeneratorCall` marks the parent Module as edited.
+                # Other replacements do not. These are the domain of post-elaboration `HierarchyWalker`s,
+                # e.g. PDK compilation, whose replacements are not re-elaborated.
+                _touch_parent(self)
+            return None
         _ = self.connect(key, val)  # Discard the returned `self`
         return None
 
@@ -108,6 +115,7 @@ class _Instance:
         else:
             self.conns[portname] = conn
             conn._connected_ports.add(_get_connref(self, portname))
+            _touch_parent(self)
 
         # And return `self` to aid in method-chaining use-cases
         return self
@@ -119,6 +127,7 @@ class _Instance:
 
         conn = self.conns.pop(portname)
         conn._connected_ports.remove(_get_connref(self, portname))
+        _touch_parent(self)
         return conn
 
     def replace(self, portname: str, conn: Connectable) -> Connectable:
@@ -138,6 +147,7 @@ class _Instance:
         # And replace it in the `conns` dict
         self.conns[portname] = conn
         conn._connected_ports.add(connref)
+        _touch_parent(self)
         return old
 
 
@@ -238,6 +248,8 @@ class InstanceArray(_Instance):
     ):
         super().__init__(of=of, name=name)
         self.n = n
+        # Per-port connection rules, set by elaboration if the array is kept compact, rather than flattened.
+        self._conn_rules: Optional[Dict[str, "ArrayConnRule"]] = None
         self._initialized = True
 
     def __getitem__(self, idx: int):
@@ -304,6 +316,36 @@ class Refs:
     connrefs: Dict[str, "PortRef"] = field(default_factory=dict)
 
 
+def _touch_parent(self: _Instance) -> None:
+    """Mark the parent Module of `self`, if it has one, as edited."""
+    parent = self.__getattribute__("_parent_module")
+    if parent is not None:
+        _touch_module(parent)
+
+
+def _touch_module(module: "Module") -> None:
+    """Mark `module` as edited.
+    Bumps its edit-version, and marks every Module which (transitively) instantiated it, as of their last elaboration, as stale.
+    Stops at Modules which are already stale, whose own instantiators are therefore stale as well."""
+    module._version += 1
+    stack = list(module._instantiators)
+    while stack:
+        instantiator = stack.pop()
+        if not instantiator._stale:
+            instantiator._stale = True
+            stack.extend(instantiator._instantiators)
+
+
+def _needs_elaboration(of: Any) -> bool:
+    """Boolean indication of whether Instance-target `of` is a lazy `GeneratorCall` or a never-elaborated `Module`."""
+    from .module import Module
+    from .generator import GeneratorCall
+
+    if isinstance(of, GeneratorCall):
+        return True
+    return isinstance(of, Module) and of._elaborated is None
+
+
 def _get_portref(self: _Instance, key: str) -> "PortRef":
     """Return a port-reference to name `key`, creating it if necessary."""
     from .portref import PortRef
@@ -13,10 +13,13 @@ from .datatype import AllowArbConfig, _pydantic_major_version
 from .module import Module
 from .primitives import PrimitiveCall
 from .external_module import ExternalModuleCall
+from .generator import GeneratorCall
 
 
 # Instantiable types-union
-InstantiableUnion = Union[Module, ExternalModuleCall, PrimitiveCall]
+# Note `GeneratorCall`s, returned by `lazy` Generators, are only instantiable *before* elaboration,
+# which replaces them with their generated Modules.
+InstantiableUnion = Union[Module, ExternalModuleCall, PrimitiveCall, GeneratorCall]
 
 
 def assert_instantiable(i: Any) -> "Instantiable":
@@ -85,7 +88,7 @@ _doc = """
 
 Generally this means
 ````python
-Union[Module, ExternalModuleCall, PrimitiveCall]
+Union[Module, ExternalModuleCall, PrimitiveCall, GeneratorCall]
 ```
 with some customized checking and error handling.
 """
@@ -8,6 +8,7 @@ This module primarily defines:
 """
 
 from inspect import isclass
+from weakref import WeakSet
 from typing import Any, Optional, Union, List, Dict
 
 # Local imports
@@ -19,6 +20,7 @@ from .instance import (
     Instance,
     InstanceArray,
     InstanceBundle,
+    _touch_module,
 )
 from .bundle import BundleInstance
 from .props import Properties
@@ -91,9 +93,27 @@ class Module:
         # Set to `None` initially to indicate that it hasn't been set yet.
         self._pre_flattening_io: Optional[Dict[str, "Connectable"]] = None
 
+        # Flattened replacements for Bundle-valued ports, keyed by port name.
+        # Set by bundle-flattening, and used to flatten connections to Instances of this Module.
+        self._flat_bundle_ports: Dict[str, "BundleScope"] = dict()
+
         # The source `GeneratorCall`, for generated Modules.
         self._generated_by: Optional["GeneratorCall"] = None
 
+        # Edit-version counter, incremented on every change to the Module's content,
+        # including changes to the connections of its Instances.
+        # The version as of the end of the most recent elaboration is stored in `_elaborated_version`.
+        # Modules whose two differ are "dirty", and are re-elaborated by the next call to `elaborate`.
+        self._version: int = 0
+        self._elaborated_version: Optional[int] = None
+
+        # Modules which instantiated this one as of their most recent elaboration, and a flag indicating
+        # whether any Module this one (transitively) instantiates has been edited since its most recent elaboration.
+        # Edits set `_stale` on each instantiator, and on theirs, and so on.
+        # Re-elaboration can then skip any hierarchy whose top is neither edited nor stale, without walking it.
+        self._instantiators: WeakSet[Module] = WeakSet()
+        self._stale: bool = False
+
         self._importpath = None  # Optional field set by importers
         self._source_info: Optional[SourceInfo] = source_info(get_pymodule=True)
         self._initialized = True
@@ -222,6 +242,18 @@ class Module:
         # Identity is equality
         return hash(id(self))
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # Instantiator back-references are not copied or pickled.
+        state = self.__dict__.copy()
+        state.pop("_instantiators", None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Copies are marked stale, so that their next elaboration re-records their instantiators.
+        self.__dict__.update(state)
+        self._instantiators = WeakSet()
+        self._stale = True
+
 
 def module(cls: type) -> Module:
     """
@@ -315,8 +347,13 @@ def _add(module: Module, val: ModuleAttr) -> ModuleAttr:
     Layers above `_add` must ensure that `val` has its `name` attribute before calling this method.
     """
 
-    if module._elaborated is not None:
-        raise RuntimeError(f"Cannot add {val} to {module} after elaboration.")
+    if module._elaborated is not None and module._pre_flattening_io is not None:
+        # Adding to an already-elaborated Module. This is allowed, and marks it for re-elaboration.
+        # New ports must also show up in its pre-flattening IO, as seen by (not yet elaborated) parents.
+        if isinstance(val, Signal) and val.vis == Visibility.PORT:
+            module._pre_flattening_io[val.name] = val
+        elif isinstance(val, BundleInstance) and val.port:
+            module._pre_flattening_io[val.name] = val
 
     # Sort out which of our type-based containers to add `val` to.
     if isinstance(val, Signal):
@@ -357,6 +394,9 @@ def _add(module: Module, val: ModuleAttr) -> ModuleAttr:
     # Ok, now actually give it a reference to us:
     val._parent_module = module
 
+    # Mark the Module as edited
+    _touch_module(module)
+
     # And return our newly-added attribute
     return val
 
@@ -4,7 +4,10 @@ Hdl21 Parameters and Param-Classes
 
 # Std-Lib Imports
 import dataclasses, inspect, json, hashlib
-from typing import Optional, Any, Type, TypeVar, Dict
+from enum import Enum
+from decimal import Decimal
+from json.encoder import encode_basestring_ascii as _encode_str
+from typing import Optional, Any, Type, TypeVar, Dict, Iterable, List, Union
 
 # PyPi Imports
 import pydantic
@@ -12,6 +15,7 @@ import pydantic
 # Local Imports
 from .default import Default
 from .datatype import AllowArbConfig, pydantic_json_encoder
+from .prefix import Prefixed, _prefixed_dict
 
 T = TypeVar("T")
 
@@ -127,10 +131,60 @@ def paramclass(cls: Type[T]) -> Type[T]:
         raise RuntimeError(msg)
 
     cls.__init_subclass__ = classmethod(_brick_subclassing_)
+
+    # Being frozen, instances can compute their hash once and cache it.
+    # Wrap the dataclass-generated hashing and equality methods to do so.
+    # The cached hash is stored in each instance's private `__hash_value__` attribute,
+    # set upon the first call to `hash`, and excluded from pickled state.
+    cls.__field_hash__ = cls.__hash__
+    cls.__field_eq__ = cls.__eq__
+    cls.__hash__ = _paramclass_hash
+    cls.__eq__ = _paramclass_eq
+    cls.__getstate__ = _paramclass_getstate
+
+    # Pre-compute the details used for unique naming: the field names, and whether all are scalar
+    cls.__param_names__ = tuple(f.name for f in dataclasses.fields(cls))
+    cls.__scalar_params__ = all(_is_scalar(p.dtype) for p in params.values())
+
     # And don't forget to return it!
     return cls
 
 
+def _paramclass_hash(self) -> int:
+    """Hash param-class instance `self`. Computed once, and cached on the (frozen) instance."""
+    cached = self.__dict__.get("__hash_value__", None)
+    if cached is not None:
+        return cached
+    value = type(self).__field_hash__(self)
+    object.__setattr__(self, "__hash_value__", value)
+    return value
+
+
+def _paramclass_eq(self, other: Any) -> Any:
+    """Param-class equality.
+    Short-circuits on identity, and on mismatches between already-computed hashes.
+    Otherwise compares field-values, as does the dataclass-generated `__eq__`.
+    Note hashes are not computed here, as instances with un-hashable fields can still be compared."""
+    if self is other:
+        return True
+    if other.__class__ is not self.__class__:
+        return NotImplemented
+    lhash = self.__dict__.get("__hash_value__", None)
+    if lhash is not None:
+        rhash = other.__dict__.get("__hash_value__", None)
+        if rhash is not None and lhash != rhash:
+            return False
+    return type(self).__field_eq__(self, other)
+
+
+def _paramclass_getstate(self) -> Dict[str, Any]:
+    """Get the pickling-state of param-class instance `self`.
+    Drops its cached hash, which (e.g. for strings) is not stable across processes."""
+    state = dict(self.__dict__)
+    state.pop("__hash_value__", None)
+    return state
+
+
 def descriptions(cls: Type) -> Dict[str, str]:
     """# Get a dictionary of parameter names to descriptions for `cls`
     Available both as a free function and as a `classmethod` of each `paramclass`.
@@ -203,25 +257,24 @@ class Param:
 
 
 def _unique_name(params: Any) -> str:
-    """Create a unique name for parameter-class instance `params`"""
+    """Create a unique name for parameter-class instance `params`.
+    Cached on `params`, which as a (frozen) `paramclass` instance, cannot change."""
     if not isparamclass(params):
         raise RuntimeError(f"Invalid parameter-class instance {params}")
 
-    # Determine whether *all* fields of `params` are scalar values: strings, numbers, and options thereof
-    scalars = [
-        str,
-        int,
-        float,
-        type(None),
-        Optional[str],
-        Optional[int],
-        Optional[float],
-    ]
-    # Boolean indication of whether *all* param-datatypes are from among these
-    all_scalar = all([param.dtype in scalars for param in params.__params__.values()])
-
-    # If all params are scalars, create a readable string of their values
-    if all_scalar:
+    cached = params.__dict__.get("__unique_name__", None)
+    if cached is not None:
+        return cached
+    name = _make_unique_name(params)
+    object.__setattr__(params, "__unique_name__", name)
+    return name
+
+
+def _make_unique_name(params: Any) -> str:
+    """Inner implementation of `_unique_name`, sans caching"""
+
+    # If *all* fields of `params` are scalar values - strings, numbers, and options thereof - create a readable string of their values
+    if type(params).__scalar_params__:
         # Format: `pname1=pval1 pname2=pval2 pname3=pval3`
         keys = params.__params__.keys()
         name = " ".join(f"{k}={str(getattr(params, k))}" for k in keys)
@@ -233,15 +286,12 @@ def _unique_name(params: Any) -> str:
 
     # Non-scalar cases generally include nested `@paramclasses` or sequences,
     # or surpass the length-limits above. We serialize and hash them.
-    # Preferably serialize as JSON
-    jsonstr = json.dumps(params, indent=4, default=hdl21_naming_encoder)
-    data = bytes(jsonstr, encoding="utf-8")
-
-    # If JSON encoding fails, we *could* use pickle instead.
-    # Disabled for now, because pickle is not guaranteed to be deterministic.
+    # The serialization is (and must remain) identical to `json.dumps(params, indent=4, default=hdl21_naming_encoder)`,
+    # so that names are stable across versions. `_NamingEncoder` just produces it much faster.
+    #
     # Note JSON is preferable for its run-to-run stability,
-    # where pickle can generally serialize more types.
-    # data = pickle.dumps(params)
+    # where pickle can generally serialize more types, but is not guaranteed to be deterministic.
+    data = bytes(_NamingEncoder().encode(params), encoding="utf-8")
 
     # Take that data and hash it
     # Note the "not used for security" option ensures consistent hashing between runs/ Python-processes
@@ -251,6 +301,158 @@ def _unique_name(params: Any) -> str:
     return h.hexdigest()
 
 
+# The scalar parameter-types, which `_unique_name` renders as readable strings
+_scalars = (
+    str,
+    int,
+    float,
+    type(None),
+    Optional[str],
+    Optional[int],
+    Optional[float],
+)
+
+
+def _is_scalar(dtype: Any) -> bool:
+    """Boolean indication of whether `dtype` is among the scalar parameter-types"""
+    try:
+        return dtype in _scalars
+    except TypeError:
+        return False  # Not comparable, e.g. some generic aliases
+
+
+class _NamingEncoder:
+    """
+    # Naming Encoder
+
+    Streaming JSON encoder for `_unique_name`.
+    Produces text identical to `json.dumps(obj, indent=4, default=hdl21_naming_encoder)`,
+    skipping the (pure-Python, generator-based) machinery of the standard library's indenting encoder.
+
+    The encoding of each nested `paramclass` instance is cached on it, un-indented, and re-indented upon re-use.
+    (JSON strings never include raw newlines, so re-indenting is a simple replacement.)
+    """
+
+    def __init__(self):
+        self.chunks: List[str] = list()
+
+    def encode(self, obj: Any) -> str:
+        self.chunks.clear()
+        self.value(obj, 0)
+        return "".join(self.chunks)
+
+    def value(self, obj: Any, level: int) -> None:
+        """Encode `obj`, at indentation-level `level`"""
+        write = self.chunks.append
+        # Note the order of these checks matches that of `json.JSONEncoder`
+        if isinstance(obj, str):
+            write(_encode_str(obj))
+        elif obj is None:
+            write("null")
+        elif obj is True:
+            write("true")
+        elif obj is False:
+            write("false")
+        elif isinstance(obj, int):
+            write(int.__repr__(obj))
+        elif isinstance(obj, float):
+            write(_floatstr(obj))
+        elif isinstance(obj, (list, tuple)):
+            self.list(obj, level)
+        elif isinstance(obj, dict):
+            self.dict(obj.items(), level)
+        elif getattr(type(obj), "__paramclass__", False):
+            self.paramclass(obj, level)
+        elif isinstance(obj, _pydantic_encoded):
+            # Common non-Hdl21 types, which `hdl21_naming_encoder` hands off to pydantic
+            self.value(pydantic_json_encoder(obj), level)
+        else:
+            self.value(hdl21_naming_encoder(obj), level)
+
+    def paramclass(self, obj: Any, level: int) -> None:
+        """Encode `paramclass` instance `obj`, using and updating its cached encoding"""
+        text = obj.__dict__.get("__naming_json__", None)
+        if text is None:
+            inner = _NamingEncoder()
+            names = type(obj).__param_names__
+            inner.dict(((name, getattr(obj, name)) for name in names), 0, len(names))
+            text = "".join(inner.chunks)
+            object.__setattr__(obj, "__naming_json__", text)
+        if level:
+            text = text.replace("\n", "\n" + "    " * level)
+        self.chunks.append(text)
+
+    def list(self, obj: Union[list, tuple], level: int) -> None:
+        if not obj:
+            self.chunks.append("[]")
+            return
+        write = self.chunks.append
+        level += 1
+        newline = "\n" + "    " * level
+        write("[" + newline)
+        first = True
+        for item in obj:
+            if not first:
+                write("," + newline)
+            first = False
+            self.value(item, level)
+        write("\n" + "    " * (level - 1) + "]")
+
+    def dict(self, items: Iterable, level: int, num: Optional[int] = None) -> None:
+        if num is None:
+            items = list(items)
+            num = len(items)
+        if not num:
+            self.chunks.append("{}")
+            return
+        write = self.chunks.append
+        level += 1
+        newline = "\n" + "    " * level
+        write("{" + newline)
+        first = True
+        for key, val in items:
+            if not first:
+                write("," + newline)
+            first = False
+            write(_encode_str(_keystr(key)) + ": ")
+            self.value(val, level)
+        write("\n" + "    " * (level - 1) + "}")
+
+
+# Types which `hdl21_naming_encoder` passes directly to `pydantic_json_encoder`
+_pydantic_encoded = (Decimal, Enum, pydantic.BaseModel)
+
+
+def _floatstr(f: float) -> str:
+    """Encode float `f`, as does `json`"""
+    if f != f:
+        return "NaN"
+    if f == float("inf"):
+        return "Infinity"
+    if f == -float("inf"):
+        return "-Infinity"
+    return float.__repr__(f)
+
+
+def _keystr(key: Any) -> str:
+    """Convert dictionary-key `key` to a string, as does `json`"""
+    if isinstance(key, str):
+        return key
+    if isinstance(key, float):
+        return _floatstr(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, not {key.__class__.__name__}"
+    )
+
+
 def hdl21_naming_encoder(obj: Any) -> Any:
     """JSON encoder for naming of Hdl21 parameter-values.
 
@@ -286,6 +488,11 @@ def hdl21_naming_encoder(obj: Any) -> Any:
         # Mix the qualified class names/paths with the parameters
         return module_qualname(obj.module) + _unique_name(obj.params)
 
+    if isinstance(obj, Prefixed):
+        # Encode as a dictionary of its fields, as `pydantic` did when `Prefixed` was a `BaseModel`.
+        # This keeps unique names unchanged.
+        return _prefixed_dict(obj)
+
     # Dataclasses also require custom handling, as the default encoder deep-copies them,
     # often invoking methods not supported on several Hdl21 types.
     # Convert to (shallow) dictionaries instead.
@@ -1,7 +1,8 @@
 # Std-Lib imports
-from typing import Set, Union, Optional
+from typing import Union, Optional
 
 # Local imports
+from .attrmagic import lazy_slots
 from .datatype import datatype, AllowArbConfig
 from .connect import connectable
 from .sliceable import sliceable
@@ -9,6 +10,7 @@ from .concat import concatable
 from .instance import _Instance
 
 
+@lazy_slots(_connected_ports=set, _slices=set, _concats=set)
 @concatable
 @sliceable
 @connectable
@@ -36,10 +38,9 @@ class PortRef:
 
     def __post_init__(self):
         # Inner management data
-        self._connected_ports: Set[PortRef] = set()
+        # Back-references `_connected_ports`, `_slices` and `_concats` are left unset, and created upon first use.
+        # Most PortRefs, e.g. those made for each Instance connection, never need them.
         self.resolved: Union[None, "Signal", "BundleInstance"] = None
-        self._slices: Set["Slice"] = set()
-        self._concats: Set["Concat"] = set()
         self._width: Optional[int] = None
 
     def __eq__(self, other) -> bool:
@@ -16,9 +16,9 @@ with the multiplication operator, to construct values such as `11 * e(-21)`.
 """
 
 from enum import Enum
+from bisect import bisect_left, bisect_right
 from decimal import Decimal
-from typing import Optional, Any, Union, Tuple
-from pydantic import BaseModel, Field
+from typing import Optional, Any, Union, Tuple, Dict
 from pydantic.dataclasses import dataclass
 
 
@@ -61,7 +61,14 @@ class Prefix(Enum):
 
     @classmethod
     def closest(cls, exp: Any) -> Optional["Prefix"]:
-        return min(cls.__members__.values(), key=lambda x: abs(x.value - exp))
+        """Get the prefix closest to exponent `exp`. Ties go to the smaller prefix."""
+        idx = bisect_left(_PREFIX_VALUES, exp)
+        if idx == 0:
+            return _PREFIXES[0]
+        if idx == len(_PREFIXES):
+            return _PREFIXES[-1]
+        lo, hi = _PREFIXES[idx - 1], _PREFIXES[idx]
+        return hi if hi.value - exp < exp - lo.value else lo
 
     def __mul__(self, other: Any):
 
@@ -80,7 +87,7 @@ class Prefix(Enum):
 
         if isinstance(other, (Decimal, float, int, str)):
             # The usual use-case, e.g. `5 * µ`
-            return Prefixed(number=other, prefix=self)
+            return _interned(other, self)
 
         if isinstance(other, Prefixed):
             # Prefixed times Prefix, e.g. `(5 * n) * G`
@@ -91,7 +98,7 @@ class Prefix(Enum):
             new_num = other.number * Decimal(10) ** (targ - exptemp.symbol.value)
 
             # And create a corresponding `Prefixed`
-            return Prefixed.new(new_num, exptemp.symbol)
+            return _new(new_num, exptemp.symbol)
 
         return NotImplemented
 
@@ -128,6 +135,42 @@ class Prefix(Enum):
         return str(Decimal(10) ** self.value)
 
 
+# All `Prefix`es, in order of definition, which is increasing order of their values
+_PREFIXES: Tuple[Prefix, ...] = tuple(Prefix)
+_PREFIX_VALUES: Tuple[int, ...] = tuple(p.value for p in _PREFIXES)
+
+# Square root of ten, to more digits than any `Prefixed` number generally has
+_SQRT10 = Decimal("3.16227766016837933199889354443271853371955513932521682685750485")
+
+
+def _closest_to(number: Decimal, prefix: Prefix) -> Prefix:
+    """Get the `Prefix` closest to the power-of-ten exponent of `number * prefix`.
+    Equivalent to `Prefix.closest(abs(number).log10() + prefix.value)`, without computing the logarithm."""
+
+    if not number:
+        return _PREFIXES[0]  # The `log10` of zero is -Infinity
+
+    # The integer part of the exponent, exactly
+    mag = abs(number)
+    floor = mag.adjusted() + prefix.value
+
+    # Find the prefixes on either side of it
+    idx = bisect_right(_PREFIX_VALUES, floor)
+    if idx == 0:
+        return _PREFIXES[0]
+    lo = _PREFIXES[idx - 1]
+    if idx == len(_PREFIXES):
+        return lo
+    hi = _PREFIXES[idx]
+
+    # The two are always an odd number apart, so their midpoint is `half + 0.5`.
+    half = (lo.value + hi.value - 1) // 2
+    if floor != half:
+        return hi if floor > half else lo
+    # The exponent is between `half` and `half + 1`. It is past the midpoint if its mantissa exceeds `sqrt(10)`.
+    return hi if mag.scaleb(-mag.adjusted()) > _SQRT10 else lo
+
+
 """
 # Note on Numeric Types 
 
@@ -162,71 +205,153 @@ So: all `Decimal`, all `pydantic.dataclasses`.
 """
 
 
-class Prefixed(BaseModel):
+class Prefixed:
     """
     # Prefixed
 
     Combination of a literal value and a unit-indicating prefix.
     Colloquially, the numbers in expressions like "5ns", "11MV", and "1µA"
     are represented as `Prefixed`.
+
+    `Prefixed` numbers are immutable. Their float-conversions and hashes are computed once, and cached.
+    Construction via `Prefixed(number=..., prefix=...)` converts and validates its arguments,
+    as does use as a field of `pydantic` types, e.g. `paramclass`es.
+    The results of arithmetic on `Prefixed` numbers are created without re-validation.
+
+    Comparisons round each number to `EPSILON` decimal places of the larger of its own prefix
+    and its closest prefix, i.e. that chosen by `scale()`, and compare the results exactly.
+    Hashes use the same rounded values, so that equal numbers hash equally, e.g. `1000*m` and `1*UNIT`.
     """
 
+    __slots__ = ("number", "prefix", "_float", "_value", "_hash")
+
     # Numeric Portion. See the long note above.
     number: Decimal
     # Enumerated SI Prefix. Defaults to unity.
-    prefix: Prefix = Field(default=Prefix.UNIT)
+    prefix: Prefix
+
+    def __init__(self, number: "ToPrefixed", prefix: Prefix = Prefix.UNIT):
+        _setattr(self, "number", _to_decimal(number))
+        _setattr(self, "prefix", Prefix(prefix))
+        _setattr(self, "_float", None)
+        _setattr(self, "_value", None)
+        _setattr(self, "_hash", None)
 
     @classmethod
     def new(cls, number: Decimal, prefix: Prefix = Prefix.UNIT) -> "Prefixed":
         """Create a new Prefixed number.
-        Alias for `Prefixed(number=number, prefix=prefix), and a (slight) shorthand
-        for using arguments by-position, which `pydantic.BaseModel` does not support."""
+        Alias for `Prefixed(number=number, prefix=prefix)`."""
         return cls(number=number, prefix=prefix)
 
-    #
-    # FIXME: pending potential deprecation #157
-    #
-    # @classmethod
-    # def validate(cls, v: Union["Prefixed", "ToPrefixed"]) -> "Prefixed":
-    #     """Validate `v` as a `Prefixed` number, or convert to `Prefixed` if applicable.
-    #     While usable elsewhere, `validate` is primarily intended for use in type-validated
-    #     dataclass trees, such as those generated in `paramclass`es."""
-    #
-    #     return to_prefixed(v)
-    #
-    # @classmethod
-    # def __get_validators__(cls):
-    #     yield cls.validate
-
-    def __hash__(self):
-        return hash((self.number, self.prefix))
+    @classmethod
+    def validate(cls, v: Any) -> "Prefixed":
+        """Validate `v` as a `Prefixed` number, as a field of `pydantic` types.
+        Accepts `Prefixed` numbers, and dictionaries of their fields.
+        Raises `ValueError` for anything else, so that `pydantic` can try other members of union-types."""
+        if isinstance(v, Prefixed):
+            return v
+        if isinstance(v, dict):
+            try:
+                return cls(**v)
+            except TypeError as err:  # Missing or extra fields
+                raise ValueError(f"Invalid Prefixed number {v}: {err}")
+        raise ValueError(f"Invalid Prefixed number {v}")
+
+    @classmethod
+    def __get_validators__(cls):
+        # Pydantic v1 validation
+        yield cls.validate
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, _source: Any, _handler: Any) -> Any:
+        # Pydantic v2 validation, and serialization to a dictionary of our fields
+        from pydantic_core import core_schema
+
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                _prefixed_dict
+            ),
+        )
+
+    def model_dump(self, **_kwargs: Any) -> Dict[str, Any]:
+        """Convert to a dictionary of fields, as does `pydantic.BaseModel.model_dump`."""
+        return _prefixed_dict(self)
+
+    def model_copy(
+        self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False
+    ) -> "Prefixed":
+        """Copy, with any fields in `update` replaced, as does `pydantic.BaseModel.model_copy`.
+        Without `update`, returns `self`, since `Prefixed` numbers are immutable."""
+        if not update:
+            return self
+        return Prefixed(**{**_prefixed_dict(self), **update})
+
+    def __setattr__(self, key: str, _val: Any) -> None:
+        msg = f"Cannot set attribute {key}: Prefixed numbers are immutable"
+        raise AttributeError(msg)
+
+    def __delattr__(self, key: str) -> None:
+        msg = f"Cannot delete attribute {key}: Prefixed numbers are immutable"
+        raise AttributeError(msg)
+
+    def __reduce__(self):
+        return (_new, (self.number, self.prefix))
+
+    def __copy__(self) -> "Prefixed":
+        return self  # Immutable
+
+    def __deepcopy__(self, _memo) -> "Prefixed":
+        return self  # Immutable
+
+    def __hash__(self) -> int:
+        h = self._hash
+        if h is None:
+            h = hash(self._rounded())
+            _setattr(self, "_hash", h)
+        return h
+
+    def _rounded(self) -> Decimal:
+        """Get our value, rounded to `EPSILON` decimal places of the larger of our prefix and our closest prefix,
+        and scaled to unity. The basis for comparison and hashing."""
+        v = self._value
+        if v is None:
+            exp = max(self.prefix.value, _closest_to(self.number, self.prefix).value)
+            number = self.number.scaleb(self.prefix.value - exp)
+            v = _round(number).scaleb(exp)
+            _setattr(self, "_value", v)
+        return v
 
     def __int__(self) -> int:
         return int(self.number) * 10**self.prefix.value
 
     def __float__(self) -> float:
         """Convert to float"""
-        return float(self.number) * 10**self.prefix.value
+        f = self._float
+        if f is None:
+            f = float(self.number) * 10**self.prefix.value
+            _setattr(self, "_float", f)
+        return f
 
     def __neg__(self) -> "Prefixed":
-        return Prefixed.new(-self.number, self.prefix)
+        return _new(-self.number, self.prefix)
 
     def __abs__(self) -> "Prefixed":
-        return Prefixed.new(abs(self.number), self.prefix)
+        return _new(abs(self.number), self.prefix)
 
     def __mul__(self, other) -> "Prefixed":
         if isinstance(other, Prefixed):
             return (self.number * other.number * self.prefix * other.prefix).scale()
         elif not isinstance(other, (str, int, float, Decimal)):
             return NotImplemented
-        return Prefixed.new(self.number * Decimal(str(other)), self.prefix).scale()
+        return _new(self.number * _to_decimal(other), self.prefix).scale()
 
     def __rmul__(self, other) -> "Prefixed":
         if isinstance(other, Prefixed):
             return (self.number * other.number * self.prefix * other.prefix).scale()
         elif not isinstance(other, (str, int, float, Decimal)):
             return NotImplemented
-        return Prefixed.new(self.number * Decimal(str(other)), self.prefix).scale()
+        return _new(self.number * _to_decimal(other), self.prefix).scale()
 
     def __truediv__(self, other) -> "Prefixed":
         if isinstance(other, Prefixed):
@@ -260,9 +385,10 @@ class Prefixed(BaseModel):
     def __rpow__(self, other) -> "Prefixed":
         if not isinstance(other, (str, int, float, Decimal)):
             return NotImplemented
-        return Prefixed.new(
+        return _new(
             Decimal(str(other))
-            ** (self.number * (10 ** Decimal(str(self.prefix.value))))
+            ** (self.number * (10 ** Decimal(str(self.prefix.value)))),
+            Prefix.UNIT,
         )
 
     def __add__(self, other: "Prefixed") -> "Prefixed":
@@ -296,11 +422,12 @@ class Prefixed(BaseModel):
     def scale(self, prefix: Prefix = None) -> "Prefixed":
         """Scale to a new `Prefix`"""
         if isinstance(prefix, Prefix):
+            if prefix is self.prefix:
+                return self  # Already there. Note `Prefixed` numbers are immutable.
             newnum = self.number * Decimal(10) ** (self.prefix.value - prefix.value)
-            return Prefixed.new(newnum, prefix)
+            return _new(newnum, prefix)
         else:
-            newpref = Prefix.closest(abs(self.number).log10() + self.prefix.value)
-            return self.scale(newpref)
+            return self.scale(_closest_to(self.number, self.prefix))
 
     def __str__(self) -> str:
         return f"{self.number}*{self.prefix.name}"
@@ -310,33 +437,97 @@ class Prefixed(BaseModel):
 
     # Comparison operators that respect class convention
     def __lt__(self, other) -> bool:
-        lhs, rhs = _scale_to_smaller(self, other)
-        return round(lhs.number, EPSILON) < round(rhs.number, EPSILON)
+        return self._rounded() < to_prefixed(other)._rounded()
 
     def __le__(self, other) -> bool:
-        lhs, rhs = _scale_to_smaller(self, other)
-        return round(lhs.number, EPSILON) <= round(rhs.number, EPSILON)
+        return self._rounded() <= to_prefixed(other)._rounded()
 
     def __eq__(self, other) -> bool:
-        lhs, rhs = _scale_to_smaller(self, other)
-        return round(lhs.number, EPSILON) == round(rhs.number, EPSILON)
+        return self._rounded() == to_prefixed(other)._rounded()
 
     def __ne__(self, other) -> bool:
-        lhs, rhs = _scale_to_smaller(self, other)
-        return round(lhs.number, EPSILON) != round(rhs.number, EPSILON)
+        return self._rounded() != to_prefixed(other)._rounded()
 
     def __gt__(self, other) -> bool:
-        lhs, rhs = _scale_to_smaller(self, other)
-        return round(lhs.number, EPSILON) > round(rhs.number, EPSILON)
+        return self._rounded() > to_prefixed(other)._rounded()
 
     def __ge__(self, other) -> bool:
-        lhs, rhs = _scale_to_smaller(self, other)
-        return round(lhs.number, EPSILON) >= round(rhs.number, EPSILON)
+        return self._rounded() >= to_prefixed(other)._rounded()
 
 
 # Union of the types which can be converted to `Prefixed`
 ToPrefixed = Union[int, float, str, Decimal]
 
+# Set attributes on our immutable types
+_setattr = object.__setattr__
+
+
+def _new(number: Decimal, prefix: Prefix) -> Prefixed:
+    """Create a `Prefixed` from known-valid `number` and `prefix`, without conversion or validation.
+    Used for the results of internal arithmetic."""
+    rv = object.__new__(Prefixed)
+    _setattr(rv, "number", number)
+    _setattr(rv, "prefix", prefix)
+    _setattr(rv, "_float", None)
+    _setattr(rv, "_value", None)
+    _setattr(rv, "_hash", None)
+    return rv
+
+
+def _round(number: Decimal) -> Decimal:
+    """Round `number` to `EPSILON` decimal places.
+    Numbers with no more than that many are returned as-is, rather than padded with zeros."""
+    if number.as_tuple().exponent >= -EPSILON:
+        return number
+    return round(number, EPSILON)
+
+
+def _to_decimal(v: Any) -> Decimal:
+    """Convert `v` to a finite `Decimal`, as does `pydantic` validation of `Decimal` fields.
+    Notably floats are converted via their string representation."""
+    if isinstance(v, Decimal):
+        d = v
+    elif isinstance(v, bool):
+        raise ValueError(f"Invalid Prefixed number {v}")
+    elif isinstance(v, int):
+        return Decimal(v)
+    elif isinstance(v, float):
+        d = Decimal(str(v))
+    elif isinstance(v, str):
+        try:
+            d = Decimal(v.strip())
+        except ArithmeticError:
+            raise ValueError(f"Invalid Prefixed number {v}")
+    else:
+        raise ValueError(f"Invalid Prefixed number {v}")
+    if not d.is_finite():
+        raise ValueError(f"Invalid non-finite Prefixed number {v}")
+    return d
+
+
+# Interned `Prefixed` numbers, keyed by (integer number, prefix).
+# Expressions such as `1 * µ` return a shared instance.
+_interned_cache: Dict[Tuple[int, Prefix], Prefixed] = dict()
+_MAX_INTERNED = 4096
+
+
+def _interned(number: ToPrefixed, prefix: Prefix) -> Prefixed:
+    """Get the `Prefixed` for `number * prefix`. Integer-valued numbers are interned, up to a limit."""
+    if type(number) is not int:
+        return Prefixed(number=number, prefix=prefix)
+    key = (number, prefix)
+    rv = _interned_cache.get(key, None)
+    if rv is None:
+        rv = Prefixed(number=number, prefix=prefix)
+        if len(_interned_cache) < _MAX_INTERNED:
+            _interned_cache[key] = rv
+    return rv
+
+
+def _prefixed_dict(pref: Prefixed) -> Dict[str, Any]:
+    """Convert to a dictionary of fields, e.g. for serialization"""
+    return {"number": pref.number, "prefix": pref.prefix}
+
 
 def to_prefixed(v: Union[Prefixed, ToPrefixed]) -> Prefixed:
     """Convert any convertible type to a `Prefixed` number."""
@@ -358,41 +549,23 @@ def to_prefixed(v: Union[Prefixed, ToPrefixed]) -> Prefixed:
 def _add(lhs: Prefixed, rhs: Prefixed) -> Prefixed:
     """`Prefixed` Addition"""
     if lhs.prefix == rhs.prefix:
-        return Prefixed.new(lhs.number + rhs.number, lhs.prefix)
+        return _new(lhs.number + rhs.number, lhs.prefix)
 
     # Different prefix values. Scale to the smaller of the two
     smaller = lhs.prefix if lhs.prefix.value < rhs.prefix.value else rhs.prefix
     newnum = lhs.scale(smaller).number + rhs.scale(smaller).number
-    return Prefixed.new(newnum, smaller)
+    return _new(newnum, smaller)
 
 
 def _subtract(lhs: Prefixed, rhs: Prefixed) -> Prefixed:
     """`Prefixed` Subtraction"""
     if lhs.prefix == rhs.prefix:
-        return Prefixed.new(lhs.number - rhs.number, lhs.prefix)
+        return _new(lhs.number - rhs.number, lhs.prefix)
 
     # Different prefix values. Scale to the smaller of the two
     smaller = lhs.prefix if lhs.prefix.value < rhs.prefix.value else rhs.prefix
     newnum = lhs.scale(smaller).number - rhs.scale(smaller).number
-    return Prefixed.new(newnum, smaller)
-
-
-def _scale_to_smaller(
-    me: Prefixed, other: Union[Prefixed, ToPrefixed]
-) -> Tuple[Prefixed, Prefixed]:
-    """# Scale two `Prefixed` numbers to the smaller of the two prefixes.
-    The `me` argument is always a `Prefixed`, generally due to being the `self` in a `Prefixed` mthod.
-    The `other` argument is commonly another compatible/ convertible type,
-    and is converted before scaling."""
-
-    other = to_prefixed(other)
-    smaller = (
-        me.prefix
-        if me.number * Decimal(10**me.prefix.value)
-        < other.number * Decimal(10**other.prefix.value)
-        else other.prefix
-    )
-    return me.scale(smaller), other.scale(smaller)
+    return _new(newnum, smaller)
 
 
 # Common prefixes as single-character identifiers, and exposed in the module namespace.
@@ -453,9 +626,7 @@ class Exponent:
             )
 
         elif isinstance(other, (str, int, float, Decimal)):
-            return Prefixed.new(
-                Decimal(str(other)) * Decimal(10) ** self.residual, self.symbol
-            )
+            return _new(_to_decimal(other) * Decimal(10) ** self.residual, self.symbol)
 
         return NotImplemented
 
@@ -464,9 +635,9 @@ class Exponent:
         if isinstance(other, (str, int, float, Decimal)):
             # 16 * Exponent(Symbol.UNIT,0.25) == 2 * Prefix.UNIT
 
-            out_number = Decimal(str(other)) * Decimal(10) ** self.residual
+            out_number = _to_decimal(other) * Decimal(10) ** self.residual
 
-            return Prefixed.new(out_number, self.symbol)
+            return _new(out_number, self.symbol)
 
         elif isinstance(other, Prefixed):
             # 2 * Prefix.UNIT * Exponent(Symbol.KILO,0) == 2 * Prefix.KILO
@@ -5,3 +5,4 @@ from vlsir.circuit_pb2 import Package
 
 from .exporting import *
 from .importing import *
+from .parallel import *
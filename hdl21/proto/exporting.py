@@ -14,7 +14,7 @@ free-standing functions to enable use elsewhere.
 from decimal import Decimal
 from dataclasses import fields
 from enum import Enum
-from typing import Optional, List, Union, Dict, Any
+from typing import Optional, List, Union, Dict, Any, Iterator, Set
 
 # Local imports
 # Proto-definitions
@@ -31,10 +31,11 @@ from ..elab import Elaboratables, elaborate
 from ..module import Module
 from ..qualname import qualname as module_qualname
 from ..external_module import ExternalModule, ExternalModuleCall
-from ..instance import Instance
+from ..instance import Instance, InstanceArray
 from ..signal import Signal, Port, PortDir
 from ..slice import Slice
 from ..concat import Concat
+from ..elab.passes.slices import Run, resolve_runs, select_runs
 from ..primitives import (
     PrimitiveCall,
     PrimitiveType,
@@ -45,9 +46,17 @@ from ..primitives import (
 def to_proto(
     top: Elaboratables,
     domain: Optional[str] = None,
+    workers: Optional[int] = None,
     **kwargs,
 ) -> vckt.Package:
-    """Convert Elaborate-able Module or Generator `top` and its dependencies to a Proto-format `Package`."""
+    """Convert Elaborate-able Module or Generator `top` and its dependencies to a Proto-format `Package`.
+    If `workers` is specified, independent sub-hierarchies are elaborated in parallel, in up to `workers` processes.
+    See `hdl21.proto.parallel`."""
+    if workers is not None:
+        from .parallel import to_proto_parallel
+
+        return to_proto_parallel(top, domain=domain, workers=workers)
+
     # Elaborate all the top-level Modules
     tops = elaborate(top)
     if not isinstance(tops, list):
@@ -141,6 +150,12 @@ class ProtoExporter:
             pinst = self.export_instance(inst)
             pmod.instances.append(pinst)
 
+        # Expand any compact InstanceArrays into their elements
+        if module.instarrays:
+            avoid = set(module.namespace.keys())
+            for array in module.instarrays.values():
+                pmod.instances.extend(self.export_instance_array(array, avoid))
+
         # Create the Module's `literal`s
         for literal in module.literals:
             pmod.literals.append(export_literal(literal))
@@ -170,6 +185,74 @@ class ProtoExporter:
         Depth-first retrieves a Module definition first,
         using its generated `name` field as the Instance's `module` pointer."""
 
+        # Create the Proto-Instance, with its target and parameters
+        pinst = self.export_instance_target(inst)
+
+        # Create its connections mapping
+        for pname, conn in inst.conns.items():
+            # Assign each item into the connections dict.
+            # The proto interface requires copying it along the way
+            pconn = vckt.Connection(
+                portname=pname, target=export_connection_target(conn)
+            )
+            pinst.connections.append(pconn)
+
+        return pinst
+
+    def export_instance_array(
+        self, array: InstanceArray, avoid: Set[str]
+    ) -> Iterator[vckt.Instance]:
+        """Export a compact `InstanceArray`, expanding it into one Proto-Instance per element.
+        Element names match those produced by array-flattening, avoiding those in `avoid`, to which each is added.
+        Connections are produced from the array's `ArrayConnRule`s, without creating any intermediate Hdl21 objects."""
+
+        if array._conn_rules is None:
+            msg = f"Invalid InstanceArray {array.name} for export. Arrays must be elaborated with `compact_arrays`."
+            raise RuntimeError(msg)
+
+        # Export the target and its parameters once, and copy them into each element
+        template = self.export_instance_target(array)
+
+        # Export each broadcast connection once, and resolve each sliced connection into runs of bits
+        broadcasts: Dict[str, vckt.ConnectionTarget] = dict()
+        sliced = dict()
+        for pname, conn in array.conns.items():
+            rule = array._conn_rules[pname]
+            if rule.broadcast:
+                broadcasts[pname] = export_connection_target(conn)
+            else:
+                sliced[pname] = (rule.width, resolve_runs(conn))
+
+        for k in range(array.n):
+            # Create a unique name
+            name = f"{array.name}_{k}"
+            while name in avoid:
+                name += "_"
+            avoid.add(name)
+
+            pinst = vckt.Instance()
+            pinst.CopyFrom(template)
+            pinst.name = name
+
+            for pname in array.conns.keys():
+                if pname in broadcasts:
+                    target = broadcasts[pname]
+                else:
+                    width, runs = sliced[pname]
+                    bits = range(k * width, (k + 1) * width)
+                    target = export_runs(select_runs(runs, bits))
+                pconn = pinst.connections.add()
+                pconn.portname = pname
+                pconn.target.CopyFrom(target)
+
+            yield pinst
+
+    def export_instance_target(
+        self, inst: Union[Instance, InstanceArray]
+    ) -> vckt.Instance:
+        """Create a Proto-Instance with the name, target, and parameters of `inst`, but no connections.
+        Exports the target Module or ExternalModule, if not already done."""
+
         # Create the Proto-Instance
         pinst = vckt.Instance(name=inst.name)
 
@@ -236,15 +319,6 @@ class ProtoExporter:
         else:
             raise TypeError(f"Un-exportable Instance {inst} of {inst.of}")
 
-        # Create its connections mapping
-        for pname, conn in inst.conns.items():
-            # Assign each item into the connections dict.
-            # The proto interface requires copying it along the way
-            pconn = vckt.Connection(
-                portname=pname, target=export_connection_target(conn)
-            )
-            pinst.connections.append(pconn)
-
         return pinst
 
 
@@ -289,6 +363,28 @@ def export_connection_target(
     return pconn
 
 
+def export_runs(runs: List[Run]) -> vckt.ConnectionTarget:
+    """Export a list of bit-`Run`s, as produced by slice-resolution.
+    Each unit-step run becomes a Signal or Slice. Runs with other steps are split into single bits."""
+
+    parts = []
+    for run in runs:
+        sig = run.signal
+        if run.step == 1 and run.lo == 0 and run.hi == sig.width:
+            parts.append(vckt.ConnectionTarget(sig=sig.name))
+        elif run.step == 1:
+            pslice = vckt.Slice(signal=sig.name, top=run.hi - 1, bot=run.lo)
+            parts.append(vckt.ConnectionTarget(slice=pslice))
+        else:
+            for bit in range(run.lo, run.hi, run.step):
+                pslice = vckt.Slice(signal=sig.name, top=bit, bot=bit)
+                parts.append(vckt.ConnectionTarget(slice=pslice))
+
+    if len(parts) == 1:
+        return parts[0]
+    return vckt.ConnectionTarget(concat=vckt.Concat(parts=parts))
+
+
 def export_slice(slize: Slice) -> vckt.Slice:
     """Export a signal-`Slice`.
     Fails if the parent is not a concrete `Signal`, i.e. it is a `Concat` or another `Slice`.
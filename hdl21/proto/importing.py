@@ -19,6 +19,7 @@ from ..signal import Signal, PortDir, Visibility
 from ..slice import Slice
 from ..concat import Concat
 from ..literal import Literal
+from ..datatype import construct
 from .. import primitives
 from ..primitives import Primitive, Vpulse
 
@@ -309,7 +310,7 @@ def import_connection_target(
     if stype == "slice":
         start = pconn.slice.bot
         stop = pconn.slice.top + 1  # Move to Python-style exclusive indexing
-        sig = Slice(parent=sig, index=slice(start, stop))
+        sig = construct(Slice, parent=sig, index=slice(start, stop))
     return sig
 
 
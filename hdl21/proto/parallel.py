@@ -0,0 +1,163 @@
+"""
+# Parallel Elaboration and Export
+
+Elaborates independent sub-hierarchies in worker processes, and stitches their results into a single `Package`.
+
+The hierarchy under the top-level Modules is split by `hdl21.elab.helpers.partition`:
+* Modules shared between sub-hierarchies are elaborated first, in this process.
+* Each independent sub-hierarchy is elaborated and exported to VLSIR in a worker process.
+  Workers are forked from this process, and so inherit its in-memory Modules, including those produced by generators.
+  Their results are returned as serialized `Package`s.
+* The tops are then elaborated in this process, treating the sub-hierarchy roots as already elaborated,
+  and exported alongside the workers' results.
+
+Note the worker processes' elaboration results do not come back to this process' in-memory Modules.
+After a parallel export, the tops and common Modules are elaborated, while the sub-hierarchies are not.
+A later (serial) `elaborate` or `to_proto` re-elaborates the latter, and the tops.
+"""
+
+# Std-Lib Imports
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+# Local imports
+import vlsir.circuit_pb2 as vckt
+
+from ..module import Module
+from ..qualname import qualname
+from ..elab import Elaboratables, elaborate, get_elaborator
+from ..elab.helpers.partition import partition
+from ..elab.helpers.dirty import find_dirty
+from .exporting import ProtoExporter, ModuleMapping
+
+
+def to_proto_parallel(
+    top: Elaboratables,
+    domain: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> vckt.Package:
+    """Elaborate and export `top` to a Proto-format `Package`, using up to `workers` processes.
+    The number of `workers` defaults to the number of CPUs.
+
+    Produces the same Module definitions as `to_proto`, although potentially in a different (dependency-respecting) order.
+    Falls back to `to_proto`-style serial export if the hierarchy does not split into more than one independent sub-hierarchy,
+    or if the platform does not support forking worker processes."""
+
+    # Run any lazy generator calls first, so that partitioning sees the complete hierarchy
+    tops, dirty = find_dirty(top if isinstance(top, list) else [top])
+    modules = [t for t in tops if isinstance(t, Module)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    part = partition(modules, dirty)
+    forkable = "fork" in multiprocessing.get_all_start_methods()
+    if workers < 2 or len(part.roots) < 2 or not forkable:
+        exporter = ProtoExporter(tops=_elaborated(tops), domain=domain)
+        return exporter.export()
+
+    # Elaborate the shared Modules first, so each worker inherits them already elaborated.
+    if part.common:
+        elaborate(part.common)
+
+    # Elaborate and export each sub-hierarchy in a worker process
+    ctx = multiprocessing.get_context("fork")
+    num = min(workers, len(part.roots))
+    with ProcessPoolExecutor(
+        max_workers=num,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(part.roots,),
+    ) as pool:
+        results = list(
+            pool.map(_export_root, range(len(part.roots)), [domain] * len(part.roots))
+        )
+    packages = [vckt.Package.FromString(r) for r in results]
+
+    # Elaborate the tops, skipping the sub-hierarchies done by the workers
+    delegated = set(part.roots)
+    elaborated = get_elaborator().elaborate(tops, delegated=delegated)
+
+    # And export them, referring to the workers' definitions of each sub-hierarchy root
+    exporter = ProtoExporter(
+        tops=[t for t in elaborated if isinstance(t, Module)], domain=domain
+    )
+    for root, pkg in zip(part.roots, packages):
+        name = qualname(root)
+        pmod = next(m for m in pkg.modules if m.name == name)
+        mapping = ModuleMapping(root, pmod)
+        exporter.modules_by_id[id(root)] = mapping
+        exporter.modules_by_name[name] = mapping
+    packages.append(exporter.export())
+
+    return merge_packages(packages, domain=domain)
+
+
+def merge_packages(
+    packages: List[vckt.Package], domain: Optional[str] = None
+) -> vckt.Package:
+    """Merge `packages` into a single `Package`, in order.
+    Each is expected to be in dependency order, and to only depend on itself and those before it.
+
+    Definitions which appear in more than one package, e.g. of Modules shared between sub-hierarchies, are included once.
+    Such repeated definitions must be identical. Differing definitions with the same name produce a `RuntimeError`."""
+
+    result = vckt.Package(domain=domain or "")
+    modules: Dict[str, vckt.Module] = dict()
+    ext_modules: Dict[tuple, vckt.ExternalModule] = dict()
+
+    for pkg in packages:
+        for emod in pkg.ext_modules:
+            key = (emod.name.domain, emod.name.name)
+            prior = ext_modules.get(key, None)
+            if prior is None:
+                ext_modules[key] = emod
+                result.ext_modules.append(emod)
+            elif prior != emod:
+                msg = f"Cannot merge conflicting definitions of ExternalModule {emod.name.name}"
+                raise RuntimeError(msg)
+
+        for pmod in pkg.modules:
+            prior = modules.get(pmod.name, None)
+            if prior is None:
+                modules[pmod.name] = pmod
+                result.modules.append(pmod)
+            elif prior != pmod:
+                msg = f"Cannot serialize Module {pmod.name} due to conflicting definitions in separate sub-hierarchies. \n"
+                msg += "(Was this a generator that didn't get decorated with `@hdl21.generator`?) "
+                raise RuntimeError(msg)
+
+    return result
+
+
+def _elaborated(top: Elaboratables) -> List[Module]:
+    """Elaborate `top`, and return the resulting list of Modules"""
+    tops = elaborate(top)
+    if not isinstance(tops, list):
+        tops = [tops]
+    return tops
+
+
+"""
+# Worker-Process State and Functions
+Sub-hierarchy roots are handed to each worker upon its (forked) creation, and are referred to by index from then on.
+"""
+
+_worker_roots: List[Module] = list()
+
+
+def _init_worker(roots: List[Module]) -> None:
+    """Worker-process initializer. Store the sub-hierarchy roots."""
+    global _worker_roots
+    _worker_roots = roots
+
+
+def _export_root(index: int, domain: Optional[str]) -> bytes:
+    """Elaborate and export sub-hierarchy root number `index`, returning its serialized `Package`."""
+    root = _worker_roots[index]
+    exporter = ProtoExporter(tops=[elaborate(root)], domain=domain)
+    return exporter.export().SerializeToString()
+
+
+__all__ = ["to_proto_parallel", "merge_packages"]
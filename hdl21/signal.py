@@ -33,6 +33,7 @@ from .connect import connectable
 from .sliceable import sliceable
 from .concat import concatable
 from .props import Properties
+from .attrmagic import lazy
 
 
 class PortDir(Enum):
@@ -106,18 +107,22 @@ class Signal:
     related_gnd: Optional["Signal"] = field(repr=False, default=None)
     # Related ground signal
 
+    # Back-references, to slices, concatenations, and connected ports.
+    # Created upon first use; most Signals never need them all.
+    # Note these are not annotated, so that they are not dataclass fields.
+    _slices = lazy(set)  # Set[Slice]
+    _concats = lazy(set)  # Set[Concat]
+    _connected_ports = lazy(set)  # Set[PortRef]
+
+    # Back-references to related signals
+    _related_clk_of = lazy(set)  # Set[Signal]
+    _related_pwr_of = lazy(set)  # Set[Signal]
+    _related_gnd_of = lazy(set)  # Set[Signal]
+
     def __post_init__(self):
         if self.width < 1:
             raise ValueError(f"Signal {self.name} width must be positive")
         self._parent_module: Optional["Module"] = None
-        self._slices: Set["Slice"] = set()
-        self._concats: Set["Concat"] = set()
-        self._connected_ports: Set["PortRef"] = set()
-
-        # Back-references to related signals
-        self._related_clk_of: Set["Signal"] = set()
-        self._related_pwr_of: Set["Signal"] = set()
-        self._related_gnd_of: Set["Signal"] = set()
 
         # Add those back-references to signals *we* relate to.
         # Note this only happens at construction-time.
@@ -260,9 +265,12 @@ def _pluralize(fn: Callable):
 """
 
 
-def _copy_to_internal(sig: Signal) -> Signal:
-    """Make a copy of `sig`, replacing its visibility and port-direction to be internal."""
+def _copy_to_internal(sig: Signal, name: Optional[str] = None) -> Signal:
+    """Make a copy of `sig`, replacing its visibility and port-direction to be internal.
+    Renames the copy to `name`, if provided."""
     sig = copy(sig)
+    if name is not None:
+        sig.name = name
     sig.vis = Visibility.INTERNAL
     sig.direction = PortDir.NONE
     sig._parent_module = None
@@ -4,14 +4,14 @@
 References by numeric index into Signals and other Connectable types.
 """
 
-from typing import Optional, Union, Any, Set
-from weakref import WeakSet
+from typing import Optional, Union, Any
 
 # Local imports
 from .datatype import datatype, AllowArbConfig
 from .connect import connectable
 from .sliceable import sliceable, is_sliceable
 from .concat import concatable
+from .attrmagic import lazy
 
 
 @sliceable
@@ -43,13 +43,15 @@ class Slice:
     # Python index, i.e. that passed to square brackets
     index: Union[int, slice]
 
+    # Back-references, created upon first use. Not annotated, so that they are not dataclass fields.
+    _connected_ports = lazy(set)  # Set[PortRef]
+    _slices = lazy(set)  # Set[Slice]
+    _concats = lazy(set)  # Set[Concat]
+
     def __post_init__(self):
         if not is_sliceable(self.parent):
             raise TypeError(f"{self.parent} is not Sliceable")
-        self._connected_ports: Set["PortRef"] = set()
         self._inner: Optional[SliceInner] = None
-        self._slices: WeakSet[Slice] = set()
-        self._concats: WeakSet["Concat"] = set()
 
     @property
     def top(self) -> int:
@@ -90,6 +92,8 @@ class SliceInner:
     step: int  # Python-convention step size
     width: int
 
+    __slots__ = ("top", "bot", "step", "width")
+
 
 def _slice_inner(slize: Slice) -> SliceInner:
     """Calculate the inner resolved fields for `slize`"""
@@ -114,42 +118,29 @@ def _slice_inner(slize: Slice) -> SliceInner:
         step = 1 if step is None else step
         if step == 0:
             raise ValueError(f"slice step cannot be zero")
-        elif step < 0:
-            # Here `top` gets a "+1" since `start` is *inclusive*, while `bot` gets "+1" as `stop` is *exclusive*.
-            top = (
-                parent.width
-                if start is None
-                else start + 1
-                if start >= 0
-                else parent.width + start + 1
-            )
-            bot = (
-                0
-                if stop is None
-                else stop + 1
-                if stop >= 0
-                else parent.width + stop + 1
-            )
-            # Align bot with the step
-            bot += (top - bot) % abs(step)
+
+        # Resolve the selected indices as Python does for sequences.
+        if start is not None and stop is not None and start >= 0 and stop >= 0:
+            # Explicit, non-negative bounds. These do not require the parent's width,
+            # which is not yet available for some parents, e.g. references into Bundles.
+            # Unlike Python, they are not clamped. Out-of-bounds slices are reported during elaboration.
+            bits = range(start, stop, step)
+        else:
+            # Otherwise resolve against the parent's width, clamping to its bounds.
+            bits = range(*index.indices(parent.width))
+        width = len(bits)
+        if not width:
+            # Empty selection. Leave it for later checks to reject.
+            top = bot = bits.start
+        elif bits.step > 0:
+            # `bot` is the first index, and `top` one past the last
+            top, bot = bits[-1] + 1, bits.start
         else:
-            # Here `start` and `stop` match `top` and `bot`'s inclusive/exclusivity.
-            # No need to add any offsets.
-            top = (
-                parent.width
-                if stop is None
-                else stop
-                if stop >= 0
-                else parent.width + stop
-            )
-            bot = 0 if start is None else start if start >= 0 else parent.width + start
-            # Align top with the step
-            top -= (top - bot) % step
-
-        width = (top - bot) // step
+            # `top` is one past the first index, and `bot` is the last
+            top, bot = bits.start + 1, bits[-1]
 
         # Create and return our Slice. More checks are done in its constructor.
-        return SliceInner(top=top, bot=bot, step=step, width=width)
+        return SliceInner(top=top, bot=bot, step=bits.step, width=width)
 
     # Shouldn't be reachable, but blow up if we (somehow) get here.
     raise TypeError("Internal Error: Slice index should be an int or (python) slice")
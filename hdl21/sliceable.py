@@ -53,10 +53,12 @@ def _slice(*, parent: "Sliceable", index: Union[int, slice]) -> "Slice":
     """
 
     from .slice import Slice
+    from .datatype import construct
 
     if not isinstance(index, (int, slice)):
         raise TypeError
 
-    slize = Slice(parent=parent, index=index)
+    # Both fields are checked here, and by `Slice.__post_init__`. Skip re-validating them.
+    slize = construct(Slice, parent=parent, index=index)
     parent._slices.add(slize)
     return slize
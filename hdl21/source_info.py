@@ -22,21 +22,93 @@ Past methods, and associated lessons include:
 
 """
 
+import os
+import sys
 import inspect
+import importlib
 from pathlib import Path
-from types import ModuleType, FrameType
-from typing import Optional
+from types import CodeType, ModuleType, FrameType
+from typing import Optional, Union
 
-from .datatype import datatype, AllowArbConfig
 
-
-@datatype(config=AllowArbConfig)
 class SourceInfo:
-    """# Python Source Info"""
+    """
+    # Python Source Info
+
+    Captured cheaply, as the code-object and line number of the calling frame.
+    Its `filepath` and (optional) `pymodule` are resolved from the code-object upon first use.
+    """
+
+    __slots__ = ("_code", "_filepath", "_pymodule", "linenum")
+
+    def __init__(
+        self,
+        filepath: Union[str, Path],
+        linenum: int,
+        pymodule: Optional[ModuleType] = None,
+    ):
+        self._code: Optional[CodeType] = None
+        self._filepath: Optional[Path] = Path(filepath)
+        self._pymodule: Optional[ModuleType] = pymodule
+        self.linenum: int = linenum
+
+    @classmethod
+    def _capture(cls, code: CodeType, linenum: int, get_pymodule: bool) -> "SourceInfo":
+        """Create from `code` and `linenum`, deferring resolution of everything else.
+        The Python module is only resolved if `get_pymodule` is set."""
+        rv = cls.__new__(cls)
+        rv._code = code
+        rv._filepath = None
+        rv._pymodule = _UNRESOLVED if get_pymodule else None
+        rv.linenum = linenum
+        return rv
+
+    @property
+    def filepath(self) -> Path:
+        if self._filepath is None:
+            self._filepath = Path(self._code.co_filename)
+        return self._filepath
+
+    @property
+    def pymodule(self) -> Optional[ModuleType]:
+        if self._pymodule is _UNRESOLVED:
+            # Note this is generally the slow part.
+            self._pymodule = inspect.getmodule(self._code)
+        return self._pymodule
+
+    def __repr__(self) -> str:
+        return f"SourceInfo(filepath={self.filepath}, linenum={self.linenum})"
 
-    filepath: Path
-    linenum: int
-    pymodule: Optional[ModuleType] = None
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SourceInfo):
+            return NotImplemented
+        return (self.filepath, self.linenum, self.pymodule) == (
+            other.filepath,
+            other.linenum,
+            other.pymodule,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.filepath, self.linenum))
+
+    def __reduce__(self):
+        # Pickle the resolved values. Neither code-objects nor Python modules pickle;
+        # the latter are stored by name, and re-imported upon load.
+        pymodule = self.pymodule
+        modname = pymodule.__name__ if pymodule is not None else None
+        return (_load, (self.filepath, self.linenum, modname))
+
+
+def _load(filepath: Path, linenum: int, modname: Optional[str]) -> SourceInfo:
+    """Un-pickle a `SourceInfo`, re-importing its Python module by name."""
+    pymodule = None
+    if modname is not None:
+        pymodule = sys.modules.get(modname, None) or importlib.import_module(modname)
+    return SourceInfo(filepath, linenum, pymodule)
+
+
+# Sentinel for the not-yet-resolved `SourceInfo.pymodule`
+_UNRESOLVED = object()
 
 
 def source_info(get_pymodule: bool = False) -> Optional[SourceInfo]:
@@ -49,8 +121,15 @@ def source_info(get_pymodule: bool = False) -> Optional[SourceInfo]:
     Returns a `SourceInfo` with `filepath` and `linenum` fields,
     and additionally finds the `pymodule` python module field if requested
     via the `get_pymodule` boolean argument.
+    Only the frame's code-object and line number are captured here. The rest are resolved upon first use.
+
+    If capture is disabled via `disable`, returns `None` for requests which do not `get_pymodule`.
+    Those which do are always captured, as their Python modules serve as part of the qualified names of Modules.
     """
 
+    if not get_pymodule and not _enabled:
+        return None
+
     # Get or create the files-to-skip set
     global files_to_skip
     if files_to_skip is None:
@@ -63,18 +142,10 @@ def source_info(get_pymodule: bool = False) -> Optional[SourceInfo]:
     for _ in range(MAX_DEPTH):
         if frame is None:
             return None
-        if frame.f_code.co_filename not in files_to_skip:
+        code = frame.f_code
+        if code.co_filename not in files_to_skip:
             # We've got a hit! Return a `SourceInfo` object.
-
-            # If requested via the `get_pymodule` flag, return the Python module.
-            # Note this is generally the slow part.
-            pymodule = None if not get_pymodule else inspect.getmodule(frame)
-
-            return SourceInfo(
-                filepath=Path(frame.f_code.co_filename),
-                linenum=frame.f_lineno,
-                pymodule=pymodule,
-            )
+            return SourceInfo._capture(code, frame.f_lineno, get_pymodule)
         # And back up one frame
         frame = frame.f_back
 
@@ -82,6 +153,32 @@ def source_info(get_pymodule: bool = False) -> Optional[SourceInfo]:
     raise RecursionError("Error finding `SourceDetail`")
 
 
+# Global enable for source-info capture.
+# Defaults to enabled, unless the `HDL21_SOURCE_INFO` environment variable is set to "0".
+_enabled: bool = os.environ.get("HDL21_SOURCE_INFO", "1") != "0"
+
+
+def enable() -> None:
+    """# Enable source-info capture. The default."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """# Disable source-info capture
+    For objects which use it solely for error messages, e.g. `Instance`s.
+    These carry no source locations while disabled, and so neither do their error messages.
+    Modules, Generators, and ExternalModules are still captured, as their Python modules are part of their qualified names.
+    """
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Boolean indication of whether source-info capture is enabled"""
+    return _enabled
+
+
 # Set of files to skip
 # Calculated once, after import-time, so those modules can import this one.
 # files_to_skip: Optional[Set[str]] = None
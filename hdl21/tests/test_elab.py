@@ -0,0 +1,765 @@
+"""
+# Hdl21 Elaboration
+## Unit Tests
+"""
+
+import pytest
+
+import hdl21 as h
+from hdl21.elab import Elaborator
+from hdl21.elab.passes import ElabPass
+
+
+def _counting_elaborator():
+    """Create an `Elaborator` running the default passes, plus one which records each Module it visits."""
+
+    class Visits(ElabPass):
+        visited = list()
+
+        def elaborate_module(self, module: h.Module) -> h.Module:
+            Visits.visited.append(module.name)
+            return module
+
+    elaborator = Elaborator(passes=Elaborator.default().passes + [Visits])
+    return elaborator, Visits.visited
+
+
+def test_incremental_elab1():
+    """Test that re-elaborating an unchanged hierarchy does not re-visit its Modules,
+    and that editing a leaf re-visits it and its parents - but not its siblings."""
+
+    @h.module
+    class Leaf:
+        p = h.Port()
+
+    @h.module
+    class Sibling:
+        p = h.Port()
+
+    @h.module
+    class Top:
+        s = h.Signal()
+        leaf = Leaf(p=s)
+        sib = Sibling(p=s)
+
+    elaborator, visited = _counting_elaborator()
+    elaborator.elaborate(Top)
+    assert sorted(visited) == ["Leaf", "Sibling", "Top"]
+
+    # Nothing changed. Nothing should be re-visited.
+    visited.clear()
+    elaborator.elaborate(Top)
+    assert visited == []
+
+    # Edit the leaf. It and its parent are re-elaborated.
+    Leaf.q = h.Port()
+    Top.q = h.Signal()
+    Top.leaf.connect("q", Top.q)
+
+    visited.clear()
+    elaborator.elaborate(Top)
+    assert visited == ["Leaf", "Top"]
+
+    # And the edited design is good for export
+    pkg = h.to_proto(Top)
+    leaf = [m for m in pkg.modules if m.name.endswith("Leaf")][0]
+    assert [p.signal for p in leaf.ports] == ["p", "q"]
+
+
+def test_incremental_elab2():
+    """Test that edits after elaboration are checked by re-elaboration."""
+
+    @h.module
+    class Leaf:
+        p = h.Port()
+
+    @h.module
+    class Top:
+        s = h.Signal()
+        leaf = Leaf(p=s)
+
+    h.elaborate(Top)
+
+    # Make an invalid connection to a non-existent port
+    Top.leaf.connect("not_a_port", Top.s)
+    with pytest.raises(RuntimeError) as einfo:
+        h.elaborate(Top)
+    assert "not_a_port" in str(einfo.value)
+
+
+def test_incremental_elab3():
+    """Test adding a Bundle to an already-elaborated Module"""
+
+    @h.bundle
+    class B:
+        x, y = h.Signals(2)
+
+    @h.module
+    class Leaf:
+        p = h.Port()
+
+    h.elaborate(Leaf)
+
+    Leaf.b = B(port=True)
+    h.elaborate(Leaf)
+    assert not Leaf.bundles
+    assert sorted(Leaf.ports.keys()) == ["b_x", "b_y", "p"]
+
+    # New parents see the new Bundle port
+    @h.module
+    class Top:
+        b = B()
+        s = h.Signal()
+        leaf = Leaf(b=b, p=s)
+
+    h.elaborate(Top)
+    assert Top.leaf.conns["b_x"] is Top.b_x
+
+
+def test_incremental_elab_bundle_conn():
+    """Test connecting a new Bundle port, from an already-elaborated parent"""
+
+    @h.bundle
+    class D:
+        p, n = h.Signals(2)
+
+    @h.module
+    class Leaf:
+        a = h.Input()
+
+    @h.module
+    class Mid:
+        a = h.Input()
+        l = Leaf(a=a)
+
+    @h.module
+    class Top:
+        a = h.Input()
+        m = Mid(a=a)
+
+    h.elaborate(Top)
+
+    # Add a Bundle port to the elaborated `Leaf`, and connect it from the elaborated `Mid`
+    Leaf.d = D(port=True)
+    Mid.dd = D()
+    Mid.l.d = Mid.dd
+
+    h.elaborate(Top)
+    assert sorted(Leaf.ports.keys()) == ["a", "d_n", "d_p"]
+    assert not Mid.bundles
+    assert sorted(Mid.l.conns.keys()) == ["a", "d_n", "d_p"]
+    assert Mid.l.conns["d_p"] is Mid.dd_p
+    assert Mid.l.conns["d_n"] is Mid.dd_n
+
+
+def test_incremental_elab4():
+    """Test that finding dirty Modules walks only the edited parts of the hierarchy,
+    and that edits target the flattened, elaborated hierarchy."""
+    from hdl21.elab.helpers.dirty import find_dirty
+
+    @h.module
+    class Leaf:
+        p = h.Port()
+
+    @h.module
+    class Sibling:
+        p = h.Port()
+
+    @h.module
+    class Mid:
+        p = h.Port()
+        arr = 2 * Leaf(p=p)
+
+    @h.module
+    class Top:
+        s = h.Signal()
+        mid = Mid(p=s)
+        sib = Sibling(p=s)
+
+    h.elaborate(Top)
+    assert find_dirty([Top]) == ([Top], set())
+
+    # The InstanceArray has been flattened into scalar Instances
+    assert Mid.get("arr") is None
+    assert sorted(Mid.instances.keys()) == ["arr_0", "arr_1"]
+
+    # Edit the leaf. It and each of its instantiators are dirty, and nothing else.
+    Leaf.q = h.Port()
+    assert Mid._stale and Top._stale and not Sibling._stale
+    _, dirty = find_dirty([Top])
+    assert dirty == {Leaf, Mid, Top}
+
+    # Edit the flattened Instances, and re-elaborate
+    Mid.q = h.Signal()
+    Mid.arr_0.connect("q", Mid.q)
+    Mid.arr_1.connect("q", Mid.q)
+    h.elaborate(Top)
+    assert find_dirty([Top]) == ([Top], set())
+    assert not Mid._stale and not Top._stale
+
+    # Re-targeting an Instance to a new Module marks its parent as edited
+    @h.module
+    class Leaf2:
+        p, q = h.Ports(2)
+
+    Mid.arr_1.of = Leaf2
+    _, dirty = find_dirty([Top])
+    assert dirty == {Leaf2, Mid, Top}
+    h.elaborate(Top)
+    assert Leaf2._elaborated is Leaf2
+
+
+def test_fused_passes1():
+    """Test the scheduling of fused passes"""
+    from hdl21.elab.passes import Orphanage, ConnTypes, ResolvePortRefs, MarkModules
+
+    default = Elaborator.default()
+    assert default.fuse
+    assert default.schedule() == [default.passes]
+
+    unfused = Elaborator(passes=default.passes, fuse=False)
+    assert unfused.schedule() == [[p] for p in default.passes]
+
+    # Non-fusable passes break up the fused groups
+    elaborator, _ = _counting_elaborator()
+    assert len(elaborator.schedule()) == 2
+
+    # Dependencies must run before their dependents
+    with pytest.raises(RuntimeError):
+        Elaborator(passes=[ConnTypes, ResolvePortRefs])
+    # But need not be included at all
+    Elaborator(passes=[Orphanage, ConnTypes, MarkModules])
+
+
+def test_fused_passes2():
+    """Test that fused and unfused elaboration produce the same results"""
+
+    @h.bundle
+    class B:
+        x, y = h.Signals(2)
+
+    @h.module
+    class Leaf:
+        b = B(port=True)
+        p = h.Input(width=4)
+
+    def make_top():
+        @h.module
+        class Top:
+            b = B()
+            s = h.Signal(width=8)
+            leaves = 2 * Leaf(b=b, p=s[0:4])
+            other = Leaf(b=b, p=s[4:8])
+
+        return Top
+
+    fused = h.to_proto(
+        Elaborator(passes=Elaborator.default().passes).elaborate(make_top())
+    )
+    unfused = h.to_proto(
+        Elaborator(passes=Elaborator.default().passes, fuse=False).elaborate(make_top())
+    )
+    # Strip out the (unique) Module names and compare
+    for pkg in (fused, unfused):
+        for m in pkg.modules:
+            m.name = m.name.split(".")[-1]
+            for inst in m.instances:
+                inst.module.local = inst.module.local.split(".")[-1]
+    assert fused == unfused
+
+
+def test_fused_passes3():
+    """Test that errors in fused passes are reported with their hierarchical path"""
+
+    @h.module
+    class Leaf:
+        p = h.Input(width=2)
+
+    @h.module
+    class Top:
+        s = h.Signal(width=3)
+        leaf = Leaf(p=s)
+
+    with pytest.raises(RuntimeError) as einfo:
+        h.elaborate(Top)
+    assert "Top" in str(einfo.value)
+
+
+def test_elab_context_memory():
+    """Test that elaboration does not retain references to Modules"""
+    import gc, weakref
+
+    def make():
+        @h.bundle
+        class B:
+            x = h.Signal()
+
+        @h.module
+        class Leaf:
+            b = B(port=True)
+
+        @h.module
+        class Top:
+            b = B()
+            leaf = Leaf(b=b)
+
+        return Top
+
+    top = make()
+    h.elaborate(top)
+    ref = weakref.ref(top)
+    del top
+    gc.collect()
+    assert ref() is None
+
+
+def test_elab_threads():
+    """Test elaborating independent designs concurrently, on separate threads"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def build_and_elaborate(idx: int) -> h.Module:
+        @h.bundle
+        class B:
+            x, y = h.Signals(2)
+
+        @h.module
+        class Leaf:
+            b = B(port=True)
+            p = h.Input(width=4)
+
+        Top = h.Module(name=f"Top{idx}")
+        Top.b = B()
+        Top.s = h.Signal(width=4)
+        for k in range(20):
+            Top.add(Leaf(b=Top.b, p=Top.s), name=f"leaf{k}")
+        return h.elaborate(Top)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        tops = list(pool.map(build_and_elaborate, range(32)))
+
+    for top in tops:
+        assert not top.bundles
+        assert sorted(top.signals.keys()) == ["b_x", "b_y", "s"]
+        assert top.leaf0.conns["b_x"] is top.b_x
+
+
+def test_elab_profile(tmp_path):
+    """Test profiling elaboration"""
+    import json
+
+    @h.bundle
+    class B:
+        x, y = h.Signals(2)
+
+    @h.module
+    class Leaf:
+        b = B(port=True)
+        p = h.Input()
+
+    @h.module
+    class Top:
+        b = B()
+        s = h.Signal(width=4)
+        leaves = 4 * Leaf(b=b, p=s)
+
+    profile = h.ElabProfile()
+    h.elaborate(Top, profile=profile)
+
+    assert profile.total > 0
+    assert sorted(profile.modules.keys()) == ["Leaf", "Top"]
+    assert profile.hottest(1)[0].name in ("Leaf", "Top")
+
+    flattener = profile.passes["BundleFlattener"]
+    assert flattener.modules == 2
+    assert flattener.bundles == 2
+    assert flattener.signals_created == 4
+    arrays = profile.passes["ArrayFlattener"]
+    assert arrays.instarrays == 1
+    assert arrays.slices_created == 4
+
+    # Check the Chrome-trace output
+    path = tmp_path / "elab.trace.json"
+    profile.write_chrome_trace(path)
+    trace = json.loads(path.read_text())
+    events = trace["traceEvents"]
+    assert any(e["name"] == "Top" and e["cat"] == "BundleFlattener" for e in events)
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+    # And the dictionary form is JSON-serializable
+    json.dumps(profile.to_dict())
+
+
+def _bits(conn) -> list:
+    """Expand a resolved connection into a list of (Signal name, bit index) pairs"""
+    if isinstance(conn, h.Signal):
+        return [(conn.name, k) for k in range(conn.width)]
+    if isinstance(conn, h.Slice):
+        assert isinstance(conn.parent, h.Signal)
+        assert conn.step == 1
+        return [(conn.parent.name, k) for k in range(conn.bot, conn.top)]
+    if isinstance(conn, h.Concat):
+        return [bit for part in conn.parts for bit in _bits(part)]
+    raise TypeError
+
+
+def test_slice_resolution_runs():
+    """Test resolving nested Slices and Concats into merged runs"""
+
+    @h.module
+    class Leaf:
+        p = h.Input(width=8)
+
+    @h.module
+    class Top:
+        a = h.Signal(width=8)
+        b = h.Signal(width=8)
+        # Slice of a Concat, spanning both parts
+        l0 = Leaf(p=h.Concat(a, b)[4:12])
+        # Slice of a Slice, which ends up full-width
+        l1 = Leaf(p=h.Concat(a[0:4], a[4:8])[0:8])
+        # Reversed and strided slices
+        l2 = Leaf(p=h.Concat(a[7::-1][0:4], b[::2]))
+
+    h.elaborate(Top)
+
+    assert Top.l0.conns["p"].parts[0].parent is Top.a
+    assert _bits(Top.l0.conns["p"]) == [("a", k) for k in range(4, 8)] + [
+        ("b", k) for k in range(4)
+    ]
+    assert Top.l1.conns["p"] is Top.a
+    assert _bits(Top.l2.conns["p"]) == [("a", k) for k in (7, 6, 5, 4)] + [
+        ("b", k) for k in (0, 2, 4, 6)
+    ]
+
+
+def test_slice_resolution_wide():
+    """Test resolving a wide Concat, broadcast across an InstanceArray"""
+
+    width = 4096
+
+    @h.module
+    class Leaf:
+        p = h.Input(width=8)
+
+    Top = h.Module(name="Top")
+    sigs = [Top.add(h.Signal(width=1, name=f"s{k}")) for k in range(width)]
+    Top.leaves = (width // 8) * Leaf()
+    Top.leaves.p = h.Concat(*sigs)[::-1][::-1]
+    h.elaborate(Top)
+
+    leaf = Top.get(f"leaves_{width // 8 - 1}")
+    assert _bits(leaf.conns["p"]) == [(f"s{k}", 0) for k in range(width - 8, width)]
+
+
+def test_compact_arrays():
+    """Test keeping InstanceArrays compact through elaboration and export,
+    and that their exports match those of flattened arrays."""
+
+    def make():
+        @h.module
+        class Leaf:
+            p = h.Input(width=2)
+            q = h.Output()
+
+        @h.module
+        class Top:
+            a = h.Signal(width=2)
+            b = h.Signal(width=16)
+            q = h.Signal(width=8)
+            leaves_0 = Leaf(p=a, q=q[0])  # Collides with a flattened array-element name
+            leaves = 8 * Leaf(p=h.Concat(b[8:16], b[0:8]), q=q)
+            bcast = 3 * Leaf(p=a, q=q[1])
+
+        return Top
+
+    compact = make()
+    Elaborator.default(compact_arrays=True).elaborate(compact)
+    assert len(compact.instances) == 1
+    assert len(compact.instarrays) == 2
+    assert compact.leaves._conn_rules["p"].broadcast is False
+    assert compact.bcast._conn_rules["p"].broadcast is True
+
+    flat = make()
+    Elaborator.default().elaborate(flat)
+    assert len(flat.instarrays) == 0
+
+    def instances(top: h.Module) -> dict:
+        pkg = h.to_proto(top)
+        pmod = [m for m in pkg.modules if m.name.endswith("Top")][0]
+        return {
+            i.name: (i.module.local.split(".")[-1], list(i.connections))
+            for i in pmod.instances
+        }
+
+    assert instances(compact) == instances(flat)
+    assert "leaves_0_" in instances(compact)
+
+
+def test_compact_arrays_bundles():
+    """Test compact arrays with Bundle-valued ports"""
+    from hdl21.elab.passes import ArrayCompactor, ArrayFlattener
+
+    def make():
+        @h.bundle
+        class B:
+            x, y = h.Signals(2)
+
+        @h.module
+        class Leaf:
+            b = B(port=True)
+            p = h.Input()
+
+        @h.module
+        class Top:
+            b = B()
+            p = h.Signal(width=3)
+            arr = 3 * Leaf(b=b, p=p)
+
+        return Top
+
+    # By default Bundles are flattened first, and compact arrays export the same as flattened ones
+    compact = make()
+    Elaborator.default(compact_arrays=True).elaborate(compact)
+    assert set(compact.arr._conn_rules.keys()) == {"b_x", "b_y", "p"}
+    flat = make()
+    Elaborator.default().elaborate(flat)
+
+    def instances(top: h.Module) -> dict:
+        pkg = h.to_proto(top)
+        pmod = [m for m in pkg.modules if m.name.endswith("Top")][0]
+        return {i.name: list(i.connections) for i in pmod.instances}
+
+    assert instances(compact) == instances(flat)
+
+    # Without Bundle flattening, Bundle connections are broadcast, as they are when flattening arrays
+    compact = make()
+    Elaborator(passes=[ArrayCompactor]).elaborate(compact)
+    assert compact.arr._conn_rules["b"].broadcast is True
+    assert compact.arr._conn_rules["b"].width is None
+    assert compact.arr._conn_rules["p"].broadcast is False
+
+    flat = make()
+    Elaborator(passes=[ArrayFlattener]).elaborate(flat)
+    assert all(i.conns["b"] is flat.b for i in flat.instances.values())
+
+
+def test_compact_arrays_unelaborated():
+    """Test that exporting non-compacted arrays fails"""
+    from hdl21.proto.exporting import ProtoExporter
+
+    @h.module
+    class Leaf:
+        p = h.Input()
+
+    @h.module
+    class Top:
+        p = h.Signal()
+        leaves = 2 * Leaf(p=p)
+
+    with pytest.raises(RuntimeError):
+        ProtoExporter(tops=[Top]).export()
+
+
+def test_portref_daisy_chain():
+    """Test resolving a long chain of PortRefs, each referring to the last, into a single Signal"""
+
+    @h.module
+    class Leaf:
+        p = h.Input()
+
+    Top = h.Module(name="Top")
+    Top.p = h.Input()
+    prev = Top.add(Leaf(p=Top.p), name="leaf0")
+    for k in range(1, 5000):
+        prev = Top.add(Leaf(p=prev.p), name=f"leaf{k}")
+
+    h.elaborate(Top)
+    assert not Top.signals
+    assert all(inst.conns["p"] is Top.p for inst in Top.instances.values())
+
+
+def test_bundle_templates():
+    """Test flattening many instances of the same Bundle via a shared template"""
+    from hdl21.elab.context import ElabContext
+    from hdl21.elab.passes import BundleFlattener
+
+    @h.bundle
+    class Inner:
+        a = h.Input()
+        b = h.Output(width=4)
+
+    @h.bundle
+    class Outer:
+        i = Inner()
+        j = Inner(flipped=True)
+        c = h.Signal()
+
+    @h.module
+    class HasPort:
+        o = Outer(port=True)
+
+    Top = h.Module(name="Top")
+    for k in range(100):
+        b = Top.add(Outer(), name=f"b{k}")
+        Top.add(HasPort(o=b), name=f"h{k}")
+
+    h.elaborate(Top)
+
+    # Each instance gets its own, distinct, flattened Signals
+    assert len(Top.signals) == 100 * 5
+    assert Top.signals["b7_i_b"].width == 4
+    assert Top.signals["b7_i_b"] is not Top.signals["b8_i_b"]
+    assert Top.instances["h7"].conns["o_j_a"] is Top.signals["b7_j_a"]
+
+    # Port directions are flipped where the sub-bundle is
+    assert HasPort.ports["o_i_a"].direction == h.PortDir.INPUT
+    assert HasPort.ports["o_j_a"].direction == h.PortDir.OUTPUT
+    assert HasPort.ports["o_j_b"].direction == h.PortDir.OUTPUT.flipped()
+
+    # Check the templates are shared: one per (Bundle, role, port-ness, flip-state)
+    ctx = ElabContext()
+    many = h.Module(name="Many")
+    for k in range(10):
+        many.add(Outer(), name=f"b{k}")
+    BundleFlattener.elaborate(tops=[many], ctx=ctx)
+    assert len(ctx.bundle_cache.templates) == 3  # Outer, Inner, flipped Inner
+    assert len(many.signals) == 10 * 5
+
+
+def test_width_cache():
+    """Test memoizing and invalidating connection widths"""
+    from hdl21.elab.helpers.width import width, invalidate_width
+
+    @h.module
+    class Inner:
+        p = h.Input(width=3)
+
+    @h.module
+    class Outer:
+        s = h.Signal(width=2)
+        i = Inner()
+
+    inner = h.Concat(Outer.s, Outer.i.p)
+    outer = h.Concat(inner, Outer.s[0])
+    other = h.Concat(Outer.s, Outer.s)
+
+    cache = dict()
+    assert width(outer, cache=cache) == 6
+    assert width(other, cache=cache) == 4
+    assert cache[inner] == 5
+    assert cache[outer] == 6
+    assert cache[Outer.i.p] == 3
+
+    # Invalidating the PortRef removes everything which depends on it, and nothing else
+    invalidate_width(cache, Outer.i.p)
+    assert cache == {other: 4}
+    assert width(outer, cache=cache) == 6
+
+
+def test_lazy_generators():
+    """Test deferring `lazy` generator calls until elaboration"""
+    from hdl21.generator import GeneratorCall
+
+    runs = []
+
+    @h.paramclass
+    class P:
+        w = h.Param(dtype=int, desc="Width", default=1)
+
+    @h.generator(lazy=True)
+    def Leaf(params: P) -> h.Module:
+        runs.append(params.w)
+        m = h.Module()
+        m.p = h.Input(width=params.w)
+        return m
+
+    @h.generator(lazy=True, enable_cache=False)
+    def Uncached(params: P) -> h.Module:
+        runs.append(-params.w)
+        m = h.Module()
+        m.p = h.Input(width=params.w)
+        return m
+
+    # Calls are not run until elaboration
+    assert isinstance(Leaf(w=3), GeneratorCall)
+    assert runs == []
+
+    @h.module
+    class Top:
+        s = h.Signal(width=3)
+        a = Leaf(w=3)(p=s)
+        b = Leaf(w=3)(p=s)
+        c = Uncached(w=3)(p=s)
+        d = Uncached(w=3)(p=s)
+
+    # Replaced before elaboration; never run
+    Top.b.of = Leaf(w=5)
+    Top.b.of = Leaf(w=3)
+    Leaf(w=7)
+    assert runs == []
+
+    h.elaborate(Top)
+    assert sorted(runs) == [-3, 3]  # Each unique call ran once
+    assert isinstance(Top.a.of, h.Module)
+    assert Top.a.of is Top.b.of
+    assert Top.c.of is Top.d.of
+    assert Top.a.of.name == "Leaf(w=3)"
+
+    # Lazy calls can also be tops
+    top = h.elaborate(Leaf(w=11))
+    assert isinstance(top, h.Module)
+    assert top.name == "Leaf(w=11)"
+    assert h.elaborate(Leaf(w=11)) is top
+    assert sorted(runs) == [-3, 3, 11]
+
+
+def test_dedup_modules():
+    """Test merging structurally identical Modules"""
+    from hdl21.elab.passes import ModuleDeduplicator
+
+    @h.paramclass
+    class P:
+        w = h.Param(dtype=int, desc="Width", default=1)
+
+    Res = h.ExternalModule(
+        name="Res", port_list=[h.Inout(name="p")], paramtype=P, desc="Resistor"
+    )
+
+    @h.generator(enable_cache=False)
+    def Leaf(params: P) -> h.Module:
+        m = h.Module()
+        m.p = h.Input(width=params.w)
+        m.r = Res(params)(p=m.p[0])
+        return m
+
+    @h.generator(enable_cache=False)
+    def Mid(params: P) -> h.Module:
+        m = h.Module()
+        m.p = h.Input(width=params.w)
+        m.a = Leaf(params)(p=m.p)
+        return m
+
+    @h.module
+    class Top:
+        s = h.Signal(width=3)
+        a = Mid(w=3)(p=s)
+        b = Mid(w=3)(p=s)
+        c = Mid(w=2)(p=s[0:2])
+
+    assert Top.a.of is not Top.b.of
+    assert Top.a.of.a.of is not Top.b.of.a.of
+
+    elaborator = Elaborator.default(dedup=True)
+    assert ModuleDeduplicator in elaborator.passes
+    profile = h.ElabProfile()
+    elaborator.elaborate(Top, profile=profile)
+
+    # Identical generated Modules are merged, bottom-up
+    assert Top.a.of is Top.b.of
+    assert Top.a.of is not Top.c.of
+    assert Top.a.of.a.of is not Top.c.of.a.of
+    assert profile.passes["ModuleDeduplicator"].modules_merged == 2
+
+    # And export, rather than failing with conflicting names
+    pkg = h.to_proto(Top)
+    assert len(pkg.modules) == 5
@@ -147,3 +147,37 @@ def test_flatten_with_concat():
         nmos_array = NmosArray(d=h.Concat(s4, s2, s1, s0), g=g, vss=vss)
 
     flattened = flatten(M)
+
+
+def test_flatten_compact_arrays():
+    """Test flattening a module with `InstanceArray`s kept compact by elaboration"""
+    from hdl21.elab import Elaborator
+
+    def make() -> h.Module:
+        @h.module
+        class Top:
+            vdd, vss, vin, vout = h.Ports(4)
+            invs = 4 * Inverter(vdd=vdd, vss=vss, vin=vin, vout=vout)
+
+        return Top
+
+    compact = make()
+    Elaborator.default(compact_arrays=True).elaborate(compact)
+    assert len(compact.instarrays) == 1
+    compact_flat = flatten(compact)
+
+    flat = flatten(make())
+    assert compact_flat.instances.keys() == flat.instances.keys()
+    assert len(flat.instances) == 8
+    assert "invs_3:pmos" in flat.instances
+
+    # Sliced connections are not (yet) supported, as for non-compact arrays
+    @h.module
+    class Sliced:
+        vdd, vss, vout = h.Ports(3)
+        vin = h.Port(width=4)
+        invs = 4 * Inverter(vdd=vdd, vss=vss, vin=vin, vout=vout)
+
+    Elaborator.default(compact_arrays=True).elaborate(Sliced)
+    with pytest.raises(NotImplementedError):
+        flatten(Sliced)
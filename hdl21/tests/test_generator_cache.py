@@ -0,0 +1,313 @@
+"""
+# Generator Cache Tests
+"""
+
+import pytest
+
+import hdl21 as h
+from hdl21.generator import GeneratorCall
+from hdl21.disk_cache import source_hash
+
+
+@h.paramclass
+class Params:
+    n = h.Param(dtype=int, desc="Size")
+
+
+@h.module
+class Leaf:
+    i, z = h.Inputs(2)
+
+
+@h.bundle
+class Pair:
+    a, b = h.Signals(2)
+
+
+@h.generator
+def child(params: Params) -> h.Module:
+    m = h.Module()
+    m.bus = h.Input(width=params.n)
+    m.pair = Pair(port=True)
+    m.leaf = Leaf(i=m.bus[0], z=m.pair.a)
+    return m
+
+
+@h.generator
+def parent(params: Params) -> h.Module:
+    m = h.Module()
+    m.bus = h.Signal(width=params.n)
+    m.pair = Pair()
+    m.child = child(params)(bus=m.bus, pair=m.pair)
+    return m
+
+
+@h.generator(lazy=True)
+def lazy_child(params: Params) -> h.Module:
+    m = h.Module()
+    m.bus = h.Input(width=params.n)
+    return m
+
+
+uncached_runs = list()
+
+
+@h.generator(enable_cache=False)
+def uncached_child(params: Params) -> h.Module:
+    uncached_runs.append(params)
+    m = h.Module()
+    m.bus = h.Input(width=params.n)
+    return m
+
+
+@h.generator
+def mixed(params: Params) -> h.Module:
+    m = h.Module()
+    m.bus = h.Signal(width=params.n)
+    m.lazy = lazy_child(params).resolve()(bus=m.bus)
+    m.uncached = uncached_child(params)(bus=m.bus)
+    return m
+
+
+def test_disk_cache(tmp_path):
+    cache = h.generator.cache
+    prior = cache.disk
+    try:
+        disk = cache.enable_disk(tmp_path)
+        cache.reset()
+
+        # Stale entries, from a prior version of `parent`, are evicted on first use
+        stale = (
+            tmp_path / "hdl21.tests.test_generator_cache.parent" / "0123456789abcdef"
+        )
+        stale.mkdir(parents=True)
+        (stale / "entry.pkl").write_bytes(b"")
+
+        generated = parent(n=3)
+        assert not stale.exists()
+        assert (disk.hits, disk.stores) == (0, 2)
+
+        # Clear the in-memory cache, and load from disk
+        cache.reset()
+        loaded = parent(n=3)
+        assert loaded is not generated
+        assert disk.hits == 2  # The parent, and its child along with it
+        assert loaded.name == generated.name == "parent(n=3)"
+        assert loaded._generated_by.params == Params(n=3)
+        assert loaded.bus.width == 3
+
+        # Shared definitions are references to the in-memory originals
+        assert loaded.pair.of is Pair
+        assert loaded.child.of is child(n=3)
+        assert loaded.child.of.leaf.of is Leaf
+        assert disk.hits == 2
+
+        h.elaborate(loaded)
+        assert h.to_proto(loaded) == h.to_proto(h.elaborate(generated))
+
+        # Corrupt entries are evicted, and treated as misses
+        entry = disk.entry_path(GeneratorCall(gen=parent, params=Params(n=4)))
+        parent(n=4)
+        assert entry.exists()
+        entry.write_bytes(b"not a pickle")
+        cache.reset()
+        parent(n=4)
+        assert disk.failures == 1
+        assert (
+            disk.stores == 5
+        )  # Two each for `n=3` and `n=4`, plus the re-written parent
+
+        # Source hashes cover the generators each refers to
+        assert source_hash(parent) != source_hash(child)
+
+    finally:
+        cache.reset()
+        cache.disk = prior
+
+
+def test_disk_cache_generated_children(tmp_path):
+    """Test loading Modules which instantiate those of lazy and uncached generators"""
+    cache = h.generator.cache
+    prior = cache.disk
+    try:
+        cache.enable_disk(tmp_path)
+        cache.reset()
+        uncached_runs.clear()
+        generated = mixed(n=2)
+        assert len(uncached_runs) == 1
+
+        cache.reset()
+        loaded = mixed(n=2)
+        assert loaded is not generated
+
+        # Lazy generators' Modules are loaded as Modules, not `GeneratorCall`s
+        assert isinstance(loaded.lazy.of, h.Module)
+        assert loaded.lazy.of is lazy_child(n=2).resolve()
+
+        # Uncached generators' Modules are stored by value, and not re-generated
+        assert isinstance(loaded.uncached.of, h.Module)
+        assert loaded.uncached.of.bus.width == 2
+        assert len(uncached_runs) == 1
+
+        assert h.to_proto(h.elaborate(loaded)) == h.to_proto(h.elaborate(generated))
+
+        # As are the results of parallel generation
+        cache.reset()
+        cache.disk = None
+        results = list(mixed.map([Params(n=3), Params(n=4)], workers=2))
+        for m in results:
+            assert m.lazy.of is lazy_child(m._generated_by.params).resolve()
+            assert isinstance(m.uncached.of, h.Module)
+
+    finally:
+        cache.reset()
+        cache.disk = prior
+
+
+def test_generator_map():
+    """Test generating in parallel with `Generator.map`"""
+    cache = h.generator.cache
+    cache.reset()
+    try:
+        parent(n=2)  # Already cached, and not re-generated
+
+        params = [Params(n=n) for n in (1, 2, 3, 1, 4)]
+        results = list(parent.map(params, workers=2))
+
+        # One result per parameter value, in order, with equal ones de-duplicated
+        assert [m._generated_by.params for m in results] == params
+        assert results[0] is results[3]
+        assert len(set(map(id, results))) == 4
+
+        # Results, including nested generator calls, populate the cache
+        for n, m in zip((1, 2, 3, 1, 4), results):
+            assert parent(n=n) is m
+            assert m.child.of is child(n=n)
+            assert m.pair.of is Pair
+        assert (
+            cache.stats.misses == 5
+        )  # `parent(n=2)` and its child, and the three new calls to `map`
+
+        # Generating serially produces the same results
+        h.elaborate(results)
+        pkg = h.to_proto(results)
+        cache.reset()
+        serial = list(parent.map(params, workers=1))
+        assert h.to_proto(h.elaborate(serial)) == pkg
+
+        # Unordered results come back in order of completion
+        unordered = list(
+            child.map([Params(n=5), Params(n=6)], workers=2, ordered=False)
+        )
+        assert sorted(m.name for m in unordered) == ["child(n=5)", "child(n=6)"]
+
+    finally:
+        cache.reset()
+
+
+def test_generator_profile(tmp_path):
+    cache = h.generator.cache
+    cache.reset()
+    profile = cache.enable_profile()
+    try:
+        parent(n=5)
+        parent(n=5)  # Cache hit
+        parent(n=6)
+    finally:
+        assert cache.disable_profile() is profile
+
+    pname = "hdl21.tests.test_generator_cache.parent"
+    cname = "hdl21.tests.test_generator_cache.child"
+    pstats = profile.generators[pname]
+    cstats = profile.generators[cname]
+    assert (pstats.calls, pstats.hits, pstats.unique) == (3, 1, 2)
+    assert (cstats.calls, cstats.hits, cstats.unique) == (2, 0, 2)
+    assert pstats.children == {cname: 2}
+    assert cstats.children == {}
+
+    # Inclusive time covers the child's, exclusive time does not
+    assert pstats.inclusive == pytest.approx(pstats.exclusive + cstats.inclusive)
+    assert cstats.inclusive == cstats.exclusive
+
+    # Call-graph stacks, in flamegraph-compatible form
+    assert set(profile.stacks) == {pname, f"{pname};{cname}"}
+    lines = profile.to_folded().splitlines()
+    assert len(lines) == 2
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    profile.write_folded(tmp_path / "gen.folded")
+
+    table = profile.table()
+    assert pname in table and cname in table
+
+    # Not recorded once disabled
+    parent(n=7)
+    assert profile.generators[pname].calls == 3
+
+    # Same-named generators from different Python modules are profiled separately
+    other = dict(__name__="other_module", h=h, Params=Params)
+    exec(
+        "@h.generator\ndef parent(params: Params) -> h.Module:\n    return h.Module()",
+        other,
+    )
+    profile = cache.enable_profile()
+    try:
+        other["parent"](n=1)
+        parent(n=1)
+    finally:
+        cache.disable_profile()
+    assert set(profile.generators) == {"other_module.parent", pname, cname}
+
+
+def test_generator_threads():
+    import time
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    runs = []
+    started = threading.Event()
+
+    @h.generator
+    def slow(params: Params) -> h.Module:
+        runs.append(params.n)
+        started.set()
+        time.sleep(0.05)
+        m = h.Module()
+        m.child = child(params)()
+        return m
+
+    cache = h.generator.cache
+    cache.reset()
+
+    # Concurrent calls with the same parameters run once, and share the result
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda n: slow(n=n), [1] * 8 + [2] * 8))
+    assert sorted(runs) == [1, 2]
+    assert all(r is results[0] for r in results[:8])
+    assert all(r is results[8] for r in results[8:])
+    assert results[0] is not results[8]
+
+    # Each thread has its own call stack
+    assert cache.stack == [] and cache.pending == set()
+    seen = []
+
+    @h.generator
+    def peek(params: Params) -> h.Module:
+        seen.append(list(cache.stack))
+        started.wait()
+        return h.Module()
+
+    started.clear()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pool.submit(peek, n=1)
+        pool.submit(slow, n=3)
+    assert seen == [[GeneratorCall(gen=peek, params=Params(n=1))]]
+
+    # Failed calls do not leave anything pending
+    @h.generator
+    def fails(params: Params) -> h.Module:
+        raise ValueError("nope")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            fails(n=1)
+    assert cache.stack == [] and cache.pending == set()
@@ -360,6 +360,37 @@ def test_signal_slice2():
     assert sl.width == 2
 
 
+def test_signal_slice3():
+    # Test strided and negative-step slices select the same bits as Python
+    from hdl21.elab.passes.slices import _slice_range
+
+    sig = h.Signal(width=8)
+    sl = sig[::-3]
+    assert sl.top == 8
+    assert sl.bot == 1
+    assert sl.step == -3
+    assert sl.width == 3
+
+    sl = sig[0:8:3]
+    assert sl.top == 7
+    assert sl.bot == 0
+    assert sl.width == 3
+
+    bits = list(range(8))
+    for index in [
+        slice(None, None, -1),
+        slice(None, None, -2),
+        slice(6, 1, -2),
+        slice(-2, None, -3),
+        slice(7, -9, -1),
+        slice(1, None, 2),
+        slice(2, 8, 3),
+    ]:
+        sl = sig[index]
+        assert sl.width == len(bits[index])
+        assert list(_slice_range(sl)) == bits[index]
+
+
 @pytest.mark.xfail(reason="#21 https://github.com/dan-fritchman/Hdl21/issues/21")
 def test_bad_slice1():
     # Test slicing error-cases
@@ -1734,3 +1765,154 @@ def test_generator_caching():
     assert n3 is not n4
     assert n3 is not n2
     assert n3 is not n1
+
+
+def test_generator_cache_limits():
+    """Test the size-limited generator cache, its eviction policies and counters"""
+    import gc
+
+    @h.paramclass
+    class P:
+        i = h.Param(dtype=int, desc="Index")
+
+    @h.generator
+    def G(p: P) -> h.Module:
+        return h.Module()
+
+    cache = h.generator.cache
+    cache.reset()
+    try:
+        # Least-recently used eviction
+        cache.configure(max_entries=2)
+        G(i=0)
+        G(i=1)
+        G(i=0)  # Use 0 again, making 1 the least-recently used
+        G(i=2)
+        assert len(cache.done) == 2
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 3
+        assert cache.stats.evictions == 1
+        assert set(c.params.i for c in cache.done) == {0, 2}
+
+        # Evicted Modules still referenced elsewhere are "revived", not re-generated
+        parent = h.Module(name="parent")
+        parent.g = G(i=3)()
+        G(i=4)
+        G(i=5)
+        gc.collect()
+        assert cache.stats.evictions == 4
+        assert G(i=3) is parent.g.of
+        assert cache.stats.revivals == 1
+        # While those which are no longer alive are re-generated
+        G(i=1)
+        assert cache.stats.revivals == 1
+
+        # Least-frequently used eviction
+        cache.reset()
+        cache.configure(max_entries=2, policy="lfu")
+        G(i=0)
+        G(i=0)
+        G(i=1)
+        G(i=2)  # Evicts 1, used once, rather than the older 0, used twice
+        assert set(c.params.i for c in cache.done) == {0, 2}
+
+        # Approximate byte limits
+        cache.reset()
+        cache.configure(max_bytes=1)
+        G(i=0)
+        assert len(cache.done) == 0
+        assert cache.stats.evictions == 1
+
+        # Configuring limits evicts existing entries as needed
+        cache.reset()
+        cache.configure()
+        for i in range(5):
+            G(i=i)
+        cache.configure(max_entries=3)
+        assert len(cache.done) == 3
+        assert set(c.params.i for c in cache.done) == {2, 3, 4}
+
+    finally:
+        cache.configure()
+        cache.reset()
+
+
+def test_trusted_construct():
+    """Test the non-validating `construct` path for internal datatypes"""
+    from hdl21.datatype import construct
+
+    # Defaults, default-factories, and `__post_init__` are all applied
+    clk = h.Signal(name="clk")
+    s = construct(h.Signal, name="s", width=4, related_clk=clk)
+    assert s.width == 4
+    assert s.vis == h.Visibility.INTERNAL
+    assert isinstance(s.props, h.Properties)
+    assert s._slices == set()
+    assert s in clk._related_clk_of
+
+    # Slices use it, and behave as before. Copies remain validated.
+    c = copy.copy(h.Output(name="o", width=3, desc="out"))
+    assert (c.name, c.width, c.desc) == ("o", 3, "out")
+    assert c.direction == h.PortDir.OUTPUT
+    assert s[1:3].width == 2
+
+    # Missing and unknown fields still fail
+    with pytest.raises(TypeError):
+        construct(h.Slice, index=0)
+    with pytest.raises(TypeError):
+        construct(h.Signal, name="s", wdth=4)
+
+    # While user-facing construction remains validated
+    with pytest.raises(Exception):
+        h.Signal(name="s", width="not a width")
+
+
+def test_lazy_back_references():
+    """Test that back-reference containers are only created upon use"""
+
+    s = h.Signal(name="s", width=4)
+    assert "_slices" not in s.__dict__
+    assert "_connected_ports" not in s.__dict__
+
+    b = s[1]
+    assert s.__dict__["_slices"] == {b}
+    assert "_slices" not in b.__dict__
+    assert b.width == 1
+    assert not hasattr(b._inner, "__dict__")  # Slotted
+
+    @h.module
+    class Inner:
+        p = h.Port()
+
+    i = Inner()
+    assert "props" not in i.__dict__
+    assert i.props.get("x") is None
+    assert isinstance(i.__dict__["props"], h.Properties)
+
+    i.p = b
+    assert b._connected_ports == {i._refs.all["p"]}
+
+    # Copies start out without any
+    c = copy.copy(s)
+    assert "_slices" not in c.__dict__ and c._slices == set()
+
+
+def test_generator_depth():
+    """Test a generator hierarchy hundreds of levels deep, each level instantiating the one below it"""
+
+    @h.paramclass
+    class Depth:
+        n = h.Param(dtype=int, desc="Remaining levels")
+
+    @h.generator
+    def Chain(params: Depth) -> h.Module:
+        m = h.Module()
+        m.i, m.o = h.Input(), h.Output()
+        if params.n > 0:
+            m.inner = Chain(n=params.n - 1)(i=m.i, o=m.o)
+        return m
+
+    # Each level of generator hierarchy adds a few frames to Python's call stack.
+    # This is deep enough to exceed its recursion limit if that few grows to five.
+    top = Chain(n=200)
+    assert top.inner.of.inner.of.name == "Chain(n=198)"
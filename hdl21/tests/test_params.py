@@ -4,7 +4,9 @@
 """
 
 import pytest
+from enum import Enum
 from dataclasses import field, FrozenInstanceError
+from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic import ValidationError
 from pydantic.dataclasses import dataclass
@@ -209,3 +211,172 @@ def test_param_default_factory():
     assert has.a == 5
     assert has.l == []
     assert has.no == NoFactory(i=11)
+
+
+"""
+# Unique-Naming Stability
+Parameter-classes and values for checking that `_unique_name` produces the same names across versions.
+Generated Module names depend on these, so changing them would rename users' netlist and other output.
+"""
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = 2
+
+
+@h.paramclass
+class NamingScalars:
+    i = h.Param(dtype=int, desc="Int")
+    f = h.Param(dtype=float, desc="Float", default=1.5)
+    s = h.Param(dtype=Optional[str], desc="Optional string", default=None)
+
+
+@h.paramclass
+class NamingInner:
+    i = h.Param(dtype=int, desc="Int")
+    s = h.Param(dtype=str, desc="String", default="inner")
+    p = h.Param(dtype=Optional[h.Prefixed], desc="Prefixed", default=None)
+
+
+@h.paramclass
+class NamingOuter:
+    inner = h.Param(dtype=NamingInner, desc="Nested paramclass")
+    inners = h.Param(dtype=List[NamingInner], desc="Nested list", default_factory=list)
+    t = h.Param(dtype=Tuple[int, ...], desc="Tuple", default=(1, 2))
+    d = h.Param(dtype=Dict[str, Any], desc="Dict", default_factory=dict)
+    color = h.Param(dtype=Color, desc="Enum", default=Color.RED)
+    flag = h.Param(dtype=bool, desc="Bool", default=True)
+    maybe = h.Param(dtype=Optional[float], desc="Optional", default=None)
+    any_ = h.Param(dtype=Any, desc="Anything", default=None)
+
+
+NamingModule = h.Module(name="NamingModule")
+NamingExt = h.ExternalModule(
+    name="NamingExt", port_list=[], paramtype=NamingInner, domain="naming"
+)
+
+
+def test_unique_name_stability():
+    """Check `_unique_name` of a variety of parameter-values against names from prior versions"""
+    from hdl21.prefix import m, µ
+    from hdl21.primitives import MosParams
+
+    cases = [
+        (NamingScalars(i=1), "i=1 f=1.5 s=None"),
+        (NamingScalars(i=-2, f=1e-15, s="abc"), "i=-2 f=1e-15 s=abc"),
+        (NamingScalars(i=1, s="y" * 150), "729b4665db5e0cfe50ab0c46e1eef56f"),
+        (NamingInner(i=1), "4bd914ea8fee7c5ec6f018f7727b3122"),
+        (
+            NamingInner(i=-3, s='quote " and unicode µ'),
+            "146414e4406925b7c14b41b50c27378a",
+        ),
+        (NamingInner(i=1, s="x" * 200), "72b8cb6e37aa7461cfcd421d7d8f4329"),
+        (NamingInner(i=2, p=3 * m), "02ada0d7fef0fda8407b368f5ae34482"),
+        (NamingOuter(inner=NamingInner(i=1)), "6cede2522edbe1002223912f81fca99d"),
+        (
+            NamingOuter(
+                inner=NamingInner(i=5, p=11 * µ),
+                inners=[NamingInner(i=6), NamingInner(i=7, s="seven")],
+                t=(),
+                d={"a": [1, 2.5, None], "b": {"c": False}, "e": {}},
+                color=Color.BLUE,
+                flag=False,
+                maybe=1e-12,
+            ),
+            "d6e83d9e59b5f20acb0c14723776995e",
+        ),
+        (
+            NamingOuter(inner=NamingInner(i=1), any_=NamingModule),
+            "99dd47a19eb53ea092cf74e5b23b27da",
+        ),
+        (
+            NamingOuter(inner=NamingInner(i=1), any_=NamingExt(NamingInner(i=4))),
+            "7eaa76ea82482f57c4376922e296bd13",
+        ),
+        (
+            NamingOuter(inner=NamingInner(i=1), any_=h.primitives.Nmos(MosParams())),
+            "e869647dcda4e4688cd3f0cbc4c860ac",
+        ),
+        (
+            NamingOuter(inner=NamingInner(i=1), any_=float("inf")),
+            "0ea4b6e858b6f8dfdd55868e090c73b0",
+        ),
+        (MosParams(w=2 * µ, l=1 * µ, npar=3), "3f687bfec05b937bf0b0ff220df286b3"),
+    ]
+    for params, name in cases:
+        assert h.params._unique_name(params) == name
+        # And again, e.g. if cached
+        assert h.params._unique_name(params) == name
+
+
+@h.paramclass
+class HashInner:
+    i = h.Param(dtype=int, desc="Int")
+    p = h.Param(dtype=h.Prefixed, desc="Prefixed", default=h.Prefixed.new(1))
+
+
+@h.paramclass
+class HashOuter:
+    inner = h.Param(dtype=HashInner, desc="Nested paramclass")
+    t = h.Param(dtype=tuple, desc="Tuple", default=(1, 2))
+    any_ = h.Param(dtype=Any, desc="Anything", default=None)
+
+
+class Counted:
+    """Parameter value which counts calls to its hashing and equality methods"""
+
+    hashes = 0
+    eqs = 0
+
+    def __init__(self, value: int):
+        self.value = value
+
+    def __hash__(self) -> int:
+        Counted.hashes += 1
+        return hash(self.value)
+
+    def __eq__(self, other) -> bool:
+        Counted.eqs += 1
+        return isinstance(other, Counted) and self.value == other.value
+
+
+def test_paramclass_hash_cache():
+    """Test the cached hashing and short-circuiting equality of paramclass instances"""
+    import pickle
+
+    Counted.hashes = Counted.eqs = 0
+    a = HashOuter(inner=HashInner(i=1), any_=Counted(1))
+    b = HashOuter(inner=HashInner(i=1), any_=Counted(1))
+    c = HashOuter(inner=HashInner(i=1), any_=Counted(2))
+
+    # Equality does not require, nor compute, hashes
+    assert a == b
+    assert a != c
+    assert Counted.hashes == 0
+
+    # Hashing is computed once per instance, and consistent with equality
+    assert hash(a) == hash(b)
+    assert hash(a) == hash(b)
+    assert Counted.hashes == 2
+    assert a == b
+    assert {a: 1}[b] == 1
+
+    # Mismatched hashes short-circuit to inequality, without comparing fields
+    assert hash(a) != hash(c)
+    eqs = Counted.eqs
+    assert a != c
+    assert Counted.eqs == eqs
+
+    # Un-hashable field-values can still be compared
+    d = HashOuter(inner=HashInner(i=1), any_=[1, 2])
+    with pytest.raises(TypeError):
+        hash(d)
+    assert d == HashOuter(inner=HashInner(i=1), any_=[1, 2])
+
+    # Cached hashes are not pickled, and are re-computed upon first use
+    p = pickle.loads(pickle.dumps(a))
+    hashes = Counted.hashes
+    assert hash(p) == hash(a)
+    assert Counted.hashes == hashes + 1
+    assert p == a
@@ -512,3 +512,113 @@ def test_prefixed_and_scalar_conversions():
         p = P(x=None, y=2)
     with pt.raises(ValidationError):
         p = P(x=3, y=None)
+
+
+def test_prefixed_immutable_cached():
+    """Test the immutability, interning, and cached values of `Prefixed` numbers"""
+    import copy, pickle
+    from hdl21.prefix import µ, m, UNIT
+
+    a = 1 * µ
+    assert a is 1 * µ  # Interned
+    with pt.raises(AttributeError):
+        a.number = Decimal(2)
+    assert copy.copy(a) is a
+    assert pickle.loads(pickle.dumps(a)) == a
+
+    # Float-conversion and hashing are cached
+    assert float(a) == 1e-6
+    assert float(a) is float(a)
+    # And hashes are consistent with equality, across prefixes
+    assert 1000 * m == 1 * UNIT
+    assert hash(1000 * m) == hash(1 * UNIT)
+    assert len({1000 * m, 1 * UNIT, h.Prefixed(number="1.000")}) == 1
+
+    # Construction converts and validates its arguments
+    assert h.Prefixed(number=1.5, prefix=m).number == Decimal("1.5")
+    assert h.Prefixed(number="2e-9").number == Decimal("2e-9")
+    for bad in ("m*x+b", "inf", None, []):
+        with pt.raises((TypeError, ValueError)):
+            h.Prefixed(number=bad)
+
+    # As does use as a field of pydantic types
+    @dataclass(config=OurBaseConfig)
+    class HasPrefixed:
+        p: h.Prefixed
+
+    assert HasPrefixed(p=a).p is a
+    assert HasPrefixed(p=dict(number=3, prefix=m)).p == 3 * m
+    with pt.raises(ValidationError):
+        HasPrefixed(p=[])
+
+
+def test_prefixed_validation_fallthrough():
+    """Test that invalid `Prefixed` values fall through to other members of union-typed fields"""
+    from typing import Union
+
+    @dataclass(config=OurBaseConfig)
+    class HasUnion:
+        x: Union[h.Prefixed, h.Literal]
+
+    assert HasUnion(x=h.Literal("w/5")).x == h.Literal("w/5")
+    assert HasUnion(x=5 * h.prefix.m).x == 5 * h.prefix.m
+    with pt.raises(ValidationError):
+        HasUnion(x=[])
+    with pt.raises(ValidationError):
+        HasUnion(x=dict(numbr=5))
+
+
+def test_prefixed_model_compat():
+    """Test the `pydantic.BaseModel`-compatible methods of `Prefixed`"""
+    from hdl21.prefix import m, µ
+
+    a = 5 * m
+    assert a.model_dump() == dict(number=Decimal(5), prefix=m)
+    assert a.model_copy() is a
+    b = a.model_copy(update=dict(prefix=µ))
+    assert b == 5 * µ and a == 5 * m
+
+
+def test_prefixed_hash_eq():
+    """Test that equal `Prefixed` numbers hash equally, including after rounding in arithmetic"""
+    from hdl21.prefix import e, m, UNIT, DECI
+
+    pairs = [
+        (1 * e(-0.75) * e(0.5), 1 * e(-0.25)),
+        (h.Prefixed(number=Decimal(1e-6)), h.Prefixed(number="1e-6")),
+        (
+            h.Prefixed(number="5623.4", prefix=m),
+            h.Prefixed(number="56.234", prefix=DECI),
+        ),
+        (2000 * m, 2 * UNIT),
+    ]
+    for lhs, rhs in pairs:
+        assert lhs.prefix != rhs.prefix or lhs.number != rhs.number
+        assert lhs == rhs
+        assert hash(lhs) == hash(rhs)
+        assert not lhs < rhs and not lhs > rhs
+
+
+def test_prefixed_nonfinite():
+    """Test that arithmetic with non-finite numbers fails"""
+    from hdl21.prefix import e, m
+
+    for bad in ("inf", float("nan")):
+        with pt.raises(ValueError):
+            (1 * m) * bad
+        with pt.raises(ValueError):
+            bad * e(-3)
+        with pt.raises(ValueError):
+            e(2) * bad
+
+
+def test_prefixed_scale():
+    """Test `scale` to the closest `Prefix`, including near the midpoints between prefixes"""
+    from hdl21.prefix import K, M, UNIT
+
+    # Between KILO and MEGA, the midpoint is at 10**4.5, about 31623
+    assert h.Prefixed(number=31622).scale().prefix == K
+    assert h.Prefixed(number=31623).scale().prefix == M
+    assert h.Prefixed(number="31.622", prefix=K).scale() == 31622 * UNIT
+    assert h.Prefixed(number=0).scale().prefix == h.prefix.YOCTO
+    assert h.Prefixed(number=-31623).scale().prefix == M
@@ -22,3 +22,29 @@ def test_source_info():
     assert call.filepath == Path(__file__)
     assert call.linenum == 19
     assert call.pymodule is None
+
+
+def test_source_info_lazy():
+    """Test lazy resolution, pickling, and disabling of `SourceInfo`"""
+    import pickle
+    import hdl21.source_info as si
+
+    call = source_info(get_pymodule=True)
+    assert call._pymodule is si._UNRESOLVED  # Not resolved until requested
+    assert call.pymodule is importlib.import_module(__name__)
+
+    # Pickling stores the resolved values
+    loaded = pickle.loads(pickle.dumps(call))
+    assert loaded == call
+    assert loaded.filepath == call.filepath
+    assert loaded.pymodule is call.pymodule
+
+    # Disabling applies only to requests without `get_pymodule`
+    si.disable()
+    try:
+        assert not si.is_enabled()
+        assert source_info(get_pymodule=False) is None
+        assert isinstance(source_info(get_pymodule=True), SourceInfo)
+    finally:
+        si.enable()
+    assert isinstance(source_info(get_pymodule=False), SourceInfo)
@@ -28,7 +28,8 @@ class HierarchyWalker:
 
         # First ensure all the `src` modules and generators are elaborated.
         # This is a functional no-op if they already are.
-        elaborate(src)
+        # Lazy generator calls are replaced by their Modules, so walk the result.
+        src = elaborate(src)
 
         if isinstance(src, List):
             for x in src:
@@ -57,6 +58,9 @@ class HierarchyWalker:
         # Note that as we have already elaborated, it no longer has bundles.
         for inst in module.instances.values():
             self.visit_instance(inst)
+        # And any compact, i.e. not flattened, InstanceArrays
+        for array in module.instarrays.values():
+            self.visit_instance(array)
         return module
 
     def visit_external_module_call(self, call: ExternalModuleCall) -> Instantiable: